@@ -0,0 +1,190 @@
+"""
+Min-cost-flow role assignment for a single event.
+
+Peeps flow from a source into the role they can dance (their primary role, or their
+secondary role if their switch preference allows it) and from the role into the sink,
+where each role's capacity is the per-role fill being tested. Line order is encoded as
+costs so earlier peeps always win a slot over later ones, and switching into a secondary
+role costs a little extra so primary roles are preferred whenever the fill allows it.
+
+The largest balanced fill is found by testing per-role capacities from the effective
+maximum downwards; SWITCH_IF_NEEDED peeps are only offered their secondary role when
+the event could not otherwise reach its minimum.
+"""
+
+import logging
+
+from peeps_scheduler import constants
+from peeps_scheduler.models import Role, SwitchPreference
+
+
+class MinCostFlow:
+	"""Successive-shortest-path min-cost flow for small graphs (Bellman-Ford, so negative costs are fine)."""
+
+	def __init__(self, num_nodes):
+		self.num_nodes = num_nodes
+		self.graph = [[] for _ in range(num_nodes)]  # node -> list of edge indexes
+		self.to = []
+		self.capacity = []
+		self.cost = []
+
+	def add_edge(self, u, v, capacity, cost):
+		"""Add a directed edge and its residual twin; returns the forward edge index."""
+		self.graph[u].append(len(self.to))
+		self.to.append(v)
+		self.capacity.append(capacity)
+		self.cost.append(cost)
+
+		self.graph[v].append(len(self.to))
+		self.to.append(u)
+		self.capacity.append(0)
+		self.cost.append(-cost)
+		return len(self.to) - 2
+
+	def flow_on(self, edge):
+		"""Units of flow currently pushed through a forward edge."""
+		return self.capacity[edge ^ 1]
+
+	def solve(self, source, sink, max_flow):
+		"""
+		Push up to max_flow units from source to sink at minimum total cost.
+
+		Returns:
+			tuple: (flow, cost)
+		"""
+		flow = 0
+		total_cost = 0
+		while flow < max_flow:
+			dist = [None] * self.num_nodes
+			prev_edge = [None] * self.num_nodes
+			dist[source] = 0
+			updated = True
+			while updated:
+				updated = False
+				for u in range(self.num_nodes):
+					if dist[u] is None:
+						continue
+					for edge in self.graph[u]:
+						v = self.to[edge]
+						if self.capacity[edge] > 0 and (dist[v] is None or dist[u] + self.cost[edge] < dist[v]):
+							dist[v] = dist[u] + self.cost[edge]
+							prev_edge[v] = edge
+							updated = True
+
+			if dist[sink] is None:
+				break
+
+			# Unit capacities from the source, so every augmenting path carries one unit
+			node = sink
+			while node != source:
+				edge = prev_edge[node]
+				self.capacity[edge] -= 1
+				self.capacity[edge ^ 1] += 1
+				node = self.to[edge ^ 1]
+			flow += 1
+			total_cost += dist[sink]
+
+		return flow, total_cost
+
+def solve_role_fill(candidates, per_role, allow_switch_if_needed):
+	"""
+	Find the best assignment of exactly per_role peeps to each role.
+
+	Args:
+		candidates: peeps who can attend, in line order (earliest first)
+		per_role: number of peeps required in each role
+		allow_switch_if_needed: whether SWITCH_IF_NEEDED peeps may take their secondary role
+
+	Returns:
+		dict: {Role: [peeps in line order]} or None if the fill is not reachable
+	"""
+	n = len(candidates)
+	if per_role <= 0 or n < 2 * per_role:
+		return None
+
+	# Costs: including an earlier peep outweighs every later peep combined, and
+	# that outweighs any amount of switching. Switch penalties break remaining ties.
+	switch_penalty = {SwitchPreference.SWITCH_IF_PRIMARY_FULL: 1, SwitchPreference.SWITCH_IF_NEEDED: n + 1}
+	inclusion_scale = n * (n + 1) + 1
+
+	source, sink = 0, n + 3
+	role_node = {Role.LEADER: n + 1, Role.FOLLOWER: n + 2}
+	network = MinCostFlow(n + 4)
+	role_edges = []
+
+	for i, peep in enumerate(candidates):
+		node = i + 1
+		network.add_edge(source, node, 1, -(inclusion_scale << (n - i)))
+		role_edges.append((peep, peep.role, network.add_edge(node, role_node[peep.role], 1, 0)))
+
+		secondary_allowed = (
+			peep.switch_pref == SwitchPreference.SWITCH_IF_PRIMARY_FULL or
+			(allow_switch_if_needed and peep.switch_pref == SwitchPreference.SWITCH_IF_NEEDED)
+		)
+		if secondary_allowed:
+			secondary = peep.role.opposite()
+			edge = network.add_edge(node, role_node[secondary], 1, switch_penalty[peep.switch_pref])
+			role_edges.append((peep, secondary, edge))
+
+	for role in (Role.LEADER, Role.FOLLOWER):
+		network.add_edge(role_node[role], sink, per_role, 0)
+
+	flow, _ = network.solve(source, sink, 2 * per_role)
+	if flow < 2 * per_role:
+		return None
+
+	assigned = {Role.LEADER: [], Role.FOLLOWER: []}
+	for peep, role, edge in role_edges:
+		if network.flow_on(edge):
+			assigned[role].append(peep)
+	return assigned
+
+def assign_event_by_flow(event, peeps, effective_max_role):
+	"""
+	Fill an event with the largest balanced role fill reachable by min-cost flow.
+
+	Assigned peeps are added as attendees in line order; every other peep who can attend
+	is added as an alternate in their primary role. If no fill reaches the absolute
+	minimum, only alternates are added, mirroring an unfilled greedy pass.
+
+	Returns:
+		int: peeps assigned per role (0 if none)
+	"""
+	candidates = [peep for peep in peeps if peep.can_attend(event)]
+	max_fill = min(effective_max_role, len(candidates) // 2)
+	smallest_fill = min(constants.ABS_MIN_ROLE, event.min_role)
+
+	fill, assigned = 0, None
+	for per_role in range(max_fill, smallest_fill - 1, -1):
+		assigned = solve_role_fill(candidates, per_role, allow_switch_if_needed=False)
+		if assigned:
+			fill = per_role
+			break
+
+	# SWITCH_IF_NEEDED peeps may switch only to bring the event up to its minimum
+	if fill < min(event.min_role, max_fill):
+		for per_role in range(min(event.min_role, max_fill), fill, -1):
+			needed = solve_role_fill(candidates, per_role, allow_switch_if_needed=True)
+			if needed:
+				fill, assigned = per_role, needed
+				logging.debug(f"SWITCH_IF_NEEDED peeps enable a fill of {per_role}/role for Event {event.id}")
+				break
+
+	attending = set()
+	if assigned:
+		roles = {peep.id: role for role, role_peeps in assigned.items() for peep in role_peeps}
+		for peep in candidates:
+			if peep.id in roles:
+				event.add_attendee(peep, roles[peep.id])
+				attending.add(peep.id)
+				if roles[peep.id] != peep.role:
+					logging.debug(
+						f"{peep.name} assigned in secondary role {roles[peep.id].name} "
+						f"by flow assignment for Event {event.id} on {event.formatted_date()}"
+					)
+
+	for peep in candidates:
+		if peep.id not in attending:
+			event.add_alternate(peep, peep.role)
+
+	return fill
@@ -1,10 +1,10 @@
 from collections import defaultdict
 from peeps_scheduler.data_manager import DataManager, get_data_manager
 from peeps_scheduler.models import Role, SwitchPreference
-from peeps_scheduler.file_io import load_cancellations, load_csv, normalize_email, parse_event_date
+from peeps_scheduler.file_io import iter_csv, load_cancellations, normalize_email, parse_event_key
 
 def parse_availability(responses_file, members_file, cancelled_event_ids=None, cancelled_availability=None, year=None):
-	members = {normalize_email(row["Email Address"]): row for row in load_csv(members_file)}
+	members = {normalize_email(row["Email Address"]): row for row in iter_csv(members_file)}
 	cancelled_event_ids = cancelled_event_ids or set()
 	cancelled_availability = cancelled_availability or {}
 	availability = defaultdict(lambda: {"leader": [], "follower": [], "leader_fill": [], "follower_fill": []})
@@ -18,12 +18,11 @@ def parse_availability(responses_file, members_file, cancelled_event_ids=None, c
 
 	# Collect all events from responses
 	all_event_ids = set()
-	for row in load_csv(str(responses_file)):
+	for row in iter_csv(str(responses_file)):
 		dates = [d.strip() for d in row.get("Availability", "").split(",") if d.strip()]
 		for date in dates:
 			try:
-				event_id, _, _ = parse_event_date(date, year=year)
-				all_event_ids.add(event_id)
+				all_event_ids.add(parse_event_key(date, year=year).event_id)
 			except Exception as e:
 				raise ValueError(f"cannot parse availability date '{date}': {e}") from e
 
@@ -49,7 +48,7 @@ def parse_availability(responses_file, members_file, cancelled_event_ids=None, c
 			cancelled_availability_details[display_name] = sorted(event_ids)
 
 	# Process availability from responses
-	for row in load_csv(str(responses_file)):
+	for row in iter_csv(str(responses_file)):
 		email = normalize_email(row["Email Address"])
 		role = Role.from_string(row["Primary Role"].strip())
 		switch_pref = SwitchPreference.from_string(row["Secondary Role"].strip())
@@ -67,7 +66,7 @@ def parse_availability(responses_file, members_file, cancelled_event_ids=None, c
 		# Filter out cancelled events
 		available_dates = []
 		for date in dates:
-			event_id, _, _ = parse_event_date(date, year=year)
+			event_id = parse_event_key(date, year=year).event_id
 			# Skip cancelled events and cancelled availability for this person
 			if event_id not in cancelled_event_ids and event_id not in cancelled_availability.get(email, set()):
 				available_dates.append(date)
@@ -115,7 +114,7 @@ def print_availability(availability, unavailable, non_responders, year=None, can
 				events_str = ", ".join(sorted(events))
 				print(f"  - {name}: {events_str}")
 
-	for date in sorted(availability.keys(), key=lambda d:parse_event_date(d, year=year)[0]):
+	for date in sorted(availability.keys(), key=lambda d: parse_event_key(d, year=year).start):
 		print(f"\n{date}")
 		print(f"    Leaders  ({len(availability[date]['leader'])}): {', '.join(availability[date]['leader'])} ( + {', '.join(availability[date]['leader_fill'])})")
 		print(f"    Followers({len(availability[date]['follower'])}): {', '.join(availability[date]['follower'])} ( + {', '.join(availability[date]['follower_fill'])})")
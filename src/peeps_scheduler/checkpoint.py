@@ -0,0 +1,143 @@
+"""
+Checkpoint and resume support for long exhaustive searches.
+
+A checkpoint records where the permutation search is (target_max and the next
+permutation index), the incumbent tie set as compact (target_max, event order)
+records, and a fingerprint of the inputs. Sequences that are not tied for the
+top can never win later, so the tie set is all a resumed run needs; it rebuilds
+those sequences by re-evaluating their recorded orders.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from peeps_scheduler import constants, search
+
+CHECKPOINT_VERSION = 1
+
+def compute_input_fingerprint(paths, settings=None):
+	"""
+	Hash the contents of the given input files plus any settings that change the search result.
+	Missing files hash as empty, so creating or deleting an optional file changes the fingerprint.
+	"""
+	digest = hashlib.sha256()
+	for path in paths:
+		digest.update(os.path.basename(str(path)).encode("utf-8"))
+		if os.path.exists(path):
+			with open(path, "rb") as f:
+				digest.update(hashlib.sha256(f.read()).digest())
+		else:
+			digest.update(b"<missing>")
+	digest.update(json.dumps(settings or {}, sort_keys=True).encode("utf-8"))
+	return digest.hexdigest()
+
+class SearchCheckpoint:
+	"""Tracks exhaustive search progress and writes it to the period folder every interval seconds."""
+
+	def __init__(self, path, fingerprint, event_ids, interval=constants.CHECKPOINT_INTERVAL_SECONDS):
+		self.path = Path(path)
+		self.fingerprint = fingerprint
+		self.event_ids = list(event_ids)
+		self.interval = interval
+		self.target_max = None  # target currently being searched
+		self.next_index = 0  # next permutation index for target_max
+		self.records = []  # incumbent tie set as [target_max, [event ids]] in discovery order
+		self.best_key = None
+		self._last_saved = time.monotonic()
+
+	@classmethod
+	def load(cls, path, fingerprint, event_ids, interval=constants.CHECKPOINT_INTERVAL_SECONDS):
+		"""
+		Load a checkpoint, refusing it if the inputs or the event set have changed since it was written.
+
+		Returns:
+			SearchCheckpoint or None if no checkpoint exists
+		"""
+		path = Path(path)
+		if not path.exists():
+			return None
+
+		try:
+			with open(path, "r") as f:
+				data = json.load(f)
+		except json.JSONDecodeError as e:
+			raise ValueError(f"invalid checkpoint file {path}: {e}") from e
+
+		if data.get("version") != CHECKPOINT_VERSION:
+			raise ValueError(f"unsupported checkpoint version: {data.get('version')}")
+		if data.get("fingerprint") != fingerprint:
+			raise ValueError(
+				"cannot resume: output.json, cancellations, partnerships or run settings changed since the checkpoint was written"
+			)
+		if data.get("event_ids") != list(event_ids):
+			raise ValueError(f"cannot resume: checkpoint searched events {data.get('event_ids')}, current events are {list(event_ids)}")
+
+		checkpoint = cls(path, fingerprint, event_ids, interval)
+		checkpoint.target_max = data["target_max"]
+		checkpoint.next_index = data["next_index"]
+		checkpoint.records = [[target_max, list(perm)] for target_max, perm in data["records"]]
+		return checkpoint
+
+	def resume_index(self, target_max):
+		"""First permutation index to evaluate for target_max, or None if that target is already done."""
+		if self.target_max is None or target_max > self.target_max:
+			return 0
+		if target_max == self.target_max:
+			return self.next_index
+		return None
+
+	def observe(self, scheduler, index, perm, sequence):
+		"""Record an evaluated (or skipped, if sequence is None) permutation, update the tie set, and save if the interval has elapsed."""
+		self.target_max = scheduler.target_max
+		self.next_index = index + 1
+
+		if sequence is not None and sequence.valid_events:
+			key = scheduler.rank_key(sequence)
+			if self.best_key is None or key < self.best_key:
+				self.best_key = key
+				self.records = [[scheduler.target_max, list(perm)]]
+			elif key == self.best_key:
+				self.records.append([scheduler.target_max, list(perm)])
+
+		if self.interval is not None and time.monotonic() - self._last_saved >= self.interval:
+			self.save()
+
+	def rebuild(self, scheduler, peeps, events):
+		"""Re-evaluate the recorded tie set into full sequences, in discovery order."""
+		event_map = {event.id: event for event in events}
+		saved_target_max = scheduler.target_max
+		sequences = []
+		for target_max, perm in self.records:
+			scheduler.target_max = target_max
+			sequences.append(search.evaluate_permutation(scheduler, peeps, event_map, perm))
+		scheduler.target_max = saved_target_max
+
+		if sequences:
+			self.best_key = min(scheduler.rank_key(sequence) for sequence in sequences)
+		return sequences
+
+	def save(self):
+		"""Atomically write the checkpoint file."""
+		data = {
+			"version": CHECKPOINT_VERSION,
+			"fingerprint": self.fingerprint,
+			"event_ids": self.event_ids,
+			"target_max": self.target_max,
+			"next_index": self.next_index,
+			"records": self.records,
+		}
+		tmp_path = self.path.with_suffix(".tmp")
+		with open(tmp_path, "w") as f:
+			json.dump(data, f)
+		os.replace(tmp_path, self.path)
+		self._last_saved = time.monotonic()
+		logging.debug(f"Checkpoint saved: target_max={self.target_max}, next index {self.next_index}, {len(self.records)} incumbent(s)")
+
+	def remove(self):
+		"""Delete the checkpoint file once the search has finished."""
+		if self.path.exists():
+			self.path.unlink()
@@ -2,6 +2,7 @@ import os
 
 DATE_FORMAT = "%Y-%m-%d %H:%M"
 DATESTR_FORMAT = "%A %B %d - %I%p"
+EVENT_KEY_CACHE_SIZE = 4096  # Distinct (date string, year) pairs parse_event_key remembers
 
 CLASS_CONFIG = {
 	60: {
@@ -34,3 +35,45 @@ PRIVATE_DATA_ROOT = os.getenv("PEEPS_DATA_PATH", "peeps-data")
 
 # Optional data files
 PARTNERSHIPS_FILE = "partnerships.json"
+
+# SQLite history database, in the submodule root next to the period folders
+DATABASE_FILE = "peeps.sqlite3"
+
+# Columnar export file formats (need pyarrow)
+EXPORT_FORMATS = ("parquet", "arrow")
+
+# === Search Configuration ===
+
+SEARCH_ENGINES = ("exhaustive", "parallel", "branch_and_bound", "parallel_branch_and_bound", "heuristic", "distributed", "batched")
+DEFAULT_SEARCH_BUDGET_SECONDS = 300  # Auto engine selection aims to finish within this budget
+SEARCH_CALIBRATION_SAMPLES = 10  # Permutations timed to estimate cost per evaluation
+BRANCH_AND_BOUND_EXPECTED_SPEEDUP = 10  # Conservative guess at how much pruning saves over exhaustive
+BATCH_LANES = 1024  # Permutations the batched engine evaluates together
+SEQUENCE_STORE_CAP = 1_000_000  # Sequence records kept in memory before spilling sorted runs to disk
+ASSIGNMENT_STRATEGIES = ("greedy", "flow")
+PRESELECTION_STRATEGIES = ("overlap", "coverage")
+DOMINANCE_MODES = ("off", "order", "drop")
+EVALUATION_KERNELS = ("object", "array")
+
+# === Checkpoint Configuration ===
+
+CHECKPOINT_FILE = "search_checkpoint.json"
+CHECKPOINT_INTERVAL_SECONDS = 60
+
+# === Output Files ===
+
+OUTPUT_JSON_VERSIONS = (1, 2)  # 2 stores availability as bit strings and moves responses to RESPONSES_AUDIT_FILE
+RESPONSES_AUDIT_FILE = "responses.json"  # Response audit data for output.json v2, next to output.json
+
+# === CSV Conversion Cache ===
+
+CONVERSION_CACHE_FILE = "conversion_cache.json"  # Fingerprints of the CSVs and year that produced output.json
+CONVERSION_CACHE_VERSION = 1  # Bump when convert_to_json output changes for the same inputs
+
+# === Distributed Search Configuration ===
+
+SHARD_SIZE = 5000  # Permutations per shard handed to a worker
+SHARD_LEASE_SECONDS = 600  # A shard not returned within this time is handed to another worker and its connection dropped
+WORKER_CONNECT_TIMEOUT_SECONDS = 30  # How long a worker keeps retrying to reach the coordinator
+WORKER_WAIT_SECONDS = 60  # With no live worker for this long, the coordinator evaluates pending shards itself
+WORKER_TOKEN_ENV = "PEEPS_WORKER_TOKEN"  # Environment variable with the shared token for coordinator and workers
@@ -11,6 +11,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from peeps_scheduler import constants
+from peeps_scheduler.database import PeriodDatabase
+
 
 class DataManager:
 	"""Manages data paths and period archiving for the scheduling system."""
@@ -63,6 +66,14 @@ class DataManager:
 				periods.append(item.name)
 		
 		return sorted(periods)
+	
+	def get_database_path(self) -> Path:
+		"""Get path to the SQLite history database of imported periods."""
+		return self.submodule_root / constants.DATABASE_FILE
+	
+	def open_database(self) -> PeriodDatabase:
+		"""Open (creating if needed) the SQLite history database."""
+		return PeriodDatabase(self.get_database_path())
 
 
 # Global instance for easy access throughout the codebase
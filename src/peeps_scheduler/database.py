@@ -0,0 +1,257 @@
+"""
+SQLite database of period history.
+
+Each period folder holds its own members.csv, responses.csv, output.json and results.json,
+so questions across periods (a member's priority over time, who attended which events)
+mean opening every folder. The database imports period folders into indexed tables:
+members and responses as they were submitted, the converted roster, events and
+availability from output.json, the scheduled and actual assignments, and each member's
+priority after the period. Every period is written in one transaction, replacing what
+was imported for it before, and can be loaded back like file_io.load_data_from_json.
+
+The period folders stay the source of truth; the CSV/JSON workflow does not need the
+database, and re-importing a folder brings it up to date.
+"""
+
+import datetime
+import json
+import logging
+import os
+import sqlite3
+
+from peeps_scheduler import file_io
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS periods (
+	slug TEXT PRIMARY KEY,
+	imported_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS members (
+	period TEXT NOT NULL REFERENCES periods(slug) ON DELETE CASCADE,
+	id INTEGER NOT NULL,
+	full_name TEXT NOT NULL,
+	display_name TEXT NOT NULL,
+	email TEXT NOT NULL,
+	role TEXT NOT NULL,
+	position INTEGER NOT NULL,
+	priority INTEGER NOT NULL,
+	total_attended INTEGER NOT NULL,
+	active INTEGER NOT NULL,
+	date_joined TEXT NOT NULL,
+	PRIMARY KEY (period, id)
+);
+CREATE INDEX IF NOT EXISTS members_email ON members (email);
+CREATE TABLE IF NOT EXISTS responses (
+	period TEXT NOT NULL REFERENCES periods(slug) ON DELETE CASCADE,
+	row INTEGER NOT NULL,
+	timestamp TEXT NOT NULL,
+	email TEXT NOT NULL,
+	name TEXT NOT NULL,
+	data TEXT NOT NULL,
+	PRIMARY KEY (period, row)
+);
+CREATE INDEX IF NOT EXISTS responses_email ON responses (email);
+CREATE TABLE IF NOT EXISTS events (
+	period TEXT NOT NULL REFERENCES periods(slug) ON DELETE CASCADE,
+	id INTEGER NOT NULL,
+	date TEXT NOT NULL,
+	duration_minutes INTEGER NOT NULL,
+	PRIMARY KEY (period, id)
+);
+CREATE INDEX IF NOT EXISTS events_date ON events (date);
+CREATE TABLE IF NOT EXISTS peeps (
+	period TEXT NOT NULL REFERENCES periods(slug) ON DELETE CASCADE,
+	position INTEGER NOT NULL,
+	id INTEGER NOT NULL,
+	data TEXT NOT NULL,
+	PRIMARY KEY (period, position)
+);
+CREATE TABLE IF NOT EXISTS availability (
+	period TEXT NOT NULL REFERENCES periods(slug) ON DELETE CASCADE,
+	peep_id INTEGER NOT NULL,
+	event_id INTEGER NOT NULL,
+	PRIMARY KEY (period, peep_id, event_id)
+);
+CREATE INDEX IF NOT EXISTS availability_event ON availability (period, event_id);
+CREATE TABLE IF NOT EXISTS assignments (
+	period TEXT NOT NULL REFERENCES periods(slug) ON DELETE CASCADE,
+	source TEXT NOT NULL,
+	event_id INTEGER NOT NULL,
+	peep_id INTEGER NOT NULL,
+	role TEXT NOT NULL,
+	alternate INTEGER NOT NULL,
+	position INTEGER NOT NULL,
+	PRIMARY KEY (period, source, event_id, alternate, position)
+);
+CREATE INDEX IF NOT EXISTS assignments_peep ON assignments (period, peep_id);
+CREATE TABLE IF NOT EXISTS priority_snapshots (
+	period TEXT NOT NULL REFERENCES periods(slug) ON DELETE CASCADE,
+	peep_id INTEGER NOT NULL,
+	priority INTEGER NOT NULL,
+	total_attended INTEGER NOT NULL,
+	PRIMARY KEY (period, peep_id)
+);
+"""
+
+# Result files imported as assignments, keyed by the source recorded for their rows
+RESULT_FILES = {
+	"results": "results.json",
+	"actual": "actual_attendance.json",
+}
+
+class PeriodDatabase:
+	"""Indexed SQLite store of imported period folders."""
+
+	def __init__(self, path):
+		self.path = path
+		self.connection = sqlite3.connect(path)
+		self.connection.row_factory = sqlite3.Row
+		self.connection.execute("PRAGMA foreign_keys = ON")
+		version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+		if version not in (0, SCHEMA_VERSION):
+			self.connection.close()
+			raise ValueError(f"unsupported database schema version: {version}")
+		with self.connection:
+			self.connection.executescript(SCHEMA)
+			self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+	def close(self):
+		self.connection.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
+
+	def import_period(self, period_slug, period_path):
+		"""
+		Import a period folder in one transaction, replacing any earlier import of it.
+		Files the folder does not have yet (e.g. results.json before a run) are skipped.
+		"""
+		members_csv = os.path.join(period_path, "members.csv")
+		responses_csv = os.path.join(period_path, "responses.csv")
+		output_json = os.path.join(period_path, "output.json")
+
+		with self.connection as db:
+			db.execute("DELETE FROM periods WHERE slug = ?", (period_slug,))
+			db.execute("INSERT INTO periods VALUES (?, ?)", (period_slug, datetime.datetime.now().isoformat(timespec="seconds")))
+
+			if os.path.exists(members_csv):
+				db.executemany("INSERT INTO members VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", [
+					(period_slug, peep.id, peep.full_name, peep.display_name, file_io.normalize_email(peep.email),
+						peep.role.value, peep.index, peep.priority, peep.total_attended, peep.active, peep.date_joined)
+					for peep in file_io.load_peeps(members_csv)
+				])
+
+			if os.path.exists(responses_csv):
+				db.executemany("INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?)", [
+					(period_slug, row_number, row.get("Timestamp", ""), file_io.normalize_email(row.get("Email Address", "")),
+						row.get("Name", ""), json.dumps(row))
+					for row_number, row in enumerate(file_io.load_responses(responses_csv))
+				])
+
+			if os.path.exists(output_json):
+				output = file_io.load_output_json(output_json)
+				db.executemany("INSERT INTO events VALUES (?, ?, ?, ?)", [
+					(period_slug, event["id"], event["date"], event["duration_minutes"]) for event in output["events"]
+				])
+				db.executemany("INSERT INTO peeps VALUES (?, ?, ?, ?)", [
+					(period_slug, position, peep["id"], json.dumps({key: value for key, value in peep.items() if key != "availability"}))
+					for position, peep in enumerate(output["peeps"])
+				])
+				db.executemany("INSERT OR IGNORE INTO availability VALUES (?, ?, ?)", [
+					(period_slug, peep["id"], event_id) for peep in output["peeps"] for event_id in peep.get("availability", [])
+				])
+
+			for source, filename in RESULT_FILES.items():
+				path = os.path.join(period_path, filename)
+				if os.path.exists(path):
+					self._import_results(db, period_slug, source, file_io.load_json(path))
+
+	def _import_results(self, db, period_slug, source, result):
+		rows = []
+		for event in result.get("valid_events", []):
+			for alternate, key in enumerate(("attendees", "alternates")):
+				for position, attendee in enumerate(event.get(key, [])):
+					rows.append((period_slug, source, event["id"], attendee["id"], attendee["role"], alternate, position))
+		db.executemany("INSERT INTO assignments VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+		if source == "results":
+			db.executemany("INSERT INTO priority_snapshots VALUES (?, ?, ?, ?)", [
+				(period_slug, peep["id"], peep["priority"], peep["total_attended"]) for peep in result.get("peeps", [])
+			])
+
+	def import_periods(self, data_manager):
+		"""Import every period folder of a DataManager, one transaction each. Returns the imported slugs."""
+		periods = data_manager.list_periods()
+		for period_slug in periods:
+			logging.info(f"Importing period {period_slug}")
+			self.import_period(period_slug, data_manager.get_period_path(period_slug))
+		return periods
+
+	def list_periods(self):
+		return [row["slug"] for row in self.connection.execute("SELECT slug FROM periods ORDER BY slug")]
+
+	def load_output(self, period_slug):
+		"""The period's output.json contents (events and peeps, version 1 layout) as imported."""
+		events = [dict(row) for row in self.connection.execute(
+			"SELECT id, date, duration_minutes FROM events WHERE period = ? ORDER BY id", (period_slug,)
+		)]
+		availability = {}
+		for row in self.connection.execute(
+			"SELECT peep_id, event_id FROM availability WHERE period = ? ORDER BY peep_id, event_id", (period_slug,)
+		):
+			availability.setdefault(row["peep_id"], []).append(row["event_id"])
+		peeps = []
+		for row in self.connection.execute("SELECT id, data FROM peeps WHERE period = ? ORDER BY position", (period_slug,)):
+			peep = json.loads(row["data"])
+			if peep.get("responded"):
+				peep["availability"] = availability.get(row["id"], [])
+			peeps.append(peep)
+		return {"events": events, "peeps": peeps}
+
+	def load_data(self, period_slug):
+		"""Load peeps and events for a period like file_io.load_data_from_json."""
+		if not self.connection.execute("SELECT 1 FROM periods WHERE slug = ?", (period_slug,)).fetchone():
+			raise ValueError(f"period not in database: {period_slug}")
+		return file_io.load_data_from_output(self.load_output(period_slug))
+
+	def member_history(self, email):
+		"""
+		A member's record in every imported period, oldest first.
+
+		Returns:
+			list of dict: period, id, priority and total_attended from members.csv, priority_after
+			and total_attended_after from results.json (None if not imported), responded, and
+			scheduled and attended event counts
+		"""
+		rows = self.connection.execute("""
+			SELECT m.period, m.id, m.priority, m.total_attended,
+				s.priority AS priority_after, s.total_attended AS total_attended_after,
+				EXISTS (SELECT 1 FROM responses r WHERE r.period = m.period AND r.email = m.email) AS responded,
+				(SELECT COUNT(*) FROM assignments a WHERE a.period = m.period AND a.peep_id = m.id
+					AND a.source = 'results' AND a.alternate = 0) AS scheduled,
+				(SELECT COUNT(*) FROM assignments a WHERE a.period = m.period AND a.peep_id = m.id
+					AND a.source = 'actual' AND a.alternate = 0) AS attended
+			FROM members m
+			LEFT JOIN priority_snapshots s ON s.period = m.period AND s.peep_id = m.id
+			WHERE m.email = ?
+			ORDER BY m.period
+		""", (file_io.normalize_email(email),))
+		return [dict(row, responded=bool(row["responded"])) for row in rows]
+
+	def attendance_history(self, email, source="actual"):
+		"""Events a member was assigned to (as attendee or alternate) in every imported period, by date."""
+		if source not in RESULT_FILES:
+			raise ValueError(f"unknown assignment source: {source}")
+		rows = self.connection.execute("""
+			SELECT a.period, e.date, e.duration_minutes, a.role, a.alternate
+			FROM members m
+			JOIN assignments a ON a.period = m.period AND a.peep_id = m.id AND a.source = ?
+			JOIN events e ON e.period = a.period AND e.id = a.event_id
+			WHERE m.email = ?
+			ORDER BY e.date
+		""", (source, file_io.normalize_email(email)))
+		return [dict(row, alternate=bool(row["alternate"])) for row in rows]
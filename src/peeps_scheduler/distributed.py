@@ -0,0 +1,428 @@
+"""
+Sharded permutation search across several machines.
+
+The coordinator splits each target_max's permutation index space into shards and
+serves them to workers over TCP or a Unix socket, one newline-delimited JSON message
+per line. Workers start from a snapshot of the inputs Scheduler.run loaded, evaluate
+the shards they pull, and send back only each shard's best tie set as compact
+(index, event order, rank key) records. A shard whose worker disconnects, or holds it
+past its lease, is handed out again; the first result to arrive wins. If no worker is
+connected or starting for WORKER_WAIT_SECONDS, the coordinator evaluates the remaining
+shards itself, so a search never waits on workers that are gone.
+
+Workers must present the coordinator's shared token (run --worker-token, or one generated
+and logged at startup) before they get anything, and the snapshot carries ids, roles and
+availability but no names or email addresses.
+
+Protocol (worker -> coordinator / coordinator -> worker):
+	hello {token}                / snapshot {snapshot}, or error if the token is wrong
+	(wait)                       / shard {shard_id, target_max, start, stop} or done
+	result {shard_id, records}   / next shard or done
+"""
+
+import hmac
+import json
+import logging
+import multiprocessing
+import os
+import secrets
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+
+from peeps_scheduler import constants, dominance, search, utils
+from peeps_scheduler.models import Event, Peep
+
+# -- Addresses and messages --
+
+def parse_address(address):
+	"""
+	Parse "host:port" as TCP and anything else (e.g. /tmp/peeps.sock) as a Unix socket path.
+
+	Returns:
+		tuple: (socket family, address)
+	"""
+	host, sep, port = address.rpartition(":")
+	if sep and port.isdigit() and "/" not in address:
+		return socket.AF_INET, (host or "127.0.0.1", int(port))
+	if not hasattr(socket, "AF_UNIX"):
+		raise ValueError(f"unix sockets are not supported on this platform: {address}")
+	return socket.AF_UNIX, address
+
+def format_address(family, address):
+	"""Inverse of parse_address for a bound server address."""
+	if family == socket.AF_INET:
+		return f"{address[0]}:{address[1]}"
+	return address
+
+def send_message(wfile, message):
+	wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+	wfile.flush()
+
+def receive_message(rfile):
+	"""Read one message, or None if the peer closed the connection."""
+	line = rfile.readline()
+	if not line:
+		return None
+	return json.loads(line)
+
+# -- Snapshots --
+
+def build_snapshot(scheduler, peeps, events):
+	"""Serialize everything a worker needs to evaluate sequences exactly like the coordinator (no names or emails)."""
+	return {
+		"assignment": scheduler.assignment,
+		"event_precedence": {str(dominated): dominator for dominated, dominator in scheduler.event_precedence.items()},
+		"partnership_requests": {str(requester): sorted(partners) for requester, partners in scheduler.partnership_requests.items()},
+		"events": [event.to_dict() for event in events],
+		"peeps": [
+			{
+				"id": peep.id,
+				"role": peep.role.value,
+				"switch_pref": peep.switch_pref.value,
+				"index": peep.index,
+				"priority": peep.priority,
+				"total_attended": peep.total_attended,
+				"availability": peep.availability,
+				"event_limit": peep.event_limit,
+				"min_interval_days": peep.min_interval_days,
+				"responded": peep.responded,
+				"active": peep.active,
+				"date_joined": peep.date_joined,
+			}
+			for peep in peeps
+		],
+	}
+
+def load_snapshot(snapshot):
+	"""
+	Rebuild an evaluation-only scheduler and the search inputs from a snapshot.
+
+	Returns:
+		tuple: (scheduler, peeps, events)
+	"""
+	from peeps_scheduler.scheduler import Scheduler
+
+	scheduler = Scheduler(data_folder=None, max_events=len(snapshot["events"]), interactive=False,
+						  assignment=snapshot["assignment"])
+	scheduler.partnership_requests = {
+		int(requester): set(partners) for requester, partners in snapshot["partnership_requests"].items()
+	}
+	scheduler.event_precedence = {int(dominated): dominator for dominated, dominator in snapshot["event_precedence"].items()}
+	events = [Event.from_dict(dict(event)) for event in snapshot["events"]]
+	peeps = [Peep(**peep) for peep in snapshot["peeps"]]
+	return scheduler, peeps, events
+
+# -- Shard evaluation --
+
+def best_records(records):
+	"""Keep only the records tied for the best rank key, in index order."""
+	if not records:
+		return []
+	best_key = min(record[2] for record in records)
+	return sorted((record for record in records if record[2] == best_key), key=lambda record: record[0])
+
+def evaluate_shard(scheduler, peeps, events, target_max, start, stop):
+	"""
+	Evaluate permutation indexes start..stop-1 and return the shard's tie set.
+
+	Returns:
+		list: [index, event ids, rank key] records
+	"""
+	scheduler.target_max = target_max
+	event_map = {event.id: event for event in events}
+	best_key = None
+	records = []
+
+	for index, perm in enumerate(utils.permutation_range(event_map, start, stop), start):
+		if not dominance.respects_precedence(perm, scheduler.event_precedence):
+			continue
+		sequence = search.evaluate_permutation(scheduler, peeps, event_map, perm)
+		if not sequence.valid_events:
+			continue
+		key = list(scheduler.rank_key(sequence))
+		if best_key is None or key < best_key:
+			best_key = key
+			records = [[index, list(perm), key]]
+		elif key == best_key:
+			records.append([index, list(perm), key])
+
+	return records
+
+# -- Coordinator --
+
+class _ShardRequestHandler(socketserver.StreamRequestHandler):
+	"""Serves shards to one connected worker until the coordinator closes."""
+
+	def handle(self):
+		coordinator = self.server.coordinator
+		shard = None
+		connected = False
+		# A worker silent for a whole lease is treated as lost, so its shard is requeued
+		self.request.settimeout(coordinator.lease_seconds)
+		try:
+			hello = receive_message(self.rfile)
+			if not hello or hello.get("type") != "hello":
+				return
+			if not hmac.compare_digest(str(hello.get("token", "")).encode("utf-8"), coordinator.token.encode("utf-8")):
+				logging.warning(f"Refused worker with an invalid token at {coordinator.address}")
+				send_message(self.wfile, {"type": "error", "message": "invalid worker token"})
+				return
+			send_message(self.wfile, {"type": "snapshot", "snapshot": coordinator.snapshot})
+			coordinator.worker_connected()
+			connected = True
+			logging.info(f"Worker connected to coordinator at {coordinator.address}")
+
+			while True:
+				shard = coordinator.next_shard()
+				if shard is None:
+					send_message(self.wfile, {"type": "done"})
+					return
+
+				shard_id, target_max, start, stop = shard
+				send_message(self.wfile, {"type": "shard", "shard_id": shard_id, "target_max": target_max, "start": start, "stop": stop})
+				message = receive_message(self.rfile)
+				if message is None or message.get("type") != "result" or message.get("shard_id") != shard_id:
+					raise ConnectionError(f"worker dropped shard {shard_id}")
+
+				coordinator.complete_shard(shard, message["records"])
+				shard = None
+		except (OSError, ConnectionError, ValueError) as e:
+			logging.warning(f"Worker connection lost: {e}")
+		finally:
+			if shard is not None:
+				coordinator.release_shard(shard)
+			if connected:
+				coordinator.worker_disconnected()
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+	daemon_threads = True
+	allow_reuse_address = True
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+	class _ThreadingUnixServer(socketserver.ThreadingUnixStreamServer):
+		daemon_threads = True
+
+class Coordinator:
+	"""Hands out permutation shards to connected workers and collects their tie sets."""
+
+	def __init__(self, address, snapshot, token=None, shard_size=constants.SHARD_SIZE, lease_seconds=constants.SHARD_LEASE_SECONDS, wait_seconds=constants.WORKER_WAIT_SECONDS):
+		self.family, self.bind_address = parse_address(address)
+		self.snapshot = snapshot
+		self.token = token or secrets.token_urlsafe(16)  # Shared secret workers send in their hello
+		self.shard_size = shard_size
+		self.lease_seconds = lease_seconds
+		self.wait_seconds = wait_seconds  # Without a live worker for this long, evaluate pending shards here
+		self.address = None
+		self._server = None
+		self._thread = None
+		self._local_workers = []
+		self._condition = threading.Condition()
+		self._pending = deque()
+		self._in_flight = {}  # shard_id -> (shard, lease deadline)
+		self._results = {}  # shard_id -> records
+		self._next_shard_id = 0
+		self._closing = False
+		self._connections = 0
+		self._local_inputs = None  # (scheduler, peeps, events) rebuilt from the snapshot for in-process shards
+
+	def start(self):
+		"""Bind and start serving workers in a background thread."""
+		if self.family == socket.AF_INET:
+			self._server = _ThreadingTCPServer(self.bind_address, _ShardRequestHandler)
+		else:
+			if os.path.exists(self.bind_address):
+				os.unlink(self.bind_address)
+			self._server = _ThreadingUnixServer(self.bind_address, _ShardRequestHandler)
+		self._server.coordinator = self
+		self.address = format_address(self.family, self._server.server_address)
+		self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+		self._thread.start()
+		logging.info(f"Search coordinator listening on {self.address}")
+		return self
+
+	def start_local_workers(self, count):
+		"""Start worker processes on this machine that connect back over the coordinator's address."""
+		for _ in range(count):
+			process = multiprocessing.Process(target=run_worker, args=(self.address, self.token), daemon=True)
+			process.start()
+			self._local_workers.append(process)
+
+	def next_shard(self):
+		"""Block until a shard is available (or a lease expires) and lease it; None once closing."""
+		with self._condition:
+			while True:
+				if self._closing:
+					return None
+				if self._pending:
+					shard = self._pending.popleft()
+					self._in_flight[shard[0]] = (shard, time.monotonic() + self.lease_seconds)
+					return shard
+
+				now = time.monotonic()
+				for shard_id, (shard, deadline) in self._in_flight.items():
+					if deadline <= now:
+						logging.warning(f"Shard {shard_id} lease expired; handing it to another worker")
+						self._in_flight[shard_id] = (shard, now + self.lease_seconds)
+						return shard
+
+				self._condition.wait(timeout=1.0)
+
+	def worker_connected(self):
+		with self._condition:
+			self._connections += 1
+
+	def worker_disconnected(self):
+		with self._condition:
+			self._connections -= 1
+			self._condition.notify_all()
+
+	def _workers_alive(self):
+		"""Whether any worker is connected, or a local worker process is still starting or running."""
+		return self._connections > 0 or any(process.is_alive() for process in self._local_workers)
+
+	def _take_unfinished_shard(self, shard_ids):
+		"""Lease a pending (or, failing that, in-flight) shard of shard_ids to evaluate in-process."""
+		if self._pending:
+			shard = self._pending.popleft()
+		else:
+			shard = next((shard for shard_id, (shard, _) in self._in_flight.items()
+				if shard_id in shard_ids and shard_id not in self._results), None)
+			if shard is None:
+				return None
+		self._in_flight[shard[0]] = (shard, time.monotonic() + self.lease_seconds)
+		return shard
+
+	def evaluate_locally(self, shard):
+		"""Evaluate a shard in this process from the snapshot, as a worker would."""
+		if self._local_inputs is None:
+			self._local_inputs = load_snapshot(self.snapshot)
+		scheduler, peeps, events = self._local_inputs
+		_, target_max, start, stop = shard
+		return evaluate_shard(scheduler, peeps, events, target_max, start, stop)
+
+	def complete_shard(self, shard, records):
+		with self._condition:
+			shard_id = shard[0]
+			if shard_id not in self._results:
+				self._results[shard_id] = records
+			self._in_flight.pop(shard_id, None)
+			self._condition.notify_all()
+
+	def release_shard(self, shard):
+		"""Return a shard from a lost worker to the front of the queue."""
+		with self._condition:
+			shard_id = shard[0]
+			if shard_id not in self._results and shard_id in self._in_flight:
+				del self._in_flight[shard_id]
+				self._pending.appendleft(shard)
+				logging.warning(f"Requeued shard {shard_id} from a lost worker")
+			self._condition.notify_all()
+
+	def search_target(self, target_max, num_permutations):
+		"""
+		Shard one target_max's permutation space, wait for every shard, and merge the tie sets.
+
+		Returns:
+			list: [index, event ids, rank key] records tied for the best key, in index order
+		"""
+		with self._condition:
+			shard_ids = []
+			for start in range(0, num_permutations, self.shard_size):
+				shard = (self._next_shard_id, target_max, start, min(start + self.shard_size, num_permutations))
+				self._next_shard_id += 1
+				self._pending.append(shard)
+				shard_ids.append(shard[0])
+			self._condition.notify_all()
+			logging.info(f"target_max={target_max}: {len(shard_ids)} shard(s) of up to {self.shard_size} permutations queued")
+
+		idle_since = None
+		while True:
+			shard = None
+			with self._condition:
+				if all(shard_id in self._results for shard_id in shard_ids):
+					records = [record for shard_id in shard_ids for record in self._results.pop(shard_id)]
+					break
+				if self._workers_alive():
+					idle_since = None
+				elif idle_since is None:
+					idle_since = time.monotonic()
+				elif time.monotonic() - idle_since >= self.wait_seconds:
+					shard = self._take_unfinished_shard(shard_ids)
+				if shard is None:
+					self._condition.wait(timeout=1.0)
+					continue
+			logging.warning(f"No live workers for {self.wait_seconds}s; evaluating shard {shard[0]} in the coordinator")
+			self.complete_shard(shard, self.evaluate_locally(shard))
+		return best_records(records)
+
+	def close(self):
+		"""Tell workers the search is done, stop serving, and reap local workers."""
+		with self._condition:
+			self._closing = True
+			self._condition.notify_all()
+		for process in self._local_workers:
+			process.join(timeout=5)
+			if process.is_alive():
+				process.terminate()
+		if self._server:
+			self._server.shutdown()
+			self._server.server_close()
+			if self.family != socket.AF_INET and os.path.exists(self.bind_address):
+				os.unlink(self.bind_address)
+
+def start_coordinator(scheduler, peeps, events):
+	"""Start a coordinator for scheduler.run, plus any local workers it asked for."""
+	if not scheduler.listen and not scheduler.local_workers:
+		raise ValueError("the distributed engine needs --listen or --local-workers")
+	coordinator = Coordinator(scheduler.listen or "127.0.0.1:0", build_snapshot(scheduler, peeps, events), token=scheduler.worker_token).start()
+	if scheduler.listen and not scheduler.worker_token:
+		logging.info(f"Workers connect with: worker --connect {coordinator.address} --token {coordinator.token}")
+	if scheduler.local_workers:
+		coordinator.start_local_workers(scheduler.local_workers)
+	return coordinator
+
+# -- Worker --
+
+def run_worker(address, token, connect_timeout=constants.WORKER_CONNECT_TIMEOUT_SECONDS):
+	"""
+	Connect to a coordinator with its shared token, evaluate shards until told the search is done.
+
+	Returns:
+		int: number of shards evaluated
+	"""
+	family, target = parse_address(address)
+	deadline = time.monotonic() + connect_timeout
+	while True:
+		sock = socket.socket(family, socket.SOCK_STREAM)
+		try:
+			sock.connect(target)
+			break
+		except OSError:
+			sock.close()
+			if time.monotonic() >= deadline:
+				raise
+			time.sleep(0.2)
+
+	shards = 0
+	with sock, sock.makefile("rb") as rfile, sock.makefile("wb") as wfile:
+		send_message(wfile, {"type": "hello", "token": token})
+		message = receive_message(rfile)
+		if message and message.get("type") == "error":
+			raise ConnectionError(f"coordinator at {address} refused this worker: {message.get('message')}")
+		if not message or message.get("type") != "snapshot":
+			raise ConnectionError(f"coordinator at {address} did not send a snapshot")
+		scheduler, peeps, events = load_snapshot(message["snapshot"])
+
+		while True:
+			message = receive_message(rfile)
+			if message is None or message.get("type") == "done":
+				break
+			records = evaluate_shard(scheduler, peeps, events, message["target_max"], message["start"], message["stop"])
+			send_message(wfile, {"type": "result", "shard_id": message["shard_id"], "records": records})
+			shards += 1
+
+	logging.info(f"Worker finished after {shards} shard(s)")
+	return shards
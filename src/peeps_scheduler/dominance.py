@@ -0,0 +1,123 @@
+"""
+Dominated-event analysis before the search.
+
+Event B is dominated by event A when everyone who can attend B can also attend A, and
+the two are interchangeable with respect to interval conflicts (same date and duration,
+or no peep who could attend them has a minimum interval). Availability is compared as
+one bitset per event, so each pair is a single subset test.
+
+Dominated events can be dropped, or kept but ordered after their dominators. Ordering is
+exact for events with identical availability (the two orders are mirror images of each
+other) and prunes the permutation space by half for each such pair. Dropping is only safe
+when the dominated event can never run in the same sequence as its dominator, so drop mode
+keeps the others (ordering identical twins instead).
+"""
+
+import logging
+
+from peeps_scheduler import constants, utils
+
+
+def find_dominated_events(events, peeps):
+	"""
+	Map each dominated event to the first event in list order that dominates it.
+
+	Events with identical availability dominate each other; only the later one is reported,
+	so the relation has no cycles.
+
+	Returns:
+		dict: {dominated event id: dominator event id}
+	"""
+	capable = [peep for peep in peeps if peep.event_limit > 0]
+	masks = utils.availability_bitmasks(events, capable)
+	interval_masks = utils.availability_bitmasks(events, [peep for peep in capable if peep.min_interval_days > 0])
+
+	dominated = {}
+	for b, event_b in enumerate(events):
+		for a, event_a in enumerate(events):
+			if a == b:
+				continue
+			if masks[b] & ~masks[a]:
+				continue  # someone can attend B but not A
+			if masks[a] == masks[b] and a > b:
+				continue  # identical twins: the later event is the dominated one
+			if not interchangeable(event_a, event_b, interval_masks[a] | interval_masks[b]):
+				continue
+			dominated[event_b.id] = event_a.id
+			break
+	return dominated
+
+def identical_twins(events, peeps):
+	"""Pairs of event ids whose availability, among peeps with event capacity, is the same."""
+	masks = utils.availability_bitmasks(events, [peep for peep in peeps if peep.event_limit > 0])
+	return {
+		(event_a.id, event_b.id)
+		for a, event_a in enumerate(events) for b, event_b in enumerate(events)
+		if a != b and masks[a] == masks[b]
+	}
+
+def can_run_together(event_a, event_b, peeps):
+	"""
+	Whether both events could be valid in the same sequence.
+
+	Each needs at least its smallest valid fill in both roles (after any downgrade), and a peep
+	can fill at most as many of the two seats as they are available for and their event limit allows.
+	"""
+	min_fill = min(event_b.min_role, constants.ABS_MIN_ROLE)
+	seats = 0
+	for peep in peeps:
+		available = set(peep.availability)
+		seats += min(peep.event_limit, (event_a.id in available) + (event_b.id in available))
+	return seats >= 4 * min_fill
+
+def interchangeable(event_a, event_b, interval_peeps_mask):
+	"""Whether swapping the two events cannot change anyone's interval conflicts or class config."""
+	if event_a.duration_minutes != event_b.duration_minutes:
+		return False
+	return event_a.date.date() == event_b.date.date() or not interval_peeps_mask
+
+def respects_precedence(perm, precedence):
+	"""Whether every dominated event in perm comes after its dominator."""
+	if not precedence:
+		return True
+	position = {event_id: i for i, event_id in enumerate(perm)}
+	return all(
+		position[dominated] > position[dominator]
+		for dominated, dominator in precedence.items()
+		if dominated in position and dominator in position
+	)
+
+def apply_dominance(events, peeps, mode):
+	"""
+	Drop dominated events or return ordering constraints for them, depending on mode.
+
+	Drop mode only drops events that cannot run in the same sequence as their dominator; of the
+	rest, identical twins are ordered as in 'order' mode and other dominated events are kept as-is.
+
+	Returns:
+		tuple: (events to search, {dominated event id: dominator event id} precedence to respect)
+	"""
+	if mode == 'off' or len(events) < 2:
+		return events, {}
+
+	dominated = find_dominated_events(events, peeps)
+	if not dominated:
+		logging.info("Dominance analysis: no dominated events")
+		return events, {}
+
+	if mode == 'drop':
+		event_map = {event.id: event for event in events}
+		dropped = {b: a for b, a in dominated.items() if not can_run_together(event_map[a], event_map[b], peeps)}
+		twins = identical_twins(events, peeps)
+		precedence = {b: a for b, a in dominated.items() if b not in dropped and (a, b) in twins}
+		if dropped:
+			pairs = ", ".join(f"Event {b} by Event {a}" for b, a in dropped.items())
+			logging.info(f"Dominance analysis: dropping {len(dropped)} dominated event(s) that cannot run with their dominators: {pairs}")
+		if precedence:
+			pairs = ", ".join(f"Event {b} after Event {a}" for b, a in precedence.items())
+			logging.info(f"Dominance analysis: ordering {len(precedence)} identical twin(s) that could both run: {pairs}")
+		return [event for event in events if event.id not in dropped], precedence
+
+	pairs = ", ".join(f"Event {b} by Event {a}" for b, a in dominated.items())
+	logging.info(f"Dominance analysis: ordering {len(dominated)} dominated event(s) after their dominators: {pairs}")
+	return events, dominated
@@ -0,0 +1,182 @@
+"""
+Columnar export of period history for analytics.
+
+Attendance and fairness analysis across periods otherwise re-parses every period's
+members.csv, output.json, results.json and actual_attendance.json. export_periods writes
+each period as four tables (members, availability, assignments including alternates, and
+per-peep priority changes, from actual attendance once it is recorded) to Parquet, or to uncompressed Arrow IPC files that readers can
+memory-map without copying. Files are laid out as <table>/period=<slug>/data.<format>, so
+a Hive-partitioned dataset reader (pyarrow.dataset, DuckDB, Polars) scans all periods of a
+table at once. Every table has a fixed schema, so periods with missing files still export
+empty tables that read together with the rest.
+
+The tables are built as plain column lists by period_tables; only writing needs pyarrow,
+which is optional.
+"""
+
+import logging
+import os
+from pathlib import Path
+
+from peeps_scheduler import constants, file_io, utils
+from peeps_scheduler.database import RESULT_FILES
+
+try:
+	import pyarrow
+	import pyarrow.feather
+	import pyarrow.parquet
+except ImportError:
+	pyarrow = None
+
+# Errors export_periods raises for a missing pyarrow, bad arguments, unwritable output or data
+# pyarrow cannot convert
+EXPORT_ERRORS = (RuntimeError, ValueError, OSError) + ((pyarrow.ArrowException,) if pyarrow is not None else ())
+
+# Column names and types of every exported table
+TABLE_SCHEMAS = {
+	"members": [
+		("id", "int64"), ("display_name", "string"), ("email", "string"), ("role", "string"),
+		("index", "int64"), ("priority", "int64"), ("total_attended", "int64"), ("active", "bool"),
+		("date_joined", "string"), ("responded", "bool"), ("switch_pref", "int64"),
+		("event_limit", "int64"), ("min_interval_days", "int64"),
+	],
+	"availability": [
+		("peep_id", "int64"), ("event_id", "int64"), ("event_date", "string"), ("duration_minutes", "int64"),
+	],
+	"assignments": [
+		("source", "string"), ("event_id", "int64"), ("event_date", "string"), ("duration_minutes", "int64"),
+		("peep_id", "int64"), ("role", "string"), ("alternate", "bool"), ("position", "int64"),
+	],
+	"priority_changes": [
+		("peep_id", "int64"), ("priority_before", "int64"), ("priority_after", "int64"),
+		("total_attended_before", "int64"), ("total_attended_after", "int64"),
+	],
+}
+
+def pyarrow_available():
+	"""Whether pyarrow is installed, which writing export files needs."""
+	return pyarrow is not None
+
+def period_tables(period_path):
+	"""
+	Build a period folder's export tables from whichever of its files exist.
+
+	Returns:
+		dict: {table name: {column name: list of values}} with the columns of TABLE_SCHEMAS
+	"""
+	tables = {name: {column: [] for column, _ in schema} for name, schema in TABLE_SCHEMAS.items()}
+	members_csv = os.path.join(period_path, "members.csv")
+	responses_csv = os.path.join(period_path, "responses.csv")
+	output_json = os.path.join(period_path, "output.json")
+
+	# The converted roster has the members.csv fields plus each peep's response
+	if os.path.exists(output_json):
+		output = file_io.load_output_json(output_json)
+		peeps, events = output["peeps"], output["events"]
+	elif os.path.exists(members_csv):
+		peeps, events = [peep.to_dict() for peep in file_io.load_peeps(members_csv)], []
+	else:
+		peeps, events = [], []
+	events_by_id = {event["id"]: event for event in events}
+
+	members = tables["members"]
+	for peep in peeps:
+		members["id"].append(peep["id"])
+		members["display_name"].append(peep["display_name"])
+		members["email"].append(file_io.normalize_email(peep["email"]))
+		members["role"].append(peep["role"])
+		members["index"].append(peep["index"])
+		members["priority"].append(peep["priority"])
+		members["total_attended"].append(peep["total_attended"])
+		members["active"].append(bool(peep["active"]))
+		members["date_joined"].append(peep["date_joined"])
+		members["responded"].append(bool(peep.get("responded", False)))
+		members["switch_pref"].append(peep.get("switch_pref"))
+		members["event_limit"].append(peep.get("event_limit"))
+		members["min_interval_days"].append(peep.get("min_interval_days"))
+
+	availability = tables["availability"]
+	for peep in peeps:
+		for event_id in peep.get("availability", []):
+			event = events_by_id[event_id]
+			availability["peep_id"].append(peep["id"])
+			availability["event_id"].append(event_id)
+			availability["event_date"].append(event["date"])
+			availability["duration_minutes"].append(event["duration_minutes"])
+
+	assignments = tables["assignments"]
+	results_peeps = []
+	for source, filename in RESULT_FILES.items():
+		path = os.path.join(period_path, filename)
+		if not os.path.exists(path):
+			continue
+		result = file_io.load_json(path)
+		if source == "results":
+			results_peeps = result.get("peeps", [])
+		for event in result.get("valid_events", []):
+			for alternate, key in enumerate(("attendees", "alternates")):
+				for position, attendee in enumerate(event.get(key, [])):
+					assignments["source"].append(source)
+					assignments["event_id"].append(event["id"])
+					assignments["event_date"].append(event["date"])
+					assignments["duration_minutes"].append(event["duration_minutes"])
+					assignments["peep_id"].append(attendee["id"])
+					assignments["role"].append(attendee["role"])
+					assignments["alternate"].append(bool(alternate))
+					assignments["position"].append(position)
+
+	# Priority before the period comes from members.csv (as loaded into output.json); after it,
+	# from actual attendance applied to members.csv like apply-results does, or else (also when
+	# the attendance cannot be applied, so one bad period does not stop the export) from the
+	# scheduled results
+	actual_json = os.path.join(period_path, RESULT_FILES["actual"])
+	after_peeps = results_peeps
+	if os.path.exists(actual_json) and os.path.exists(members_csv):
+		try:
+			after_peeps = [peep.to_dict() for peep in utils.apply_event_results(actual_json, members_csv, responses_csv)]
+		except (ValueError, RuntimeError, KeyError) as e:
+			logging.warning(f"Could not apply actual attendance in {period_path}, using scheduled results: {e}")
+	before = {peep["id"]: peep for peep in peeps}
+	changes = tables["priority_changes"]
+	for peep in after_peeps:
+		previous = before.get(peep["id"], {})
+		changes["peep_id"].append(peep["id"])
+		changes["priority_before"].append(previous.get("priority"))
+		changes["priority_after"].append(peep["priority"])
+		changes["total_attended_before"].append(previous.get("total_attended"))
+		changes["total_attended_after"].append(peep["total_attended"])
+
+	return tables
+
+def write_table(columns, schema, path, format="parquet"):
+	"""Write one table's columns to a Parquet or Arrow IPC file with the given schema."""
+	arrow_schema = pyarrow.schema([(name, pyarrow.type_for_alias(type_name)) for name, type_name in schema])
+	table = pyarrow.table(columns, schema=arrow_schema)
+	if format == "parquet":
+		pyarrow.parquet.write_table(table, path)
+	else:
+		pyarrow.feather.write_feather(table, path, compression="uncompressed")
+
+def export_periods(data_manager, output_dir, format="parquet", periods=None):
+	"""
+	Export periods (all of the DataManager's by default) as <table>/period=<slug>/data.<format>.
+
+	Returns:
+		list of Path: the files written
+	"""
+	if format not in constants.EXPORT_FORMATS:
+		raise ValueError(f"unknown export format: {format}")
+	if not pyarrow_available():
+		raise RuntimeError("pyarrow is not installed; install it to export columnar files")
+
+	written = []
+	for period_slug in periods or data_manager.list_periods():
+		tables = period_tables(data_manager.get_period_path(period_slug))
+		for name, schema in TABLE_SCHEMAS.items():
+			folder = Path(output_dir) / name / f"period={period_slug}"
+			folder.mkdir(parents=True, exist_ok=True)
+			path = folder / f"data.{format}"
+			write_table(tables[name], schema, path, format=format)
+			written.append(path)
+		logging.info(f"Exported period {period_slug} to {output_dir}")
+	return written
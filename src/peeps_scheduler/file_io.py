@@ -1,12 +1,21 @@
+import calendar
 import csv
 import datetime
+import functools
+import io
 import json
 import logging
 import os
+import re
 import sys
 from peeps_scheduler.models import EventSequence, Peep, Event, Role, SwitchPreference
 import peeps_scheduler.constants as constants
 
+try:
+	import orjson
+except ImportError:
+	orjson = None
+
 # -- Constants --
 
 PEEPS_CSV_FIELDS = [
@@ -38,62 +47,94 @@ def normalize_email(email):
 
 # -- CSV-related --
 
-def load_csv(filename, required_columns=[]):
-	"""Load CSV file and validate required columns, trimming whitespace from headers and values."""
+# Smart quotes to ASCII quotes, and runs of whitespace to one space, applied to every CSV value
+_QUOTE_TABLE = str.maketrans({"’": "'", "‘": "'", "“": '"', "”": '"'})
+_WHITESPACE_RUN = re.compile(r'\s+')
+
+def _normalize_value(value):
+	"""Strip a CSV value, straighten smart quotes and collapse whitespace runs."""
+	if not value:
+		return ""
+	return _WHITESPACE_RUN.sub(' ', value.strip().translate(_QUOTE_TABLE))
+
+def iter_csv(filename, required_columns=(), offset=0):
+	"""
+	Stream rows of a CSV file as dicts, trimming whitespace from headers and values.
+
+	The file is opened when iteration starts and closed when it ends, or when the caller
+	stops early and the iterator is closed or discarded. The header is read and required
+	columns are validated before the first row, so a missing column raises ValueError
+	without yielding anything. A nonzero offset starts reading rows at that byte position,
+	which must be a row boundary.
+	"""
 	with open(filename, newline='', encoding='utf-8') as csvfile:
-		# Read the first line (fieldnames), trim whitespace
-		reader = csv.reader(csvfile)
-		try:
-			raw_fieldnames = next(reader)
-		except StopIteration:
-			return []
+		raw_fieldnames = next(csv.reader(csvfile), None)
+		if raw_fieldnames is None:
+			return
 
 		fieldnames = [name.strip() for name in raw_fieldnames]
-
-		# Check required columns
 		missing = set(required_columns) - set(fieldnames)
-		if required_columns and missing:
+		if missing:
 			raise ValueError(f"missing required column(s): {missing}")
 
-		# Rebuild DictReader with cleaned headers
-		dict_reader = csv.DictReader(csvfile, fieldnames=fieldnames)
-		rows = []
-		
-		# Replace smart quotes (’) with ASCII quotes (') and normalize whitespace
-		def _normalize_text(s):
-			s = s.replace("’", "'").replace("‘", "'").replace("“", '"').replace("”", '"')
-			# Normalize multiple spaces to single space
-			import re
-			s = re.sub(r'\s+', ' ', s)
-			return s
-
-		# Strip whitespace, normalize quotes and whitespace for every value
-		for row in dict_reader:
-			cleaned = {k: _normalize_text(v.strip()) if v else "" for k, v in row.items()}
-			rows.append(cleaned)
-
-		return rows
+		if not offset:
+			yield from _normalized_rows(csvfile, fieldnames)
+			return
+
+	with open(filename, 'rb') as raw:
+		raw.seek(offset)
+		with io.TextIOWrapper(raw, newline='', encoding='utf-8') as csvfile:
+			yield from _normalized_rows(csvfile, fieldnames)
+
+def _normalized_rows(csvfile, fieldnames):
+	for row in csv.DictReader(csvfile, fieldnames=fieldnames):
+		yield {k: _normalize_value(v) for k, v in row.items()}
+
+def load_csv(filename, required_columns=()):
+	"""Load CSV file and validate required columns, trimming whitespace from headers and values."""
+	return list(iter_csv(filename, required_columns))
+
+def build_email_index(peeps):
+	"""
+	Index peeps by normalized email in one pass, skipping peeps without an email.
+
+	Returns:
+		tuple: ({normalized email: first peep with it}, set of emails shared by more than one peep)
+	"""
+	index = {}
+	duplicates = set()
+	for peep in peeps:
+		email = normalize_email(peep.email)
+		if not email:
+			continue
+		if email in index:
+			duplicates.add(email)
+		else:
+			index[email] = peep
+	return index, duplicates
 
 def load_peeps(peeps_csv_path):
 	"""Load and convert peep rows from CSV into Peep instances. Validates unique emails."""
-	rows = load_csv(peeps_csv_path, PEEPS_CSV_FIELDS)
-	peeps = [Peep.from_csv(row) for row in rows]
-	emails = []
+	return load_peeps_with_index(peeps_csv_path)[0]
+
+def load_peeps_with_index(peeps_csv_path):
+	"""
+	Load peeps like load_peeps and also return their email index for matching responses.
+
+	Returns:
+		tuple: (list of Peep, {normalized email: Peep})
+	"""
+	peeps = [Peep.from_csv(row) for row in iter_csv(peeps_csv_path, PEEPS_CSV_FIELDS)]
 
 	for peep in peeps:
-		email = normalize_email(peep.email)
-		if peep.active:
-			if not email:
-				raise ValueError(f"active peep '{peep.full_name}' is missing an email.")
-			emails.append(email)
-		elif email:
-			emails.append(email)
-
-	dupes = {email for email in emails if emails.count(email) > 1}
+		if peep.active and not normalize_email(peep.email):
+			raise ValueError(f"active peep '{peep.full_name}' is missing an email.")
+
+	email_index, dupes = build_email_index(peeps)
 	if dupes:
 		raise ValueError(f"duplicate email(s) found in peeps: {sorted(dupes)}")
 
-	return peeps
+	return peeps, email_index
 
 def load_responses(response_csv_path):
 	"""Load and parse response rows from responses.csv."""
@@ -119,19 +160,35 @@ def load_json(filename):
 	except FileNotFoundError:
 		return None
 
-def save_json(data, filename):
-	"""Save data to a JSON file, handling Enums and datetime."""
-	def custom_serializer(obj):
-		if hasattr(obj, "value"):
-			return obj.value
-		if isinstance(obj, datetime.datetime):
-			return obj.strftime(constants.DATE_FORMAT)
-		if isinstance(obj, datetime.date):
-			return obj.isoformat()
-		return str(obj)
+def _json_default(obj):
+	"""Encode Enums by value, datetimes in DATE_FORMAT, dates as ISO and anything else as str."""
+	if hasattr(obj, "value"):
+		return obj.value
+	if isinstance(obj, datetime.datetime):
+		return obj.strftime(constants.DATE_FORMAT)
+	if isinstance(obj, datetime.date):
+		return obj.isoformat()
+	return str(obj)
+
+def save_json(data, filename, compact=False):
+	"""
+	Save data to a JSON file, handling Enums and datetime.
 
-	with open(filename, "w") as f:
-		json.dump(data, f, indent=4, default=custom_serializer)
+	The default output is indented for reading. With compact, it is written without
+	whitespace by orjson when installed (Enums natively, datetimes through the same
+	default) or by the standard library's C encoder. Both decode to the same data, but
+	the bytes can differ: orjson writes floats like 1e16 and 1e-7 where the standard
+	library writes 1e+16 and 1e-07.
+	"""
+	if not compact:
+		with open(filename, "w") as f:
+			f.write(json.dumps(data, indent=4, default=_json_default))
+	elif orjson is not None:
+		with open(filename, "wb") as f:
+			f.write(orjson.dumps(data, default=_json_default, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS))
+	else:
+		with open(filename, "w", encoding="utf-8") as f:
+			f.write(json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=_json_default))
 
 def load_cancelled_events(data_folder, year=None):
 	"""
@@ -258,10 +315,75 @@ def load_partnerships(data_folder, partnerships_filename='partnerships.json', va
 
 	return requests
 
+def save_output_json(output, filename, compact=False, version=1):
+	"""
+	Save converted data ({"responses", "events", "peeps"} as convert_to_json builds it) as output.json.
+
+	Version 1 writes it as is. Version 2 replaces each peep's availability list with an
+	"availability_bits" string holding "1" at the position of every event it lists, and
+	moves the responses audit data to RESPONSES_AUDIT_FILE next to output.json.
+	"""
+	if version == 1:
+		save_json(output, filename, compact=compact)
+		return
+	if version != 2:
+		raise ValueError(f"unsupported output.json version: {version}")
+
+	positions = {event["id"]: e for e, event in enumerate(output["events"])}
+	peeps = []
+	for peep in output["peeps"]:
+		if "availability" in peep:
+			bits = ["0"] * len(positions)
+			for event_id in peep["availability"]:
+				if event_id not in positions:
+					raise ValueError(f"peep {peep['id']} is available for unknown event {event_id}")
+				bits[positions[event_id]] = "1"
+			peep = {key: value for key, value in peep.items() if key != "availability"}
+			peep["availability_bits"] = "".join(bits)
+		peeps.append(peep)
+
+	save_json(output["responses"], os.path.join(os.path.dirname(filename), constants.RESPONSES_AUDIT_FILE), compact=compact)
+	save_json({
+		"version": 2,
+		"responses_file": constants.RESPONSES_AUDIT_FILE,
+		"events": output["events"],
+		"peeps": peeps,
+	}, filename, compact=compact)
+
+def load_output_json(filename, include_responses=False):
+	"""
+	Load output.json of either version in the version 1 layout, with availability lists.
+
+	Version 2 responses are in a separate file, read only with include_responses;
+	otherwise "responses" is left out.
+	"""
+	data = load_json(filename)
+	version = data.get("version", 1)
+	if version == 1:
+		return data
+	if version != 2:
+		raise ValueError(f"unsupported output.json version: {version}")
+
+	event_ids = [event["id"] for event in data["events"]]
+	peeps = []
+	for peep in data["peeps"]:
+		if "availability_bits" in peep:
+			peep = dict(peep)
+			bits = peep.pop("availability_bits")
+			peep["availability"] = [event_ids[e] for e, bit in enumerate(bits) if bit == "1"]
+		peeps.append(peep)
+
+	output = {"events": data["events"], "peeps": peeps}
+	if include_responses:
+		output["responses"] = load_json(os.path.join(os.path.dirname(filename), data["responses_file"])) or []
+	return output
+
 def load_data_from_json(filename):
-	"""Load peeps and events from an existing output JSON file."""
-	json_data = load_json(filename)
-	response_data = json_data['responses']
+	"""Load peeps and events from an existing output JSON file (either version)."""
+	return load_data_from_output(load_output_json(filename))
+
+def load_data_from_output(json_data):
+	"""Build peeps and events from output.json contents in the version 1 layout."""
 	event_data = json_data['events']
 	peeps_data = json_data['peeps']
 
@@ -274,26 +396,29 @@ def load_data_from_json(filename):
 
 	return sorted_peeps, events
 
-def save_event_sequence(sequence: EventSequence, filename):
-	"""Serialize and save an EventSequence to JSON."""
-	save_json(sequence.to_dict(), filename)
+def save_event_sequence(sequence: EventSequence, filename, compact=False):
+	"""Serialize and save an EventSequence to JSON (see save_json for compact)."""
+	save_json(sequence.to_dict(), filename, compact=compact)
 	logging.info(f"Saved event sequence to {filename}")
 
 # -- Response conversion --
 
-def convert_to_json(response_csv_path, peeps_csv_path, output_json_path, year=None):
-	"""Main function: convert responses and members CSVs into output.json."""
-	peeps = load_peeps(peeps_csv_path)
+def convert_to_json(response_csv_path, peeps_csv_path, output_json_path, year=None, compact=False, version=1):
+	"""
+	Main function: convert responses and members CSVs into output.json.
+	See save_json for compact and save_output_json for version.
+	"""
+	peeps, email_index = load_peeps_with_index(peeps_csv_path)
 	response_rows = load_responses(response_csv_path)
 	event_map = extract_events(response_rows, year=year)
-	updated_peeps, responses_data = process_responses(response_rows, peeps, event_map, year=year)
+	updated_peeps, responses_data = process_responses(response_rows, peeps, event_map, year=year, email_index=email_index)
 
 	output = {
 		"responses": responses_data,
 		"events": [event.to_dict() for event in event_map.values()],
 		"peeps": [peep.to_dict() for peep in updated_peeps],
 	}
-	save_json(output, output_json_path)
+	save_output_json(output, output_json_path, compact=compact, version=version)
 
 def load_cancellations(filename, year=None):
     """
@@ -485,8 +610,13 @@ def extract_events(rows, year=None):
 
 	return event_map
 
-def process_responses(rows, peeps, event_map, year=None):
-	"""Update peep objects from responses and return updated peeps and response summaries."""
+def process_responses(rows, peeps, event_map, year=None, email_index=None):
+	"""
+	Update peep objects from responses and return updated peeps and response summaries.
+	Responders are matched through email_index, built from peeps if not given.
+	"""
+	if email_index is None:
+		email_index, _ = build_email_index(peeps)
 	responses_data = []
 
 	for row in rows:
@@ -498,7 +628,7 @@ def process_responses(rows, peeps, event_map, year=None):
 		if not email:
 			raise ValueError(f"missing email for row: {name}")
 
-		peep = next((p for p in peeps if normalize_email(p.email) == email), None)
+		peep = email_index.get(email)
 		if not peep:
 			raise ValueError(f"no matching peep found for email: {email} (row: {name})")
 		if not peep.active: 
@@ -512,7 +642,7 @@ def process_responses(rows, peeps, event_map, year=None):
 
 		available_strs = [s.strip() for s in row.get("Availability", "").split(",") if s.strip()]
 		for date_str in available_strs:
-			event_id, _, _ = parse_event_date(date_str, year=year)
+			event_id = parse_event_key(date_str, year=year).event_id
 			event = event_map.get(event_id)
 			if not event:
 				logging.warning(f"{name} listed availability for unknown event: {event_id}")
@@ -590,6 +720,97 @@ def parse_time_range(time_str):
 
 	return (start_time.strftime("%H:%M"), end_time.strftime("%H:%M"), duration)
 
+class EventKey:
+	"""
+	Canonical parsed event date: start datetime, duration in minutes (None for the old
+	format without a time range) and display name. Keys are shared through the
+	parse_event_key cache, so treat them as read-only.
+	"""
+
+	__slots__ = ("display_name", "duration", "event_id", "start")
+
+	def __init__(self, start, duration=None, display_name=""):
+		self.start = start
+		self.duration = duration
+		self.display_name = display_name
+		self.event_id = start.strftime(constants.DATE_FORMAT)
+
+	def __eq__(self, other):
+		if not isinstance(other, EventKey):
+			return NotImplemented
+		return (self.start, self.duration) == (other.start, other.duration)
+
+	def __hash__(self):
+		return hash((self.start, self.duration))
+
+	def __repr__(self):
+		return f"EventKey({self.event_id!r}, duration={self.duration})"
+
+# Lowercase full names, as strptime's %B and %A matched them
+_MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+_WEEKDAYS = {name.lower() for name in calendar.day_name}
+_ORDINAL_SUFFIXES = ("st", "nd", "rd", "th")
+
+def _parse_month_day(date_part):
+	"""Parse "Friday January 9th" into (month, day); the weekday name is checked but not used."""
+	words = date_part.lower().split()
+	if len(words) != 3 or words[0] not in _WEEKDAYS or words[1] not in _MONTHS:
+		raise ValueError(f"expected 'Weekday Month Day': {date_part}")
+	day = words[2]
+	if day.endswith(_ORDINAL_SUFFIXES):
+		day = day[:-2]
+	if not day.isdigit() or len(day) > 2:
+		raise ValueError(f"invalid day: {words[2]}")
+	return _MONTHS[words[1]], int(day)
+
+def _parse_hour(time_part):
+	"""Parse a 12-hour time like "5pm" (the old format's %I%p) into a 24-hour hour."""
+	text = time_part.strip().lower()
+	hour, meridiem = text[:-2], text[-2:]
+	if meridiem not in ("am", "pm") or not hour.isdigit() or not 1 <= int(hour) <= 12:
+		raise ValueError(f"invalid time format: {time_part}")
+	return int(hour) % 12 + (12 if meridiem == "pm" else 0)
+
+@functools.lru_cache(maxsize=constants.EVENT_KEY_CACHE_SIZE)
+def _parse_event_key(date_str, year):
+	# Strip any trailing notes in parentheses
+	display_name = date_str.split('(')[0].strip()
+
+	parts = display_name.split(" - ")
+	if len(parts) != 2:
+		raise ValueError(f"invalid event date format (expected 'Date - Time'): {display_name}")
+	date_part, time_part = parts[0].strip(), parts[1].strip()
+
+	try:
+		month, day = _parse_month_day(date_part)
+		if " to " in time_part:
+			# New format: "Friday January 9th - 5:30pm to 7pm"
+			start_time, _, duration = parse_time_range(time_part)
+			hour, minute = map(int, start_time.split(':'))
+		else:
+			# Old format (backward compatibility): "Friday October 17 - 5pm"
+			duration, hour, minute = None, _parse_hour(time_part), 0
+		start = datetime.datetime(year, month, day, hour, minute)
+	except ValueError as e:
+		raise ValueError(f"invalid date format in '{display_name}': {e}") from e
+
+	return EventKey(start, duration, display_name)
+
+def parse_event_key(date_str, year=None):
+	"""
+	Parse an event date string into its EventKey.
+
+	Supports "Friday January 9th - 5:30pm to 7pm" and the old "Friday October 17 - 5pm".
+	Parsed keys are memoized by (date_str, year), so each distinct string is parsed once.
+
+	Args:
+		date_str: Date string to parse
+		year: Optional year to use. Defaults to current year if not provided.
+	"""
+	if year is None:
+		year = datetime.datetime.now().year
+	return _parse_event_key(date_str, year)
+
 def parse_event_date(date_str, year=None):
 	"""
 	Parse an event date string and return event ID, duration (if present), and display name.
@@ -606,61 +827,5 @@ def parse_event_date(date_str, year=None):
 		tuple: (event_id, duration_minutes or None, display_name)
 		Example: ("2026-01-09 17:30", 90, "Friday January 9th - 5:30pm to 7pm")
 	"""
-	import re
-
-	if year is None:
-		year = datetime.datetime.now().year
-
-	# Strip any trailing notes in parentheses
-	date_str = date_str.split('(')[0].strip()
-	display_name = date_str
-
-	# Check if this is a time range format (contains " to ")
-	has_time_range = " to " in date_str
-
-	if has_time_range:
-		# New format: "Friday January 9th - 5:30pm to 7pm"
-		# Split on " - " to separate date from time range
-		parts = date_str.split(" - ")
-		if len(parts) != 2:
-			raise ValueError(f"invalid event date format (expected 'Date - Time Range'): {date_str}")
-
-		date_part = parts[0].strip()
-		time_range_part = parts[1].strip()
-
-		# Remove ordinal suffixes (st, nd, rd, th) from date
-		date_part = re.sub(r'(\d+)(st|nd|rd|th)', r'\1', date_part)
-
-		# Parse the date part (e.g., "Friday January 9")
-		try:
-			dt = datetime.datetime.strptime(date_part, "%A %B %d")
-		except ValueError as e:
-			raise ValueError(f"invalid date format in '{date_str}': {e}")
-
-		# Parse the time range to get start time and duration
-		start_time_str, end_time_str, duration = parse_time_range(time_range_part)
-
-		# Set year from parameter or current year
-		dt = dt.replace(year=year)
-
-		# Combine date with start time
-		start_hour, start_minute = map(int, start_time_str.split(':'))
-		dt = dt.replace(hour=start_hour, minute=start_minute)
-
-		event_id = dt.strftime("%Y-%m-%d %H:%M")
-		return (event_id, duration, display_name)
-
-	else:
-		# Old format: "Friday October 17 - 5pm" (backward compatibility)
-		# Remove ordinal suffixes if present
-		date_str_normalized = re.sub(r'(\d+)(st|nd|rd|th)', r'\1', date_str)
-
-		try:
-			dt = datetime.datetime.strptime(date_str_normalized, constants.DATESTR_FORMAT)
-		except ValueError:
-			# Try without ordinals in original
-			dt = datetime.datetime.strptime(date_str, constants.DATESTR_FORMAT)
-
-		dt = dt.replace(year=year)
-		event_id = dt.strftime("%Y-%m-%d %H:%M")
-		return (event_id, None, display_name)
+	key = parse_event_key(date_str, year)
+	return (key.event_id, key.duration, key.display_name)
@@ -0,0 +1,191 @@
+"""
+Incremental ingest of responses.csv into output.json.
+
+Form responses trickle in over several days, and reconverting every row each time
+repeats work already done. The ingest state remembers how much of responses.csv has
+been applied: the byte offset and a hash of the bytes before it, a hash and email per
+row, and the last Timestamp. An update parses only the rows appended past the offset
+and applies them to the peeps and events stored in output.json, renumbering events only
+when new date strings appear. If earlier bytes changed, every row is re-read and
+compared by hash; peeps whose rows were edited in place are rebuilt from members.csv and
+their own rows, and everyone else keeps their stored state.
+
+Changes the state cannot account for (removed rows, edited Event rows, a different year)
+return None so the caller falls back to a full file_io.convert_to_json. Either way the
+resulting output.json is identical to a full conversion of the same files.
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+
+from peeps_scheduler import file_io
+from peeps_scheduler.models import Event, Role, SwitchPreference
+
+INGEST_VERSION = 1
+
+def row_hash(row):
+	"""Hash of a normalized responses.csv row."""
+	return hashlib.sha256(json.dumps(row, sort_keys=True).encode("utf-8")).hexdigest()
+
+def is_response_row(row):
+	"""Whether process_responses treats the row as a response (named and not an Event row)."""
+	name = row.get("Name", "")
+	return bool(name) and not name.startswith("Event:")
+
+def row_record(row):
+	"""Per-row state: [hash, normalized email, or None for rows that are not responses]."""
+	email = file_io.normalize_email(row.get("Email Address", "")) if is_response_row(row) else None
+	return [row_hash(row), email]
+
+def file_digest(path, limit=None):
+	"""
+	Hash the first limit bytes of a file (all of it by default).
+
+	Returns:
+		tuple: (hex digest, number of bytes hashed, whether those bytes end with a newline)
+	"""
+	digest = hashlib.sha256()
+	last = b"\n"
+	size = 0
+	with open(path, "rb") as f:
+		while limit is None or size < limit:
+			chunk = f.read(1 << 20 if limit is None else min(1 << 20, limit - size))
+			if not chunk:
+				break
+			digest.update(chunk)
+			size += len(chunk)
+			last = chunk[-1:]
+	return digest.hexdigest(), size, last == b"\n"
+
+def build_state(response_csv_path, records, last_timestamp, event_rows, year):
+	"""Ingest state for responses.csv as it is now, given the records of all its rows."""
+	digest, size, at_row_boundary = file_digest(response_csv_path)
+	return {
+		"version": INGEST_VERSION,
+		"year": year,
+		"offset": size,
+		"prefix": digest,
+		"at_row_boundary": at_row_boundary,  # rows can only be appended after a final newline
+		"rows": records,
+		"last_timestamp": last_timestamp,
+		"event_rows": event_rows,
+	}
+
+def last_response_timestamp(rows, default=None):
+	"""Timestamp of the last response row, or default if there is none."""
+	timestamps = [row.get("Timestamp", "") for row in rows if is_response_row(row)]
+	return timestamps[-1] if timestamps else default
+
+def convert(response_csv_path, peeps_csv_path, output_json_path, year=None, compact=False, version=1):
+	"""Fully convert the CSVs with file_io.convert_to_json and return the ingest state for later updates."""
+	year = year or datetime.datetime.now().year
+	file_io.convert_to_json(response_csv_path, peeps_csv_path, output_json_path, year=year, compact=compact, version=version)
+	rows = file_io.load_responses(response_csv_path)
+	event_rows = any(row.get("Name", "").startswith("Event:") for row in rows)
+	return build_state(response_csv_path, [row_record(row) for row in rows], last_response_timestamp(rows), event_rows, year)
+
+def renumber_events(event_map):
+	"""Give auto-derived events ids in date order, as extract_events does."""
+	renumbered = {}
+	for new_id, event_id in enumerate(sorted(event_map)):
+		event = event_map[event_id]
+		event.id = new_id
+		renumbered[event_id] = event
+	return renumbered
+
+def restore_response(peep, data, event_ids):
+	"""Copy the response fields stored in output.json back onto a peep loaded from members.csv."""
+	peep.role = Role(data["role"])
+	peep.switch_pref = SwitchPreference(data["switch_pref"])
+	peep.event_limit = data["event_limit"]
+	peep.min_interval_days = data["min_interval_days"]
+	peep.availability = [event_ids[event_id] for event_id in data["availability"]]
+	peep.responded = True
+
+def update(response_csv_path, peeps_csv_path, output_json_path, state, year=None, compact=False, version=1):
+	"""
+	Apply the responses.csv rows appended or edited since state to output.json.
+	members.csv must be unchanged since output.json was written.
+
+	Returns:
+		dict: the new ingest state, or None if the change needs a full conversion
+	"""
+	year = year or datetime.datetime.now().year
+	if not state or state.get("version") != INGEST_VERSION or state.get("year") != year:
+		return None
+
+	old_records = state["rows"]
+	prefix, size, _ = file_digest(response_csv_path, state["offset"])
+	if size == state["offset"] and prefix == state["prefix"] and state["at_row_boundary"]:
+		# Only appended: parse the new bytes
+		old_rows = []
+		new_rows = list(file_io.iter_csv(response_csv_path, file_io.RESPONSES_CSV_FIELDS, offset=state["offset"]))
+		changed = []
+	else:
+		rows = file_io.load_responses(response_csv_path)
+		if len(rows) < len(old_records):
+			return None
+		old_rows, new_rows = rows[:len(old_records)], rows[len(old_records):]
+		changed = [i for i, row in enumerate(old_rows) if row_hash(row) != old_records[i][0]]
+		if any(old_records[i][1] is None or not is_response_row(old_rows[i]) for i in changed):
+			return None
+	if any(row.get("Name", "").startswith("Event:") for row in new_rows):
+		return None
+	if not changed and not new_rows:
+		return build_state(response_csv_path, old_records, state["last_timestamp"], state["event_rows"], year)
+
+	output = file_io.load_output_json(output_json_path, include_responses=True)
+	old_event_ids = {event["id"]: event["date"] for event in output["events"]}
+	if changed:
+		event_map = file_io.extract_events(old_rows + new_rows, year=year)
+	else:
+		event_map = {event["date"]: Event.from_dict(dict(event)) for event in output["events"]}
+		if not state["event_rows"]:
+			added = {event_id: event for event_id, event in file_io.extract_events(new_rows, year=year).items() if event_id not in event_map}
+			if added:
+				event_map = renumber_events({**event_map, **added})
+	event_ids = {old_id: event_map[event_id].id for old_id, event_id in old_event_ids.items() if event_id in event_map}
+
+	# Peeps with edited rows start over from members.csv; everyone else keeps their stored responses
+	affected = {old_records[i][1] for i in changed}
+	affected |= {file_io.normalize_email(old_rows[i].get("Email Address", "")) for i in changed}
+	peeps, email_index = file_io.load_peeps_with_index(peeps_csv_path)
+	stored = {data["id"]: data for data in output["peeps"]}
+	for peep in peeps:
+		data = stored.get(peep.id)
+		if data and data.get("responded") and file_io.normalize_email(peep.email) not in affected:
+			restore_response(peep, data, event_ids)
+
+	replayed = [i for i, record in enumerate(old_records) if record[1] is not None and record[1] in affected]
+	replay_rows = [old_rows[i] for i in replayed]
+	_, entries = file_io.process_responses(replay_rows + new_rows, peeps, event_map, year=year, email_index=email_index)
+
+	response_positions = {}
+	for i, record in enumerate(old_records):
+		if record[1] is not None:
+			response_positions[i] = len(response_positions)
+	responses = output["responses"]
+	if len(responses) != len(response_positions) or len(entries) < len(replayed):
+		return None
+	for i, entry in zip(replayed, entries[:len(replayed)], strict=True):
+		responses[response_positions[i]] = entry
+	responses.extend(entries[len(replayed):])
+
+	file_io.save_output_json({
+		"responses": responses,
+		"events": [event.to_dict() for event in event_map.values()],
+		"peeps": [peep.to_dict() for peep in peeps],
+	}, output_json_path, compact=compact, version=version)
+
+	records = list(old_records)
+	for i in changed:
+		records[i] = row_record(old_rows[i])
+	records.extend(row_record(row) for row in new_rows)
+	logging.info(
+		f"Ingested {len(new_rows)} new and {len(changed)} edited response row(s) "
+		f"since {state['last_timestamp'] or 'the first ingest'}"
+	)
+	timestamp = last_response_timestamp(new_rows, state["last_timestamp"])
+	return build_state(response_csv_path, records, timestamp, state["event_rows"], year)
@@ -0,0 +1,340 @@
+"""
+Array evaluation kernel for the greedy fill/balance inner loop.
+
+Evaluating one event order on Peep/Event objects needs a deep copy of the roster and
+a lot of attribute and list traffic. The kernel evaluates the same order on flat integer
+arrays instead (role, switch preference, event limit, minimum interval, availability,
+calendar day gaps between events, and the line order), reusing preallocated buffers.
+
+It is exactly equivalent to Scheduler.evaluate_sequence with greedy assignment: same
+line order, same promotions, balancing and downgrades, and the same metrics. When Numba
+is installed the kernel is compiled at run time; otherwise it runs as plain Python.
+Only the best-ranked orders are rebuilt as full EventSequences.
+"""
+
+from peeps_scheduler import constants
+from peeps_scheduler.models import EventSequence, Role, SwitchPreference
+
+try:
+	import numba
+	import numpy
+except ImportError:
+	numba = None
+	numpy = None
+
+LEADER, FOLLOWER = 0, 1
+SWITCH_IF_PRIMARY_FULL = SwitchPreference.SWITCH_IF_PRIMARY_FULL.value
+SWITCH_IF_NEEDED = SwitchPreference.SWITCH_IF_NEEDED.value
+
+# Class configs in ascending duration, the order downgrade_duration tries them in
+DURATIONS = sorted(constants.CLASS_CONFIG)
+
+def jit_available():
+	"""Whether Numba is installed, so the kernel is compiled instead of interpreted."""
+	return numba is not None
+
+def evaluate_order(
+	order, roles, switch_prefs, event_limits, min_intervals, original_priorities, utilization_limits,
+	availability, day_gaps, event_configs, config_min, config_max, config_downgrade, target_max, abs_min_role,
+	num_events, assigned, line, seats, valid, leaders, followers, attendee_order, alt_leaders, alt_followers,
+):
+	"""
+	Evaluate the events at the table indices in order for one target_max (0 for none).
+
+	Fills num_events, line (final line order), seats (per order position and peep:
+	0 absent, 1 leader, 2 follower) and valid (per order position), and returns
+	(num_unique_attendees, priority_fulfilled, normalized_utilization).
+
+	Written in the subset of Python that Numba compiles: integer arrays and loops only.
+	"""
+	num_peeps = len(roles)
+	num_table_events = len(event_configs)
+	depth = len(order)
+	for p in range(num_peeps):
+		num_events[p] = 0
+		line[p] = p
+	for i in range(depth * num_peeps):
+		seats[i] = 0
+
+	for k in range(depth):
+		e = order[k]
+		config = event_configs[e]
+		min_role = config_min[config]
+		effective_max = config_max[config]
+		if target_max > 0 and target_max < effective_max:
+			effective_max = target_max
+		num_leaders = 0
+		num_followers = 0
+		num_attendees = 0
+		num_alt_leaders = 0
+		num_alt_followers = 0
+		valid[k] = 0
+
+		# Single pass in line order (Scheduler.assign_event_greedy)
+		for j in range(num_peeps):
+			p = line[j]
+			if availability[p * num_table_events + e] == 0 or num_events[p] >= event_limits[p]:
+				continue
+			on_cooldown = False
+			for a in range(num_events[p]):
+				if day_gaps[e * num_table_events + assigned[p * depth + a]] < min_intervals[p]:
+					on_cooldown = True
+					break
+			if on_cooldown:
+				continue
+
+			role = roles[p]
+			primary_count = num_leaders if role == LEADER else num_followers
+			secondary_count = num_followers if role == LEADER else num_leaders
+			if primary_count < effective_max:
+				seat = role
+			elif switch_prefs[p] == SWITCH_IF_PRIMARY_FULL and secondary_count < effective_max:
+				seat = 1 - role
+			else:
+				seat = -1
+			if seat == LEADER:
+				leaders[num_leaders] = p
+				num_leaders += 1
+				attendee_order[num_attendees] = p
+				num_attendees += 1
+			elif seat == FOLLOWER:
+				followers[num_followers] = p
+				num_followers += 1
+				attendee_order[num_attendees] = p
+				num_attendees += 1
+			elif role == LEADER:
+				alt_leaders[num_alt_leaders] = p
+				num_alt_leaders += 1
+			else:
+				alt_followers[num_alt_followers] = p
+				num_alt_followers += 1
+
+		# SWITCH_IF_NEEDED alternates of the opposite role fill an underfilled role
+		if num_leaders < min_role:
+			for i in range(num_alt_followers):
+				p = alt_followers[i]
+				if switch_prefs[p] != SWITCH_IF_NEEDED:
+					continue
+				if num_leaders >= min_role or num_leaders >= effective_max:
+					break
+				leaders[num_leaders] = p
+				num_leaders += 1
+				attendee_order[num_attendees] = p
+				num_attendees += 1
+		if num_followers < min_role:
+			for i in range(num_alt_leaders):
+				p = alt_leaders[i]
+				if switch_prefs[p] != SWITCH_IF_NEEDED:
+					continue
+				if num_followers >= min_role or num_followers >= effective_max:
+					break
+				followers[num_followers] = p
+				num_followers += 1
+				attendee_order[num_attendees] = p
+				num_attendees += 1
+
+		if num_leaders >= abs_min_role and num_followers >= abs_min_role:
+			# Balance roles by demoting the most recently seated peeps of the larger role
+			while num_leaders != num_followers:
+				if num_leaders > num_followers:
+					num_leaders -= 1
+					demoted = leaders[num_leaders]
+				else:
+					num_followers -= 1
+					demoted = followers[num_followers]
+				kept = 0
+				for i in range(num_attendees):
+					if attendee_order[i] != demoted:
+						attendee_order[kept] = attendee_order[i]
+						kept += 1
+				num_attendees = kept
+
+			# Downgrade to the shortest duration whose role range fits the balanced count
+			if num_leaders < min_role:
+				for c in range(len(config_min)):
+					if config_downgrade[c] != 0 and config_min[c] <= num_leaders <= config_max[c]:
+						min_role = config_min[c]
+						break
+
+		if num_leaders < min_role or num_followers < min_role:
+			continue
+
+		valid[k] = 1
+		for i in range(num_leaders):
+			seats[k * num_peeps + leaders[i]] = 1
+		for i in range(num_followers):
+			seats[k * num_peeps + followers[i]] = 2
+		for i in range(num_attendees):
+			p = attendee_order[i]
+			assigned[p * depth + num_events[p]] = e
+			num_events[p] += 1
+
+		# Attendees move to the back of the line in the order they were seated
+		kept = 0
+		for j in range(num_peeps):
+			p = line[j]
+			if seats[k * num_peeps + p] == 0:
+				line[kept] = p
+				kept += 1
+		for i in range(num_attendees):
+			line[kept + i] = attendee_order[i]
+
+	# Metrics, summed in final line order like EventSequence.finalize
+	num_unique = 0
+	priority_fulfilled = 0
+	utilization_sum = 0.0
+	eligible_count = 0
+	for j in range(num_peeps):
+		p = line[j]
+		if num_events[p] > 0:
+			num_unique += 1
+			priority_fulfilled += original_priorities[p]
+		if utilization_limits[p] > 0:
+			eligible_count += 1
+			utilization_sum += num_events[p] / utilization_limits[p]
+	normalized_utilization = 0.0
+	if eligible_count > 0:
+		normalized_utilization = (utilization_sum / eligible_count) * 100
+	return num_unique, priority_fulfilled, normalized_utilization
+
+class KernelResult:
+	"""Metrics of one order scored by the kernel, with the attributes Scheduler.rank_key reads."""
+
+	def __init__(self, perm, valid_event_ids, attendee_seats, num_unique_attendees, priority_fulfilled, normalized_utilization):
+		self.perm = perm
+		self.valid_events = valid_event_ids  # ids of the valid events, in evaluation order
+		self.attendee_seats = attendee_seats  # per valid event: (leader ids, follower ids), or None if not read back
+		self.num_unique_attendees = num_unique_attendees
+		self.priority_fulfilled = priority_fulfilled
+		self.normalized_utilization = normalized_utilization
+		self.mutual_unique_fulfilled = 0
+		self.mutual_repeat_fulfilled = 0
+		self.one_sided_fulfilled = 0
+
+	def __key__(self):
+		"""Same key as EventSequence.__key__ for the full sequence of this order."""
+		return tuple(
+			(event_id, tuple(sorted(leader_ids)), tuple(sorted(follower_ids)))
+			for event_id, (leader_ids, follower_ids) in sorted(zip(self.valid_events, self.attendee_seats, strict=True))
+		)
+
+def problem_columns(peeps, events):
+	"""
+	Static peep and event data as flat integer columns.
+
+	Returns:
+		dict: {column name: list of ints}, in evaluate_order argument order
+	"""
+	event_index = {event.id: e for e, event in enumerate(events)}
+	availability = [0] * (len(peeps) * len(events))
+	for i, peep in enumerate(peeps):
+		for event_id in peep.availability:
+			if event_id in event_index:
+				availability[i * len(events) + event_index[event_id]] = 1
+	return {
+		"roles": [LEADER if peep.role == Role.LEADER else FOLLOWER for peep in peeps],
+		"switch_prefs": [peep.switch_pref.value for peep in peeps],
+		"event_limits": [peep.event_limit for peep in peeps],
+		"min_intervals": [peep.min_interval_days for peep in peeps],
+		"original_priorities": [peep.original_priority for peep in peeps],
+		"utilization_limits": [
+			min(peep.event_limit, len(set(peep.availability)))
+			if peep.responded and peep.availability and peep.event_limit > 0 else 0
+			for peep in peeps
+		],
+		"availability": availability,  # row-major peeps x events 0/1 matrix
+		"day_gaps": [abs((a.date.date() - b.date.date()).days) for a in events for b in events],
+		"event_configs": [DURATIONS.index(event.duration_minutes) for event in events],
+		"config_min": [constants.CLASS_CONFIG[d]["min_role"] for d in DURATIONS],
+		"config_max": [constants.CLASS_CONFIG[d]["max_role"] for d in DURATIONS],
+		"config_downgrade": [int(constants.CLASS_CONFIG[d]["allow_downgrade"]) for d in DURATIONS],
+	}
+
+def make_result(perm, valid, seats, peep_ids, metrics, partnerships=None, seating=True):
+	"""
+	Build the KernelResult for one evaluated order.
+
+	valid holds a flag per order position and seats the flattened position x peep seat codes.
+	Attendee ids are only read back with seating or when partnership metrics need them.
+	"""
+	num_peeps = len(peep_ids)
+	valid_positions = [k for k in range(len(perm)) if valid[k]]
+	attendee_seats = None
+	if seating or partnerships is not None:
+		attendee_seats = []
+		for k in valid_positions:
+			row = seats[k * num_peeps:(k + 1) * num_peeps]
+			attendee_seats.append((
+				[peep_ids[p] for p in range(num_peeps) if row[p] == 1],
+				[peep_ids[p] for p in range(num_peeps) if row[p] == 2],
+			))
+
+	num_unique, priority_fulfilled, normalized_utilization = metrics
+	result = KernelResult(
+		tuple(perm), [perm[k] for k in valid_positions], attendee_seats,
+		int(num_unique), int(priority_fulfilled), float(normalized_utilization),
+	)
+	if partnerships is not None:
+		mutual_pairs, one_sided_requests = partnerships
+		attendee_id_sets = [set(leader_ids) | set(follower_ids) for leader_ids, follower_ids in attendee_seats]
+		(
+			result.mutual_unique_fulfilled,
+			result.mutual_repeat_fulfilled,
+			result.one_sided_fulfilled,
+		) = EventSequence.count_partnerships(attendee_id_sets, mutual_pairs, one_sided_requests)
+	return result
+
+class EvaluationKernel:
+	"""Static peep and event data packed for evaluate_order, plus reusable work buffers."""
+
+	def __init__(self, peeps, events, partnership_requests=None, jit=None):
+		self.jit = jit_available() if jit is None else jit
+		if self.jit and not jit_available():
+			raise ValueError("the compiled evaluation kernel requires numba")
+
+		self.peep_ids = [peep.id for peep in peeps]
+		self.position = {event.id: e for e, event in enumerate(events)}
+		self.columns = tuple(self._pack(values) for values in problem_columns(peeps, events).values())
+		self.buffers = None
+
+		self.partnerships = None
+		if partnership_requests:
+			self.partnerships = EventSequence.split_partnership_requests(partnership_requests)
+
+	def _pack(self, values):
+		"""Plain lists index fastest in Python; the compiled kernel needs numpy arrays."""
+		return numpy.array(values, dtype=numpy.int64) if self.jit else list(values)
+
+	def _buffers(self, depth):
+		"""Work buffers for orders of the given length, allocated once and reused."""
+		if self.buffers is None or self.buffers[0] != depth:
+			num_peeps = len(self.peep_ids)
+			# num_events, assigned, line, seats, valid, leaders, followers, attendee_order, alt_leaders, alt_followers
+			sizes = (num_peeps, num_peeps * depth, num_peeps, num_peeps * depth, depth) + (num_peeps,) * 5
+			self.buffers = (depth, tuple(self._pack([0] * size) for size in sizes))
+		return self.buffers[1]
+
+	def score(self, perm, target_max=None, seating=True):
+		"""
+		Evaluate one order of event ids for target_max.
+
+		With seating=False the attendee ids are only read back when partnership metrics need
+		them, and the result has no __key__; searches use this for speed.
+
+		Returns:
+			KernelResult: metrics and seating equal to those of Scheduler.evaluate_sequence
+		"""
+		buffers = self._buffers(len(perm))
+		order = self._pack([self.position[event_id] for event_id in perm])
+		kernel = _compiled_kernel() if self.jit else evaluate_order
+		metrics = kernel(order, *self.columns, target_max or 0, constants.ABS_MIN_ROLE, *buffers)
+		return make_result(perm, buffers[4], buffers[3], self.peep_ids, metrics, self.partnerships, seating)
+
+_compiled = None
+
+def _compiled_kernel():
+	"""evaluate_order compiled by Numba on first use."""
+	global _compiled
+	if _compiled is None:
+		_compiled = numba.njit(cache=True)(evaluate_order)
+	return _compiled
@@ -0,0 +1,164 @@
+"""
+Batched evaluation of many event orders at once, one order per lane.
+
+A batch of B permutations is evaluated in lockstep as lanes of 2-D state arrays
+(lanes x peeps: events attended, line order, seats), so each step of the greedy
+fill applies NumPy operations to every lane together instead of running the
+interpreter once per permutation. Consecutive permutations share long prefixes,
+so lanes in a batch tend to do similar work.
+
+The result for each lane is exactly what Scheduler.evaluate_sequence computes with
+greedy assignment, the same as the array kernel (see kernel.evaluate_order). NumPy is
+optional; without it the batched engine falls back to the exhaustive engine.
+"""
+
+from peeps_scheduler import constants, kernel
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+def numpy_available():
+	"""Whether NumPy is installed, which the batched engine needs."""
+	return numpy is not None
+
+class LaneProblem:
+	"""Static peep and event columns as NumPy arrays for evaluate_batch."""
+
+	def __init__(self, peeps, events):
+		columns = kernel.problem_columns(peeps, events)
+		self.peep_ids = [peep.id for peep in peeps]
+		self.position = {event.id: e for e, event in enumerate(events)}
+		self.num_peeps, self.num_events = len(peeps), len(events)
+		for name, values in columns.items():
+			setattr(self, name, numpy.array(values, dtype=numpy.int64))
+		self.availability = self.availability.reshape(self.num_peeps, self.num_events).T.astype(bool)  # events x peeps
+		self.day_gaps = self.day_gaps.reshape(self.num_events, self.num_events)
+
+		# min_role of the shortest downgradable duration whose role range holds a balanced count
+		unreachable = self.num_peeps + 1
+		self.downgrade_min = numpy.full(self.num_peeps + 1, unreachable, dtype=numpy.int64)
+		for count in range(self.num_peeps + 1):
+			for c in range(len(self.config_min)):
+				if self.config_downgrade[c] and self.config_min[c] <= count <= self.config_max[c]:
+					self.downgrade_min[count] = self.config_min[c]
+					break
+
+	def orders(self, perms):
+		"""Table indices of the events of each permutation, as a lanes x depth array."""
+		return numpy.array([[self.position[event_id] for event_id in perm] for perm in perms], dtype=numpy.int64)
+
+def evaluate_batch(problem, orders, target_max=None, abs_min_role=constants.ABS_MIN_ROLE):
+	"""
+	Evaluate every lane's order of table event indices for one target_max.
+
+	Returns:
+		tuple: (num_unique per lane, priority_fulfilled per lane, normalized_utilization per lane,
+		valid lanes x depth flags, seats lanes x depth x peeps codes: 0 absent, 1 leader, 2 follower)
+	"""
+	num_lanes, depth = orders.shape
+	num_peeps = problem.num_peeps
+	lanes = numpy.arange(num_lanes)
+	rows = lanes[:, None]
+	line_positions = numpy.broadcast_to(numpy.arange(num_peeps), (num_lanes, num_peeps))
+
+	num_events = numpy.zeros((num_lanes, num_peeps), dtype=numpy.int64)
+	line = numpy.tile(numpy.arange(num_peeps), (num_lanes, 1))
+	valid = numpy.zeros((num_lanes, depth), dtype=bool)
+	seats = numpy.zeros((num_lanes, depth, num_peeps), dtype=numpy.int8)
+
+	for k in range(depth):
+		events = orders[:, k]
+		configs = problem.event_configs[events]
+		min_role = problem.config_min[configs]
+		effective_max = problem.config_max[configs]
+		if target_max:
+			effective_max = numpy.minimum(effective_max, target_max)
+
+		# Available, under the event limit, and not within anyone's minimum interval of an attended event
+		eligible = problem.availability[events] & (num_events < problem.event_limits)
+		if k:
+			too_close = problem.day_gaps[events[:, None], orders[:, :k]][:, :, None] < problem.min_intervals
+			eligible &= ~((seats[:, :k] > 0) & too_close).any(axis=1)
+
+		# Single pass in each lane's line order (Scheduler.assign_event_greedy)
+		seat = numpy.zeros((num_lanes, num_peeps), dtype=numpy.int8)
+		seat_rank = numpy.zeros((num_lanes, num_peeps), dtype=numpy.int64)  # position in attendee order
+		role_rank = numpy.zeros((num_lanes, num_peeps), dtype=numpy.int64)  # position within the seated role
+		alternate = numpy.zeros((num_lanes, num_peeps), dtype=bool)
+		num_leaders = numpy.zeros(num_lanes, dtype=numpy.int64)
+		num_followers = numpy.zeros(num_lanes, dtype=numpy.int64)
+		num_attendees = numpy.zeros(num_lanes, dtype=numpy.int64)
+		for j in range(num_peeps):
+			p = line[:, j]
+			can = eligible[lanes, p]
+			role = problem.roles[p]
+			is_leader = role == kernel.LEADER
+			primary = can & (numpy.where(is_leader, num_leaders, num_followers) < effective_max)
+			secondary = (
+				can & ~primary & (problem.switch_prefs[p] == kernel.SWITCH_IF_PRIMARY_FULL)
+				& (numpy.where(is_leader, num_followers, num_leaders) < effective_max)
+			)
+			seated = primary | secondary
+			as_leader = seated & (numpy.where(primary, role, 1 - role) == kernel.LEADER)
+			as_follower = seated & ~as_leader
+			seat[lanes, p] = numpy.where(as_leader, 1, numpy.where(as_follower, 2, 0))
+			seat_rank[lanes, p] = num_attendees
+			role_rank[lanes, p] = numpy.where(as_leader, num_leaders, num_followers)
+			alternate[lanes, p] = can & ~seated
+			num_attendees += seated
+			num_leaders += as_leader
+			num_followers += as_follower
+
+		# SWITCH_IF_NEEDED alternates of the opposite role fill an underfilled role, in line order
+		switch_if_needed = problem.switch_prefs == kernel.SWITCH_IF_NEEDED
+		for role, code, count in ((kernel.LEADER, 1, num_leaders), (kernel.FOLLOWER, 2, num_followers)):
+			candidates = (alternate & (problem.roles != role) & switch_if_needed)[rows, line]
+			order_in_line = numpy.cumsum(candidates, axis=1)
+			needed = numpy.where(count < min_role, numpy.minimum(min_role, effective_max) - count, 0)
+			promoted_in_line = candidates & (order_in_line <= needed[:, None])
+			promoted = numpy.zeros_like(candidates)
+			promoted[rows, line] = promoted_in_line
+			in_peep_order = numpy.zeros_like(order_in_line)
+			in_peep_order[rows, line] = order_in_line
+			seat[promoted] = code
+			seat_rank = numpy.where(promoted, num_attendees[:, None] + in_peep_order - 1, seat_rank)
+			role_rank = numpy.where(promoted, count[:, None] + in_peep_order - 1, role_rank)
+			num_promoted = promoted.sum(axis=1)
+			num_attendees += num_promoted
+			count += num_promoted
+
+		# Balance roles by demoting the most recently seated peeps of the larger role, then downgrade
+		balancing = (num_leaders >= abs_min_role) & (num_followers >= abs_min_role)
+		balanced_count = numpy.minimum(num_leaders, num_followers)
+		demoted = balancing[:, None] & (seat > 0) & (role_rank >= balanced_count[:, None])
+		seat[demoted] = 0
+		num_leaders = numpy.where(balancing, balanced_count, num_leaders)
+		num_followers = numpy.where(balancing, balanced_count, num_followers)
+		downgrading = balancing & (num_leaders < min_role)
+		min_role = numpy.where(downgrading, problem.downgrade_min[num_leaders], min_role)
+
+		valid[:, k] = (num_leaders >= min_role) & (num_followers >= min_role)
+		seat[~valid[:, k]] = 0
+		seats[:, k] = seat
+		attending = seat > 0
+		num_events += attending
+
+		# Attendees move to the back of the line in the order they were seated
+		position = numpy.empty_like(line)
+		position[rows, line] = line_positions
+		line = numpy.argsort(numpy.where(attending, num_peeps + seat_rank, position), axis=1, kind="stable")
+
+	# Metrics, summed lane by lane in final line order like EventSequence.finalize
+	attended = num_events > 0
+	num_unique = attended.sum(axis=1)
+	priority_fulfilled = (attended * problem.original_priorities).sum(axis=1)
+	eligible_peeps = problem.utilization_limits > 0
+	shares = numpy.where(eligible_peeps, num_events / numpy.maximum(problem.utilization_limits, 1), 0.0)
+	utilization_sum = numpy.zeros(num_lanes)
+	for j in range(num_peeps):
+		utilization_sum = utilization_sum + shares[lanes, line[:, j]]
+	eligible_count = int(eligible_peeps.sum())
+	normalized_utilization = (utilization_sum / eligible_count) * 100 if eligible_count else numpy.zeros(num_lanes)
+	return num_unique, priority_fulfilled, normalized_utilization, valid, seats
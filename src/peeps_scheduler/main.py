@@ -1,6 +1,7 @@
 import os
 import argparse
 import logging
+from peeps_scheduler import constants
 from peeps_scheduler import utils
 from peeps_scheduler.scheduler import Scheduler
 from peeps_scheduler.data_manager import get_data_manager
@@ -52,10 +53,33 @@ def main():
 	run_parser = subparsers.add_parser('run', help='Run the scheduler')
 	run_parser.add_argument('--generate-tests', action='store_true', help='Generate test data')
 	run_parser.add_argument('--load-from-csv', action='store_true', help='Load data from CSV')
+	run_parser.add_argument('--incremental', action='store_true', help='With --load-from-csv, apply only responses.csv rows appended or edited since the last conversion')
 	run_parser.add_argument('--data-folder', type=str, default=default_data_folder, required=(default_data_folder is None), help='Path to data folder')
 	run_parser.add_argument('--max-events', type=int, default=7, help='Maximum number of events to schedule')
 	run_parser.add_argument('--cancellations-file', type=str, default='cancellations.json', help='Filename of cancellations JSON (default: cancellations.json)')
 	run_parser.add_argument('--partnerships-file', type=str, default='partnerships.json', help='Filename of partnerships JSON (default: partnerships.json)')
+	run_parser.add_argument('--time-limit', type=float, default=None, help='Stop the search after this many seconds, exploring the most promising event orders first')
+	run_parser.add_argument('--engine', choices=('auto',) + constants.SEARCH_ENGINES, default='auto', help='Search engine to use (default: auto, chosen from a cost estimate and --budget)')
+	run_parser.add_argument('--budget', type=float, default=constants.DEFAULT_SEARCH_BUDGET_SECONDS, help=f'Seconds the auto engine selection aims to finish within (default: {constants.DEFAULT_SEARCH_BUDGET_SECONDS})')
+	run_parser.add_argument('--workers', type=int, default=None, help='Workers for the parallel engines: processes, or threads on free-threaded Python builds (default: all CPUs)')
+	run_parser.add_argument('--assignment', choices=constants.ASSIGNMENT_STRATEGIES, default='greedy', help='Per-event role assignment: greedy single pass or min-cost flow (default: greedy)')
+	run_parser.add_argument('--preselect', choices=constants.PRESELECTION_STRATEGIES, default='overlap', help='How to trim to --max-events: remove high-overlap events or keep the events with the best weighted coverage (default: overlap)')
+	run_parser.add_argument('--dominance', choices=constants.DOMINANCE_MODES, default='off', help='Events whose attendees can all attend another interchangeable event: search them only after it (order) or drop those that can never run alongside it (default: off)')
+	run_parser.add_argument('--kernel', choices=constants.EVALUATION_KERNELS, default='object', help='Exhaustive search scoring: object model or the array kernel, compiled when numba is installed (default: object)')
+	run_parser.add_argument('--store-cap', type=int, default=constants.SEQUENCE_STORE_CAP, help=f'Found sequences kept in memory before spilling sorted runs to disk (default: {constants.SEQUENCE_STORE_CAP})')
+	run_parser.add_argument('--compact-json', action='store_true', help='Write output.json and results.json without indentation, with orjson when installed')
+	run_parser.add_argument('--output-version', type=int, choices=constants.OUTPUT_JSON_VERSIONS, default=1, help='output.json schema: 1, or 2 with availability as bit strings and responses in responses.json (default: 1)')
+	run_parser.add_argument('--resume', action='store_true', help='Resume an interrupted search from its checkpoint in the period folder')
+	run_parser.add_argument('--checkpoint-interval', type=float, default=constants.CHECKPOINT_INTERVAL_SECONDS, help=f'Seconds between search checkpoints (default: {constants.CHECKPOINT_INTERVAL_SECONDS})')
+	run_parser.add_argument('--no-checkpoint', dest='checkpoint_interval', action='store_const', const=None, help='Do not write search checkpoints (a search can then not be resumed)')
+	run_parser.add_argument('--listen', type=str, default=None, help='Serve the distributed engine to workers at this address (host:port or a Unix socket path)')
+	run_parser.add_argument('--local-workers', type=int, default=0, help='Worker processes the distributed engine starts on this machine')
+	run_parser.add_argument('--worker-token', type=str, default=os.getenv(constants.WORKER_TOKEN_ENV), help=f'Shared secret workers must present (default: ${constants.WORKER_TOKEN_ENV}, or a generated token that is logged)')
+
+	# Search worker command
+	worker_parser = subparsers.add_parser('worker', help='Evaluate search shards for a distributed run')
+	worker_parser.add_argument('--connect', required=True, help='Coordinator address (host:port or a Unix socket path)')
+	worker_parser.add_argument('--token', type=str, default=os.getenv(constants.WORKER_TOKEN_ENV), required=os.getenv(constants.WORKER_TOKEN_ENV) is None, help=f'Shared secret of the coordinator (default: ${constants.WORKER_TOKEN_ENV})')
 
 	# Apply results command
 	apply_parser = subparsers.add_parser('apply-results', help='Apply actual attendance to update members CSV')
@@ -72,8 +96,11 @@ def main():
 
 	# Routing logic
 	if args.command == 'run':
-		scheduler = Scheduler(data_folder=args.data_folder, max_events=args.max_events, cancellations_file=args.cancellations_file, partnerships_file=args.partnerships_file)
-		scheduler.run(generate_test_data=args.generate_tests, load_from_csv=args.load_from_csv)
+		scheduler = Scheduler(data_folder=args.data_folder, max_events=args.max_events, cancellations_file=args.cancellations_file, partnerships_file=args.partnerships_file, time_limit=args.time_limit, engine=args.engine, budget=args.budget, workers=args.workers, assignment=args.assignment, resume=args.resume, checkpoint_interval=args.checkpoint_interval, listen=args.listen, local_workers=args.local_workers, worker_token=args.worker_token, preselection=args.preselect, dominance=args.dominance, kernel=args.kernel, store_cap=args.store_cap, compact_json=args.compact_json, output_version=args.output_version)
+		scheduler.run(generate_test_data=args.generate_tests, load_from_csv=args.load_from_csv, incremental=args.incremental)
+	elif args.command == 'worker':
+		from peeps_scheduler.distributed import run_worker
+		run_worker(args.connect, args.token)
 	elif args.command == 'apply-results':
 		apply_results(args.period_folder, args.results_file)
 	elif args.command == 'availability-report':
@@ -718,6 +718,23 @@ class EventSequence:
 		if not partnership_requests:
 			return
 
+		mutual_pairs, one_sided_requests = EventSequence.split_partnership_requests(partnership_requests)
+		attendee_id_sets = [{peep.id for peep in event.attendees} for event in self.valid_events]
+		(
+			self.mutual_unique_fulfilled,
+			self.mutual_repeat_fulfilled,
+			self.one_sided_fulfilled,
+		) = EventSequence.count_partnerships(attendee_id_sets, mutual_pairs, one_sided_requests)
+		self.partnerships_fulfilled = self.mutual_unique_fulfilled + self.one_sided_fulfilled
+
+	@staticmethod
+	def split_partnership_requests(partnership_requests):
+		"""
+		Split partnership requests into mutual pairs and one-sided requests.
+
+		Returns:
+			tuple: (set of sorted mutual id pairs, set of (requester_id, partner_id) one-sided requests)
+		"""
 		mutual_pairs = set()
 		one_sided_requests = set()
 
@@ -728,12 +745,20 @@ class EventSequence:
 					mutual_pairs.add(pair)
 				else:
 					one_sided_requests.add((requester_id, partner_id))
+		return mutual_pairs, one_sided_requests
 
+	@staticmethod
+	def count_partnerships(attendee_id_sets, mutual_pairs, one_sided_requests):
+		"""
+		Count fulfilled partnerships over the attendee id sets of the valid events.
+
+		Returns:
+			tuple: (mutual_unique_fulfilled, mutual_repeat_fulfilled, one_sided_fulfilled)
+		"""
 		mutual_occurrences = {}
 		one_sided_satisfied = set()
 
-		for event in self.valid_events:
-			attendee_ids = {peep.id for peep in event.attendees}
+		for attendee_ids in attendee_id_sets:
 			if not attendee_ids:
 				continue
 
@@ -748,12 +773,8 @@ class EventSequence:
 					if requester_id in attendee_ids and partner_id in attendee_ids:
 						one_sided_satisfied.add((requester_id, partner_id))
 
-		self.mutual_unique_fulfilled = len(mutual_occurrences)
-		self.mutual_repeat_fulfilled = sum(
-			count - 1 for count in mutual_occurrences.values() if count > 1
-		)
-		self.one_sided_fulfilled = len(one_sided_satisfied)
-		self.partnerships_fulfilled = self.mutual_unique_fulfilled + self.one_sided_fulfilled
+		mutual_repeat = sum(count - 1 for count in mutual_occurrences.values() if count > 1)
+		return len(mutual_occurrences), mutual_repeat, len(one_sided_satisfied)
 
 	@staticmethod
 	def get_unique_sequences(sequences):
@@ -0,0 +1,182 @@
+"""
+Coverage-based event pre-selection.
+
+When there are more candidate events than max_events, the events kept for the search
+are chosen as a weighted coverage problem: pick the events that together let the most
+peeps attend, weighted by priority, within each peep's event_limit. An event's value is
+the best balanced fill it could seat from peeps who still have capacity, so events whose
+roles cannot balance count for little.
+
+Marginal gains only shrink as events are added (peeps use up their capacity), so the
+greedy choice is evaluated lazily: gains sit in a priority queue as upper bounds and only
+the top entry is re-evaluated.
+"""
+
+import heapq
+import logging
+
+from peeps_scheduler import constants
+from peeps_scheduler.models import Role, SwitchPreference
+
+
+def balanced_fill(leaders, followers, leaders_can_follow=0, followers_can_lead=0, max_role=None):
+	"""
+	Largest per-role fill reachable from primary role counts plus peeps willing to switch.
+
+	Args:
+		leaders: peeps available in their primary LEADER role
+		followers: peeps available in their primary FOLLOWER role
+		leaders_can_follow: of the leaders, how many may dance FOLLOWER
+		followers_can_lead: of the followers, how many may dance LEADER
+		max_role: cap on the fill per role
+
+	Returns:
+		int: number of peeps that can be seated in each role
+	"""
+	fill = min((leaders + followers) // 2, leaders + followers_can_lead, followers + leaders_can_follow)
+	return fill if max_role is None else min(fill, max_role)
+
+class EventRoleCounts:
+	"""Per-event counts of available peeps by primary role and by willingness to switch."""
+
+	def __init__(self):
+		self.leaders = 0
+		self.followers = 0
+		self.leaders_can_follow = 0  # SWITCH_IF_NEEDED leaders
+		self.followers_can_lead = 0  # SWITCH_IF_NEEDED followers
+		self.leaders_follow_if_full = 0  # SWITCH_IF_PRIMARY_FULL leaders
+		self.followers_lead_if_full = 0  # SWITCH_IF_PRIMARY_FULL followers
+
+	def best_fill(self, max_role=None):
+		"""
+		Largest per-role fill these peeps could reach, switching where preferences allow.
+
+		SWITCH_IF_PRIMARY_FULL peeps only switch once their primary role is full, which takes at
+		least ABS_MIN_ROLE peeps of that role, so only the ones beyond that count as switchers.
+		"""
+		leaders_can_follow = self.leaders_can_follow + min(self.leaders_follow_if_full, max(0, self.leaders - constants.ABS_MIN_ROLE))
+		followers_can_lead = self.followers_can_lead + min(self.followers_lead_if_full, max(0, self.followers - constants.ABS_MIN_ROLE))
+		return balanced_fill(self.leaders, self.followers, leaders_can_follow, followers_can_lead, max_role)
+
+def build_role_count_index(events, peeps):
+	"""
+	Count available peeps per event in one pass over peeps.
+
+	Peeps with no event capacity are skipped. SWITCH_IF_NEEDED and SWITCH_IF_PRIMARY_FULL
+	peeps are counted apart, since the latter only switch when their primary role is full.
+
+	Returns:
+		dict: {event.id: EventRoleCounts}
+	"""
+	index = {event.id: EventRoleCounts() for event in events}
+	for peep in peeps:
+		if peep.event_limit < 1:
+			continue
+		if_needed = peep.switch_pref == SwitchPreference.SWITCH_IF_NEEDED
+		if_full = peep.switch_pref == SwitchPreference.SWITCH_IF_PRIMARY_FULL
+		for event_id in set(peep.availability):
+			counts = index.get(event_id)
+			if counts is None:
+				continue
+			if peep.role == Role.LEADER:
+				counts.leaders += 1
+				counts.leaders_can_follow += if_needed
+				counts.leaders_follow_if_full += if_full
+			else:
+				counts.followers += 1
+				counts.followers_can_lead += if_needed
+				counts.followers_lead_if_full += if_full
+	return index
+
+def coverage_weights(peeps):
+	"""
+	Weight of seating each peep for the first time and again.
+
+	A first seat outweighs any difference in priority, so coverage counts unique attendees
+	first and priority second; repeat seats only count toward filling the event.
+
+	Returns:
+		dict: {peep.id: (first seat weight, repeat seat weight)}
+	"""
+	scale = sum(peep.priority for peep in peeps) + 1
+	return {peep.id: (scale * (len(peeps) + 1) + peep.priority, 1) for peep in peeps}
+
+def best_seating(event, candidates, seats_used, weights):
+	"""
+	Peeps the event would seat given how many seats each peep has already used.
+
+	The event seats its best balanced fill: the highest-weighted peeps with capacity in each
+	primary role, with any shortfall in one role covered by the best remaining peeps of the
+	other role who are willing to switch.
+
+	Returns:
+		list: (peep, weight) pairs, empty if the event cannot reach the absolute minimum
+	"""
+	def seat_weight(peep):
+		first, repeat = weights[peep.id]
+		return first if seats_used[peep.id] == 0 else repeat
+
+	by_role = {Role.LEADER: [], Role.FOLLOWER: []}
+	for peep in candidates:
+		if seats_used[peep.id] < peep.event_limit:
+			by_role[peep.role].append(peep)
+	switchable = {role: sum(1 for peep in role_peeps if peep.switch_pref != SwitchPreference.PRIMARY_ONLY) for role, role_peeps in by_role.items()}
+
+	fill = balanced_fill(
+		len(by_role[Role.LEADER]), len(by_role[Role.FOLLOWER]),
+		switchable[Role.LEADER], switchable[Role.FOLLOWER], event.max_role,
+	)
+	if fill < constants.ABS_MIN_ROLE:
+		return []
+
+	seated = []
+	for role in (Role.LEADER, Role.FOLLOWER):
+		ranked = sorted(by_role[role], key=seat_weight, reverse=True)
+		shortfall = max(0, fill - len(by_role[role.opposite()]))
+		seated.extend(ranked[:fill])
+		switchers = [peep for peep in ranked[fill:] if peep.switch_pref != SwitchPreference.PRIMARY_ONLY]
+		seated.extend(switchers[:shortfall])
+	return [(peep, seat_weight(peep)) for peep in seated]
+
+def event_gain(event, candidates, seats_used, weights):
+	"""Coverage value of adding event given the seats already used."""
+	return sum(weight for _, weight in best_seating(event, candidates, seats_used, weights))
+
+def select_events_by_coverage(events, peeps, max_events):
+	"""
+	Keep the max_events events that maximize weighted peep coverage, chosen by lazy greedy.
+
+	Returns:
+		list: the kept events, in their original order
+	"""
+	if len(events) <= max_events:
+		return events
+
+	weights = coverage_weights(peeps)
+	candidates = {event.id: [peep for peep in peeps if event.id in peep.availability] for event in events}
+	seats_used = {peep.id: 0 for peep in peeps}
+
+	# Max-heap of (-gain upper bound, position); ties go to the earlier event
+	heap = [(-event_gain(event, candidates[event.id], seats_used, weights), position) for position, event in enumerate(events)]
+	heapq.heapify(heap)
+	selected = []
+	evaluations = len(heap)
+
+	while heap and len(selected) < max_events:
+		_, position = heapq.heappop(heap)
+		event = events[position]
+		seating = best_seating(event, candidates[event.id], seats_used, weights)
+		gain = sum(weight for _, weight in seating)
+		evaluations += 1
+
+		# The refreshed gain still beats every other upper bound: take it
+		if not heap or (-gain, position) <= heap[0]:
+			selected.append(position)
+			for peep, _ in seating:
+				seats_used[peep.id] += 1
+			logging.debug(f"Coverage pre-selection kept Event {event.id} (gain {gain})")
+		else:
+			heapq.heappush(heap, (-gain, position))
+
+	logging.debug(f"Coverage pre-selection kept {len(selected)} of {len(events)} events after {evaluations} gain evaluations")
+	return [events[position] for position in sorted(selected)]
@@ -0,0 +1,219 @@
+"""
+Flat integer-array representation of the static search inputs.
+
+The peeps and events a search starts from never change during the search, so they are
+packed once into a single buffer of int64 arrays: peep codes (role, switch preference,
+event limit, minimum interval, priority, ...), the event date/duration table, the
+availability matrix, and a small JSON block for the text fields only needed in output.
+
+The buffer can be placed in multiprocessing.shared_memory so worker processes attach to
+it instead of each receiving a pickled copy of the roster. Workers build fresh Peep and
+Event objects straight from the arrays for each permutation, which also replaces the
+deepcopy of the roster that evaluation otherwise needs.
+"""
+
+import datetime
+import json
+from array import array
+from multiprocessing import shared_memory
+
+from peeps_scheduler.models import Event, Peep, Role, SwitchPreference
+
+FORMAT_VERSION = 1
+EPOCH = datetime.datetime(1970, 1, 1)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+ROLE_CODES = {Role.LEADER: 0, Role.FOLLOWER: 1}
+ROLES = {code: role for role, code in ROLE_CODES.items()}
+SWITCH_PREFERENCES = {pref.value: pref for pref in SwitchPreference}
+
+# Per-peep int64 columns, in buffer order
+PEEP_COLUMNS = ("id", "role", "switch_pref", "event_limit", "min_interval_days", "priority", "index", "total_attended")
+# Per-event int64 columns, in buffer order
+EVENT_COLUMNS = ("id", "date", "duration_minutes")
+HEADER_SIZE = 6  # version, num_peeps, num_events, num_availability_values, text bytes, total int64 slots
+
+class ProblemArrays:
+	"""Static peep and event data as flat int64 arrays, with a byte buffer layout."""
+
+	def __init__(self, peep_columns, event_columns, availability_offsets, availability_values, availability_matrix, text):
+		self.peep_columns = peep_columns  # {column: int64 sequence of length num_peeps}
+		self.event_columns = event_columns  # {column: int64 sequence of length num_events}
+		self.availability_offsets = availability_offsets  # peep i's availability is values[offsets[i]:offsets[i + 1]]
+		self.availability_values = availability_values  # event ids exactly as listed by each peep
+		self.availability_matrix = availability_matrix  # row-major num_peeps x num_events 0/1 matrix
+		self.text = text  # per peep: [full_name, display_name, email, active, date_joined, responded]
+		self.num_peeps = len(peep_columns["id"])
+		self.num_events = len(event_columns["id"])
+		self._views = []  # memoryviews into a shared buffer, released before it is closed
+
+	@classmethod
+	def from_models(cls, peeps, events):
+		"""Pack the static fields of peeps and events (their state before any assignment)."""
+		peep_columns = {column: array("q") for column in PEEP_COLUMNS}
+		offsets = array("q", [0])
+		values = array("q")
+		event_index = {event.id: e for e, event in enumerate(events)}
+		matrix = array("q", bytes(8 * len(peeps) * len(events)))
+		text = []
+
+		for i, peep in enumerate(peeps):
+			peep_columns["id"].append(peep.id)
+			peep_columns["role"].append(ROLE_CODES[peep.role])
+			peep_columns["switch_pref"].append(peep.switch_pref.value)
+			peep_columns["event_limit"].append(peep.event_limit)
+			peep_columns["min_interval_days"].append(peep.min_interval_days)
+			peep_columns["priority"].append(peep.priority)
+			peep_columns["index"].append(peep.index)
+			peep_columns["total_attended"].append(peep.total_attended)
+			values.extend(peep.availability)
+			offsets.append(len(values))
+			for event_id in peep.availability:
+				if event_id in event_index:
+					matrix[i * len(events) + event_index[event_id]] = 1
+			text.append([peep.full_name, peep.display_name, peep.email, peep.active, peep.date_joined, peep.responded])
+
+		event_columns = {
+			"id": array("q", [event.id for event in events]),
+			"date": array("q", [(event.date - EPOCH) // MICROSECOND for event in events]),
+			"duration_minutes": array("q", [event.duration_minutes for event in events]),
+		}
+		return cls(peep_columns, event_columns, offsets, values, matrix, text)
+
+	def available(self, peep_index, event_index):
+		"""Whether peep_index is available for the event at event_index."""
+		return bool(self.availability_matrix[peep_index * self.num_events + event_index])
+
+	def make_peeps(self):
+		"""
+		Fresh Peep objects with no assignments, in roster order.
+
+		The columns were taken from validated Peeps, so the attributes are filled in directly
+		rather than re-parsed by Peep.__init__ (which dominates reload time on large rosters).
+		"""
+		columns = {column: values.tolist() for column, values in self.peep_columns.items()}
+		offsets = self.availability_offsets.tolist()
+		availability = self.availability_values.tolist()
+		rows = zip(
+			columns["id"], columns["role"], columns["switch_pref"], columns["event_limit"],
+			columns["min_interval_days"], columns["priority"], columns["index"], columns["total_attended"],
+			self.text,
+		)
+		peeps = []
+		for i, (peep_id, role, switch_pref, event_limit, min_interval_days, priority, index, total_attended, text) in enumerate(rows):
+			full_name, display_name, email, active, date_joined, responded = text
+			peep = Peep.__new__(Peep)
+			peep.__dict__.update(
+				id=peep_id,
+				full_name=full_name,
+				display_name=display_name,
+				email=email,
+				role=ROLES[role],
+				switch_pref=SWITCH_PREFERENCES[switch_pref],
+				index=index,
+				priority=priority,
+				original_priority=priority,
+				total_attended=total_attended,
+				availability=availability[offsets[i]:offsets[i + 1]],
+				event_limit=event_limit,
+				num_events=0,
+				min_interval_days=min_interval_days,
+				assigned_event_dates=[],
+				active=active,
+				date_joined=date_joined,
+				responded=responded,
+			)
+			peeps.append(peep)
+		return peeps
+
+	def make_events(self, event_ids=None):
+		"""Fresh Event objects, in the given id order (default: table order)."""
+		columns = self.event_columns
+		position = {event_id: e for e, event_id in enumerate(columns["id"])}
+		order = range(self.num_events) if event_ids is None else [position[event_id] for event_id in event_ids]
+		return [
+			Event(
+				id=columns["id"][e],
+				date=EPOCH + columns["date"][e] * MICROSECOND,
+				duration_minutes=columns["duration_minutes"][e],
+			)
+			for e in order
+		]
+
+	def to_bytes(self):
+		"""Serialize to one buffer: int64 header, columns, availability, then UTF-8 JSON text."""
+		text = json.dumps(self.text).encode("utf-8")
+		body = array("q")
+		for column in PEEP_COLUMNS:
+			body.extend(self.peep_columns[column])
+		for column in EVENT_COLUMNS:
+			body.extend(self.event_columns[column])
+		body.extend(self.availability_offsets)
+		body.extend(self.availability_values)
+		body.extend(self.availability_matrix)
+		header = array("q", [FORMAT_VERSION, self.num_peeps, self.num_events, len(self.availability_values), len(text), len(body)])
+		return header.tobytes() + body.tobytes() + text
+
+	@classmethod
+	def from_buffer(cls, buffer):
+		"""
+		Read arrays from a buffer written by to_bytes.
+
+		Integer arrays are memoryview slices of the buffer, so nothing is copied; only the
+		text block is decoded. The buffer must stay open while the arrays are in use.
+		"""
+		view = memoryview(buffer)
+		header = view[:8 * HEADER_SIZE].cast("q")
+		version, num_peeps, num_events, num_values, text_size, num_slots = header.tolist()
+		if version != FORMAT_VERSION:
+			raise ValueError(f"unsupported problem array format version: {version}")
+		if len(view) < 8 * (HEADER_SIZE + num_slots) + text_size:
+			raise ValueError(f"truncated problem array buffer: {len(view)} bytes")
+		body = view[8 * HEADER_SIZE:8 * (HEADER_SIZE + num_slots)].cast("q")
+
+		position = 0
+		def take(count):
+			nonlocal position
+			part = body[position:position + count]
+			position += count
+			return part
+
+		peep_columns = {column: take(num_peeps) for column in PEEP_COLUMNS}
+		event_columns = {column: take(num_events) for column in EVENT_COLUMNS}
+		offsets = take(num_peeps + 1)
+		values = take(num_values)
+		matrix = take(num_peeps * num_events)
+		text_start = 8 * (HEADER_SIZE + num_slots)
+		text = json.loads(bytes(view[text_start:text_start + text_size]).decode("utf-8"))
+
+		arrays = cls(peep_columns, event_columns, offsets, values, matrix, text)
+		arrays._views = [view, header, body] + list(peep_columns.values()) + list(event_columns.values()) + [offsets, values, matrix]
+		return arrays
+
+	def release(self):
+		"""Release memoryviews into the underlying buffer so it can be closed."""
+		for view in reversed(self._views):
+			view.release()
+		self._views = []
+
+def share(arrays):
+	"""
+	Copy arrays into a new shared memory block; the caller must close and unlink it.
+
+	Returns:
+		SharedMemory
+	"""
+	data = arrays.to_bytes()
+	block = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+	block.buf[:len(data)] = data
+	return block
+
+def attach(name):
+	"""
+	Attach to a block created by share and read its arrays without copying.
+
+	Returns:
+		tuple: (SharedMemory, ProblemArrays); release the arrays before closing the block
+	"""
+	block = shared_memory.SharedMemory(name=name)
+	return block, ProblemArrays.from_buffer(block.buf)
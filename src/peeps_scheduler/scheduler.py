@@ -1,42 +1,89 @@
 import copy
+import datetime
+import json
 import logging
 import time
 import peeps_scheduler.constants as constants
 from peeps_scheduler import file_io
 from peeps_scheduler.models import Event, EventSequence, Peep, Role, SwitchPreference
-from peeps_scheduler import utils
+from peeps_scheduler import assignment, distributed, dominance, ingest, preselection, search, snapshot, utils
+from peeps_scheduler.sequence_store import SequenceStore
+from peeps_scheduler.checkpoint import SearchCheckpoint, compute_input_fingerprint
 from peeps_scheduler.data_manager import get_data_manager
 
 class Scheduler:
-	def __init__(self, data_folder, max_events, interactive=True, sequence_choice=0, cancellations_file='cancellations.json', partnerships_file='partnerships.json'):
+	def __init__(self, data_folder, max_events, interactive=True, sequence_choice=0, cancellations_file='cancellations.json', partnerships_file='partnerships.json', time_limit=None, engine='auto', budget=constants.DEFAULT_SEARCH_BUDGET_SECONDS, workers=None, assignment='greedy', resume=False, checkpoint_interval=constants.CHECKPOINT_INTERVAL_SECONDS, listen=None, local_workers=0, worker_token=None, preselection='overlap', dominance='off', kernel='object', store_cap=constants.SEQUENCE_STORE_CAP, compact_json=False, output_version=1):
 		self.data_folder = data_folder
 		self.max_events = max_events
 		self.interactive = interactive
 		self.sequence_choice = sequence_choice  # Which tied sequence to auto-select in non-interactive mode
 		self.cancellations_file = cancellations_file
 		self.partnerships_file = partnerships_file
-		self.data_manager = get_data_manager()
+		self.time_limit = time_limit  # Seconds for the whole target_max sweep; None means exhaustive
+		self.engine = engine  # 'auto' or one of constants.SEARCH_ENGINES
+		self.budget = budget  # Seconds the auto engine selection aims to stay within
+		self.workers = workers  # Workers for the parallel engines (threads on free-threaded builds); None uses all CPUs
+		if assignment not in constants.ASSIGNMENT_STRATEGIES:
+			raise ValueError(f"unknown assignment strategy: {assignment}")
+		self.assignment = assignment  # Per-event role assignment: 'greedy' single pass or 'flow' min-cost flow
+		if preselection not in constants.PRESELECTION_STRATEGIES:
+			raise ValueError(f"unknown preselection strategy: {preselection}")
+		self.preselection = preselection  # How to trim to max_events: 'overlap' removal or 'coverage' selection
+		if dominance not in constants.DOMINANCE_MODES:
+			raise ValueError(f"unknown dominance mode: {dominance}")
+		self.dominance = dominance  # Dominated events: 'off', 'order' after their dominators, or 'drop'
+		self.event_precedence = {}  # {dominated event id: dominator event id} enforced in every permutation
+		if kernel not in constants.EVALUATION_KERNELS:
+			raise ValueError(f"unknown evaluation kernel: {kernel}")
+		if kernel == 'array' and self.assignment != 'greedy':
+			raise ValueError("the array evaluation kernel supports only greedy assignment")
+		self.kernel = kernel  # Exhaustive scoring on 'object' models or the 'array' kernel (compiled if numba is installed)
+		self.resume = resume  # Resume an interrupted exhaustive search from its checkpoint
+		self.checkpoint_interval = checkpoint_interval  # Seconds between checkpoint writes; None disables checkpoints
+		self.checkpoint = None
+		self.coordinator = None  # Shard coordinator while the distributed engine is running
+		self.store_cap = store_cap  # Sequence records kept in memory before spilling sorted runs to disk
+		self.compact_json = compact_json  # Write output.json and results.json without indentation
+		if output_version not in constants.OUTPUT_JSON_VERSIONS:
+			raise ValueError(f"unknown output.json version: {output_version}")
+		self.output_version = output_version  # output.json schema to write: 1, or 2 with availability bit strings
+		self.sequence_store = None  # Store that in-process engines add sequences to while a run is searching
+		self.listen = listen  # Coordinator address for the distributed engine ("host:port" or a Unix socket path)
+		self.local_workers = local_workers  # Worker processes the coordinator starts on this machine
+		self.worker_token = worker_token  # Shared secret distributed workers must present; generated if None
 		self.partnership_requests = {}
+		self.target_max = None # max per role used for each run 
+
+		# A scheduler without a data folder can only evaluate sequences (used by search workers)
+		if data_folder is None:
+			self.data_manager = None
+			self.period_path = self.output_json = self.result_json = None
+			return
 
 		# Ensure period directory exists
+		self.data_manager = get_data_manager()
 		self.period_path = self.data_manager.ensure_period_exists(data_folder)
 		self.output_json = (self.period_path / 'output.json').as_posix()
 		self.result_json = (self.period_path / 'results.json').as_posix()
-		self.target_max = None # max per role used for each run 
 
 	def sanitize_events(self, events, peeps):
-		"""Sanitize events to ensure there are enough leaders and followers to fill roles."""
+		"""
+		Sanitize events to ensure there are enough leaders and followers to fill roles.
+		An event is kept if its best reachable per-role fill, counting peeps willing to switch roles, meets ABS_MIN_ROLE.
+		SWITCH_IF_PRIMARY_FULL peeps only count as switchers beyond what fills their own role.
+		This is a necessary condition only: a kept event can still fail to fill in a given sequence.
+		"""
+		role_counts = preselection.build_role_count_index(events, peeps)
 		valid_events = []
 		removed_events = []
 		for event in events:
-			num_leaders = sum(1 for peep in peeps if event.id in peep.availability and peep.role == Role.LEADER)
-			num_followers = sum(1 for peep in peeps if event.id in peep.availability and peep.role == Role.FOLLOWER)
-
-			if num_leaders >= constants.ABS_MIN_ROLE and num_followers >= constants.ABS_MIN_ROLE:
+			if role_counts[event.id].best_fill() >= constants.ABS_MIN_ROLE:
 				valid_events.append(event)
 			else:
 				removed_events.append(event)
 
+		if removed_events:
+			logging.debug(f"Removed events that can never reach the minimum fill: {[event.id for event in removed_events]}")
 		return valid_events
 	
 	def evaluate_sequence(self, sequence: EventSequence, keep_invalid=False):
@@ -45,82 +92,103 @@ class Scheduler:
 		Respects role limits, peep availability, and switch preferences.
 		"""
 		for event in sequence.events:
-			effective_max_role = min(event.max_role, self.target_max or event.max_role)
-
-			# Attempt to assign each peep to this event
-			for peep in sequence.peeps:
-				if not peep.can_attend(event):
-					continue  # Skip if unavailable, over limit, or on cooldown
-
-				primary_role = peep.role
-				secondary_role = primary_role.opposite()
-
-				# Try assigning in primary role
-				if event.num_attendees(primary_role) < effective_max_role:
-					event.add_attendee(peep, primary_role)
-
-				# Try secondary role if flexible and primary is full
-				elif (
-					peep.switch_pref == SwitchPreference.SWITCH_IF_PRIMARY_FULL and
-					event.num_attendees(secondary_role) < effective_max_role
-				):
-					event.add_attendee(peep, secondary_role)
-					logging.debug(
-						f"{peep.name} assigned in secondary role {secondary_role.name} "
-						f"(primary was full) for Event {event.id} on {event.formatted_date()}"
-					)
-
-				# Otherwise add as alternate in primary role
-				else:
-					event.add_alternate(peep, primary_role)
+			self.evaluate_event(sequence, event, keep_invalid=keep_invalid)
 
-			# TODO: Implement advanced dual-role promotion:
-			# 		- Use SWITCH_IF_PRIMARY_FULL peeps to allow a primary-role alternate into the event
+		self.finalize_sequence(sequence)
 
-			# Promote SWITCH_IF_NEEDED alternates if it enables the session to fill
-			for role in [Role.LEADER, Role.FOLLOWER]:
-				opposite_role = role.opposite()
+	def evaluate_event(self, sequence: EventSequence, event: Event, keep_invalid=False):
+		"""
+		Assigns the sequence's peeps to a single event, in current line order.
+		Valid events are appended to sequence.valid_events and their attendees move to the back of the line.
+		"""
+		effective_max_role = min(event.max_role, self.target_max or event.max_role)
 
-				# Check if this role is underfilled
-				if event.num_attendees(role) < event.min_role:
-					# Find SWITCH_IF_NEEDED alternates in opposite role who could help fill this role
-					eligible_alternates = [
-						peep for peep in event.get_alternates(opposite_role)
-						if peep.switch_pref == SwitchPreference.SWITCH_IF_NEEDED
-					]
+		if self.assignment == 'flow':
+			assignment.assign_event_by_flow(event, sequence.peeps, effective_max_role)
+		else:
+			self.assign_event_greedy(sequence, event, effective_max_role)
 
-					# Promote them to the underfilled role until it meets min_role or we run out
-					for peep in eligible_alternates:
-						if event.num_attendees(role) >= event.min_role:
-							break  # Already filled, stop promoting
-
-						if event.num_attendees(role) < effective_max_role:
-							# Remove from alternate list in their primary role
-							event.remove_alternate(peep, opposite_role)
-							# Add as attendee in the underfilled role
-							event.add_attendee(peep, role)
-							logging.debug(
-								f"{peep.name} promoted from {opposite_role.name} alternate to {role.name} attendee "
-								f"(SWITCH_IF_NEEDED enables session fill) for Event {event.id} on {event.formatted_date()}"
-							)
-
-			# Only consider events that meet the absolute minimums
-			if event.meets_absolute_min():
-				# Balance roles (demoting extras if needed)
-				event.balance_roles()
-
-				# If underfilled for event-specific duration, try to downgrade
-				if not event.meets_min():
-					event.downgrade_duration()
-
-			# Only keep event if it now meets per-duration min_role
-			if event.meets_min():
-				Peep.update_event_attendees(sequence.peeps, event)
-				sequence.valid_events.append(event)
-			else:
-				if not keep_invalid:
-					event.clear_participants()
+		# Only consider events that meet the absolute minimums
+		if event.meets_absolute_min():
+			# Balance roles (demoting extras if needed)
+			event.balance_roles()
+
+			# If underfilled for event-specific duration, try to downgrade
+			if not event.meets_min():
+				event.downgrade_duration()
+
+		# Only keep event if it now meets per-duration min_role
+		if event.meets_min():
+			Peep.update_event_attendees(sequence.peeps, event)
+			sequence.valid_events.append(event)
+		else:
+			if not keep_invalid:
+				event.clear_participants()
 
+	def assign_event_greedy(self, sequence: EventSequence, event: Event, effective_max_role):
+		"""
+		Single pass in line order: primary role first, secondary role for SWITCH_IF_PRIMARY_FULL peeps,
+		otherwise alternate. SWITCH_IF_NEEDED alternates are then promoted if that lets a role reach its minimum.
+		"""
+		# Attempt to assign each peep to this event
+		for peep in sequence.peeps:
+			if not peep.can_attend(event):
+				continue  # Skip if unavailable, over limit, or on cooldown
+
+			primary_role = peep.role
+			secondary_role = primary_role.opposite()
+
+			# Try assigning in primary role
+			if event.num_attendees(primary_role) < effective_max_role:
+				event.add_attendee(peep, primary_role)
+
+			# Try secondary role if flexible and primary is full
+			elif (
+				peep.switch_pref == SwitchPreference.SWITCH_IF_PRIMARY_FULL and
+				event.num_attendees(secondary_role) < effective_max_role
+			):
+				event.add_attendee(peep, secondary_role)
+				logging.debug(
+					f"{peep.name} assigned in secondary role {secondary_role.name} "
+					f"(primary was full) for Event {event.id} on {event.formatted_date()}"
+				)
+
+			# Otherwise add as alternate in primary role
+			else:
+				event.add_alternate(peep, primary_role)
+
+		# Advanced dual-role promotion (using SWITCH_IF_PRIMARY_FULL peeps to let a primary-role
+		# alternate into the event) is handled by the 'flow' assignment strategy.
+
+		# Promote SWITCH_IF_NEEDED alternates if it enables the session to fill
+		for role in [Role.LEADER, Role.FOLLOWER]:
+			opposite_role = role.opposite()
+
+			# Check if this role is underfilled
+			if event.num_attendees(role) < event.min_role:
+				# Find SWITCH_IF_NEEDED alternates in opposite role who could help fill this role
+				eligible_alternates = [
+					peep for peep in event.get_alternates(opposite_role)
+					if peep.switch_pref == SwitchPreference.SWITCH_IF_NEEDED
+				]
+
+				# Promote them to the underfilled role until it meets min_role or we run out
+				for peep in eligible_alternates:
+					if event.num_attendees(role) >= event.min_role:
+						break  # Already filled, stop promoting
+
+					if event.num_attendees(role) < effective_max_role:
+						# Remove from alternate list in their primary role
+						event.remove_alternate(peep, opposite_role)
+						# Add as attendee in the underfilled role
+						event.add_attendee(peep, role)
+						logging.debug(
+							f"{peep.name} promoted from {opposite_role.name} alternate to {role.name} attendee "
+							f"(SWITCH_IF_NEEDED enables session fill) for Event {event.id} on {event.formatted_date()}"
+						)
+
+	def finalize_sequence(self, sequence: EventSequence):
+		"""Prunes stale alternates and computes the sequence's metrics once every event has been evaluated."""
 		# Remove any alternates who are now ineligible (e.g. due to attending another event)
 		for event in sequence.valid_events:
 			event.validate_alternates()
@@ -129,19 +197,50 @@ class Scheduler:
 		sequence.finalize()
 		sequence.calculate_partnerships_fulfilled(self.partnership_requests)
 
-	def evaluate_all_event_sequences(self, og_peeps, og_events):
-		"""Generates and evaluates all possible event sequences based on peep availability and role limits."""
-		event_perm = utils.generate_event_permutations(og_events)
+	def evaluate_all_event_sequences(self, og_peeps, og_events, time_limit=None):
+		"""
+		Generates and evaluates all possible event sequences based on peep availability and role limits.
+
+		With a time_limit (seconds), permutations are explored most promising first, starting from a
+		greedy seed, and the search stops once the limit is reached.
+		"""
+		if time_limit is None:
+			start_index = self.checkpoint.resume_index(self.target_max) if self.checkpoint else 0
+			if start_index is None:
+				logging.debug(f"target_max={self.target_max} already completed in checkpoint; skipping")
+				return []
+			if start_index:
+				logging.info(f"Resuming target_max={self.target_max} at permutation {start_index}")
+			event_perm = enumerate(utils.permutation_range([event.id for event in og_events], start_index), start_index)
+		else:
+			event_perm = enumerate(search.promise_ordered_permutations(self, og_peeps, og_events))
 		event_map = {event.id: event for event in og_events}
 		sequences = []
 
 		start_time = time.perf_counter()
-		for perm in event_perm:
+		deadline = start_time + time_limit if time_limit is not None else None
+		for index, perm in event_perm:
+			if not dominance.respects_precedence(perm, self.event_precedence):
+				if self.checkpoint is not None and time_limit is None:
+					self.checkpoint.observe(self, index, perm, None)
+				continue
+
 			events = [copy.deepcopy(event_map[id]) for id in perm]
 			sequence = EventSequence(events, copy.deepcopy(og_peeps))
 			self.evaluate_sequence(sequence)
 			if sequence.valid_events:
-				sequences.append(sequence)
+				if self.sequence_store is not None:
+					self.sequence_store.add_sequence(self, sequence)
+				else:
+					sequences.append(sequence)
+
+			if self.checkpoint is not None and time_limit is None:
+				self.checkpoint.observe(self, index, perm, sequence)
+
+			# Checked after evaluating so the first (seed) sequence is always scored
+			if deadline is not None and time.perf_counter() >= deadline:
+				logging.warning(f"Time limit of {time_limit:.2f}s reached for target_max={self.target_max}; stopping search early.")
+				break
 		end_time = time.perf_counter()
 
 		logging.debug(f"Evaluation complete. Elapsed time: {end_time - start_time:.2f}s")
@@ -152,67 +251,166 @@ class Scheduler:
 		Remove events that have the highest participant overlap with all other events in the list,
 		until we have no more than max_events in the list. If overlap is the same, remove the lowest-weighted event.
 		Returns a new list.
-		"""
-
-		def find_overlapping_events(events, peeps):
-			"""
-			Identify the event with the highest participant overlap.
-
-			Overlap is calculated by counting the number of shared participants between each pair of events.
-			If a peep is available for both event A and event B, they contribute to the overlap score for both events.
-			"""
-			overlap_scores = {event.id: 0 for event in events}
-
-			logging.debug("Computing event overlap...")
 
-			# Create a lookup for peep availability
-			peep_event_map = {peep.id: set(peep.availability) for peep in peeps}
-
-			# Compute event overlap
-			for i, event_a in enumerate(events):
-				for j, event_b in enumerate(events):
-					if i >= j:
-						continue  # Avoid redundant checks
-
-					# Count shared peeps who are available for both events
-					shared_peeps = sum(1 for peep in peeps if
-						event_a.id in peep_event_map[peep.id] and event_b.id in peep_event_map[peep.id])
+		Overlap is the number of shared participants between each pair of events: a peep available for
+		both event A and event B contributes to the overlap score of both. The co-availability matrix is
+		built once; removing an event subtracts its column from the remaining events' scores.
+		"""
+		logging.debug(f"Initial event count: {len(events)}. Target event count: {max_events}.")
+		if len(events) <= max_events:
+			logging.debug(f"Final event count: {len(events)}.")
+			return events
+
+		logging.debug("Computing event overlap...")
+		co_availability = utils.co_availability_matrix(utils.availability_bitmasks(events, peeps))
+		overlap_scores = [sum(row) - row[i] for i, row in enumerate(co_availability)]
+		event_weights = [sum(peep.priority for peep in peeps if event.id in peep.availability) for event in events]
+		remaining = list(range(len(events)))
+
+		while len(remaining) > max_events:
+			logging.debug(f"Overlap scores: { {events[i].id: overlap_scores[i] for i in remaining} }")
+			max_overlap = max(overlap_scores[i] for i in remaining)
+			candidates = [i for i in remaining if overlap_scores[i] == max_overlap]
+			logging.debug(f"Events with max overlap ({max_overlap}): {[events[i].id for i in candidates]}")
 
-					overlap_scores[event_a.id] += shared_peeps
-					overlap_scores[event_b.id] += shared_peeps
+			if len(candidates) == 1:
+				removed = candidates[0]
+			else:
+				# Use weight as a tiebreaker
+				removed = min(candidates, key=lambda i: event_weights[i])
+				logging.debug(f"Tie on overlap. Removing event based on lowest weight")
 
-			logging.debug(f"Overlap scores: {overlap_scores}")
-			return overlap_scores
+			remaining.remove(removed)
+			for i in remaining:
+				overlap_scores[i] -= co_availability[i][removed]
+			event_to_remove = events[removed]
+			logging.debug(f"Removing event: Event({event_to_remove.id}) Date: {event_to_remove.date}. Remaining events: {len(remaining)}.")
 
-		def find_event_to_remove(events, peeps):
-			"""
-			Find the event with the highest overlap. If there's a tie, remove the event with the lowest weight.
-			"""
-			overlap_scores = find_overlapping_events(events, peeps)
-			max_overlap = max(overlap_scores.values())
-			candidates = [event for event in events if overlap_scores[event.id] == max_overlap]
+		events = [events[i] for i in remaining]
+		logging.debug(f"Final event count: {len(events)}.")
+		return events
+	
+	def select_engine(self, peeps, events):
+		"""
+		Resolve which search engine to run. An explicit engine is used as-is; 'auto' picks one from
+		a calibrated cost estimate and the budget, and an explicit time_limit always means heuristic.
+		"""
+		if self.resume and self.engine not in ('auto', 'exhaustive'):
+			raise ValueError(f"resuming requires the exhaustive engine, not {self.engine}")
+
+		if self.engine != 'auto':
+			if self.engine not in search.ENGINES:
+				raise ValueError(f"unknown search engine: {self.engine}")
+			logging.info(f"Using search engine: {self.engine}")
+			return self.engine
+
+		if self.resume:
+			logging.info("Resuming from checkpoint; using search engine: exhaustive")
+			return 'exhaustive'
+
+		if self.listen or self.local_workers:
+			logging.info("Coordinator requested; using search engine: distributed")
+			return 'distributed'
+
+		if self.time_limit is not None:
+			logging.info(f"Time limit of {self.time_limit:.1f}s set; using search engine: heuristic")
+			return 'heuristic'
+
+		if self.kernel == 'array':
+			# Only the exhaustive engine scores with the kernel; otherwise fall back to the object estimate
+			estimate = search.estimate_search_cost(self, peeps, events, use_kernel=True)
+			if self.budget is None or estimate.total_seconds <= self.budget:
+				logging.info(f"Search estimate with the array kernel: {estimate}; using search engine: exhaustive")
+				return 'exhaustive'
+
+		estimate = search.estimate_search_cost(self, peeps, events)
+		engine = search.select_engine(estimate, self.budget, self.workers)
+		budget_str = f"{self.budget:.1f}s" if self.budget is not None else "none"
+		logging.info(f"Search estimate: {estimate} (budget {budget_str}); using search engine: {engine}")
+		return engine
+
+	def open_checkpoint(self, events, engine='exhaustive'):
+		"""
+		Create the checkpoint for an exhaustive search, or load it when resuming.
+		Raises ValueError if the inputs, or any setting that changes the searched events or their
+		scoring, changed since the checkpoint was written.
+		"""
+		if self.checkpoint_interval is None and not self.resume:
+			return None
+
+		path = self.period_path / constants.CHECKPOINT_FILE
+		fingerprint = compute_input_fingerprint(
+			[self.output_json, self.period_path / self.cancellations_file, self.period_path / self.partnerships_file],
+			settings={
+				"max_events": self.max_events, "assignment": self.assignment, "dominance": self.dominance,
+				"preselection": self.preselection, "kernel": self.kernel, "engine": engine,
+			},
+		)
+		event_ids = [event.id for event in events]
+
+		if self.resume:
+			loaded = SearchCheckpoint.load(path, fingerprint, event_ids, self.checkpoint_interval)
+			if loaded:
+				logging.info(
+					f"Resuming search from {path}: target_max={loaded.target_max}, "
+					f"permutation {loaded.next_index}, {len(loaded.records)} incumbent(s)"
+				)
+				return loaded
+			logging.warning(f"No checkpoint found at {path}; starting a fresh search")
 
-			logging.debug(f"Events with max overlap ({max_overlap}): {[event.id for event in candidates]}")
+		return SearchCheckpoint(path, fingerprint, event_ids, self.checkpoint_interval)
 
-			if len(candidates) == 1:
-				return candidates[0]
+	def convert_csv_inputs(self, year=None, incremental=False):
+		"""
+		Convert members.csv and responses.csv into output.json, skipping the conversion when the
+		conversion cache shows the same CSV contents and year already produced the current output.json.
+		With incremental, only responses.csv rows appended or edited since the last conversion are
+		applied (see ingest.update), as long as members.csv is unchanged.
 
-			# Use weight as a tiebreaker
-			event_weights = {event: sum(peep.priority for peep in peeps if event.id in peep.availability) for event in candidates}
-			event_to_remove = min(event_weights, key=event_weights.get)
+		Returns:
+			bool: True if output.json was written, False if the cached output.json was reused
+		"""
+		responses_csv = (self.period_path / 'responses.csv').as_posix()
+		peeps_csv = (self.period_path / 'members.csv').as_posix()
+		cache_path = self.period_path / constants.CONVERSION_CACHE_FILE
+		inputs = compute_input_fingerprint(
+			[responses_csv, peeps_csv],
+			settings={
+				"year": year or datetime.datetime.now().year,
+				"compact": self.compact_json,
+				"output_version": self.output_version,
+				"version": constants.CONVERSION_CACHE_VERSION,
+			},
+		)
+		members = compute_input_fingerprint([peeps_csv])
 
-			logging.debug(f"Tie on overlap. Removing event based on lowest weight")
-			return event_to_remove
+		try:
+			cached = file_io.load_json(cache_path) or {}
+		except json.JSONDecodeError:
+			cached = {}
+		output_unchanged = cached.get("output") == compute_input_fingerprint([self.output_json])
+		if cached.get("inputs") == inputs and output_unchanged:
+			logging.info(f"{peeps_csv} and {responses_csv} unchanged since last conversion; reusing {self.output_json}")
+			return False
+
+		state = None
+		if incremental and output_unchanged and cached.get("members") == members:
+			state = ingest.update(responses_csv, peeps_csv, str(self.output_json), cached.get("ingest"), year=year, compact=self.compact_json, version=self.output_version)
+		if state is None:
+			logging.info(f"Loading data from {peeps_csv} and {responses_csv}")
+			if incremental:
+				state = ingest.convert(responses_csv, peeps_csv, str(self.output_json), year=year, compact=self.compact_json, version=self.output_version)
+			else:
+				file_io.convert_to_json(responses_csv, peeps_csv, str(self.output_json), year=year, compact=self.compact_json, version=self.output_version)
 
-		logging.debug(f"Initial event count: {len(events)}. Target event count: {max_events}.")
-		while len(events) > max_events:
-			event_to_remove = find_event_to_remove(events, peeps)
-			logging.debug(f"Removing event: Event({event_to_remove.id}) Date: {event_to_remove.date}. Remaining events: {len(events) - 1}.")
-			events = [event for event in events if event.id != event_to_remove.id]
+		file_io.save_json({
+			"inputs": inputs,
+			"output": compute_input_fingerprint([self.output_json]),
+			"members": members,
+			"ingest": state,
+		}, cache_path, compact=True)
+		return True
 
-		logging.debug(f"Final event count: {len(events)}.")
-		return events
-	
 	def get_top_sequences(self, sequences):
 		logging.debug(f"Evaluating {len(sequences)} total sequences")
 
@@ -221,34 +419,25 @@ class Scheduler:
 			return []
 
 		# sort by each metric in order of importance
-		sorted_unique = sorted(unique, key=lambda s: (
+		sorted_unique = sorted(unique, key=self.rank_key)
+		best_key = self.rank_key(sorted_unique[0])
+
+		# return all sequences tied on every metric
+		return [s for s in sorted_unique if self.rank_key(s) == best_key]
+
+	@staticmethod
+	def rank_key(s):
+		"""Sort key for sequences, best first. Sequences with equal keys are tied."""
+		return (
 			-s.num_unique_attendees,      # Maximize how many got in
 			-s.priority_fulfilled,        # Favor overdue people
 			-s.mutual_unique_fulfilled,   # Mutual partnership requests (unique)
 			-s.normalized_utilization,    # Capacity usage per-person
 			-s.mutual_repeat_fulfilled,   # Mutual partnership repeats
 			-s.one_sided_fulfilled        # One-sided request bonus
-		))
-
-		best_unique = sorted_unique[0].num_unique_attendees
-		best_priority = sorted_unique[0].priority_fulfilled 
-		best_mutual_unique = sorted_unique[0].mutual_unique_fulfilled
-		best_util = sorted_unique[0].normalized_utilization
-		best_mutual_repeat = sorted_unique[0].mutual_repeat_fulfilled
-		best_one_sided = sorted_unique[0].one_sided_fulfilled
-
-		# return all sequences tied by unique attendees
-		return [
-			s for s in sorted_unique 
-			if s.num_unique_attendees == best_unique 
-			and s.priority_fulfilled == best_priority 
-			and s.mutual_unique_fulfilled == best_mutual_unique
-			and s.normalized_utilization == best_util 
-			and s.mutual_repeat_fulfilled == best_mutual_repeat
-			and s.one_sided_fulfilled == best_one_sided
-		]
-
-	def run(self, generate_test_data=False, load_from_csv=False):
+		)
+
+	def run(self, generate_test_data=False, load_from_csv=False, incremental=False):
 		# Extract year from data_folder for cancellations parsing
 		# (e.g., "2026-01" -> 2026) - handle both absolute paths and folder names
 		from pathlib import Path
@@ -262,14 +451,11 @@ class Scheduler:
 			logging.info(f"Generating test data and saving to {self.output_json}")
 			utils.generate_test_data(5, 30, self.output_json)
 		elif load_from_csv:
-			responses_csv = (self.period_path / 'responses.csv').as_posix()
-			peeps_csv = (self.period_path / 'members.csv').as_posix()
-			logging.info(f"Loading data from {peeps_csv} and {responses_csv}")
-			file_io.convert_to_json(str(responses_csv), str(peeps_csv), str(self.output_json), year=year)
+			self.convert_csv_inputs(year, incremental=incremental)
 
 		logging.info(f"Loading data from {self.output_json}")
 
-		peeps, events = file_io.load_data_from_json(str(self.output_json))
+		peeps, events = snapshot.load_data(str(self.output_json))
 		self.partnership_requests = file_io.load_partnerships(
 			str(self.period_path),
 			partnerships_filename=self.partnerships_file,
@@ -302,7 +488,7 @@ class Scheduler:
 				logging.info(f"Excluding {excluded_count} cancelled event(s) from scheduling")
 
 		if cancelled_availability:
-			peeps_by_email = {file_io.normalize_email(p.email): p for p in peeps}
+			peeps_by_email, _ = file_io.build_email_index(peeps)
 			unknown_emails = set(cancelled_availability.keys()) - set(peeps_by_email.keys())
 			if unknown_emails:
 				raise ValueError(f"cancelled availability email(s) not found in members: {sorted(unknown_emails)}")
@@ -363,20 +549,50 @@ class Scheduler:
 		# Get all events that can be filled to the minimum 
 		sanitized_events = self.sanitize_events(events, peeps)
 		logging.debug(f"Sanitized Events: {len(sanitized_events)}/{len(events)}")
+		sanitized_events, self.event_precedence = dominance.apply_dominance(sanitized_events, peeps, self.dominance)
 
 		# If too many events, remove some 
 		if len(sanitized_events) > self.max_events:
-			logging.warning(f"Too many valid events. Trimming to {self.max_events} based on overlap.")
-			sanitized_events = self.remove_high_overlap_events(sanitized_events, peeps, self.max_events)
+			logging.warning(f"Too many valid events. Trimming to {self.max_events} based on {self.preselection}.")
+			if self.preselection == 'coverage':
+				sanitized_events = preselection.select_events_by_coverage(sanitized_events, peeps, self.max_events)
+			else:
+				sanitized_events = self.remove_high_overlap_events(sanitized_events, peeps, self.max_events)
 
 		# Try events with different max per role to get the *actual* best sequence
-		all_sequences = []
-		for target_max in range(constants.ABS_MIN_ROLE, constants.ABS_MAX_ROLE + 1):  
-			self.target_max = target_max
-			sequences = self.evaluate_all_event_sequences(peeps, sanitized_events)
-			all_sequences.extend(sequences)
-
-		best = self.get_top_sequences(all_sequences)
+		engine = self.select_engine(peeps, sanitized_events)
+		self.checkpoint = self.open_checkpoint(sanitized_events, engine) if engine == 'exhaustive' else None
+		store = SequenceStore(self.store_cap)
+		if self.checkpoint:
+			records = list(self.checkpoint.records)
+			for (target_max, _), sequence in zip(records, self.checkpoint.rebuild(self, peeps, sanitized_events), strict=True):
+				store.add_sequence(self, sequence, target_max)
+		# Engines evaluating in this process add sequences as they find them instead of returning them all
+		self.sequence_store = store if engine in ('exhaustive', 'heuristic') else None
+		try:
+			if engine == 'distributed':
+				self.coordinator = distributed.start_coordinator(self, peeps, sanitized_events)
+			for target_max in search.TARGET_MAXES:
+				self.target_max = target_max
+				for sequence in search.ENGINES[engine](self, peeps, sanitized_events):
+					store.add_sequence(self, sequence)
+			logging.debug(f"Search found {len(store)} sequences ({len(store.runs)} runs spilled to disk)")
+			top_sequences = store.top_sequences(self, peeps, sanitized_events)
+		except KeyboardInterrupt:
+			if self.checkpoint:
+				self.checkpoint.save()
+				logging.warning(f"Search interrupted; checkpoint saved to {self.checkpoint.path}. Continue with: run --resume")
+			raise
+		finally:
+			self.sequence_store = None
+			store.close()
+			if self.coordinator:
+				self.coordinator.close()
+				self.coordinator = None
+		if self.checkpoint:
+			self.checkpoint.remove()
+
+		best = self.get_top_sequences(top_sequences)
 		if not best:
 			logging.info("No sequence could fill any events.")
 			return
@@ -384,7 +600,7 @@ class Scheduler:
 		if len(best) == 1:
 			best_sequence = best[0]
 			logging.info(f"Auto-selected best sequence: {best_sequence}")
-			file_io.save_event_sequence(best_sequence, str(self.result_json))
+			file_io.save_event_sequence(best_sequence, str(self.result_json), compact=self.compact_json)
 			logging.debug("Final Peeps:")
 			logging.debug(Peep.peeps_str(best_sequence.peeps))
 			return best_sequence
@@ -400,7 +616,7 @@ class Scheduler:
 					chosen_index = int(choice)
 					best_sequence = best[chosen_index]
 					logging.info(f"Selected {best_sequence}")
-					file_io.save_event_sequence(best_sequence, str(self.result_json))
+					file_io.save_event_sequence(best_sequence, str(self.result_json), compact=self.compact_json)
 					logging.debug("Final Peeps:")
 					logging.debug(Peep.peeps_str(best_sequence.peeps))
 					return best_sequence
@@ -416,7 +632,7 @@ class Scheduler:
 					logging.warning(f"Sequence choice {self.sequence_choice} out of range, selecting first")
 					best_sequence = best[0]
 					logging.info(f"Auto-selected first tied sequence: {best_sequence}")
-				file_io.save_event_sequence(best_sequence, str(self.result_json))
+				file_io.save_event_sequence(best_sequence, str(self.result_json), compact=self.compact_json)
 				logging.debug("Final Peeps:")
 				logging.debug(Peep.peeps_str(best_sequence.peeps))
 				return best_sequence
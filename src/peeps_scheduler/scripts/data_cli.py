@@ -6,13 +6,16 @@ Simple CLI for data period management using the DataManager.
 import argparse
 import logging
 import os
+import sqlite3
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from peeps_scheduler import constants
 from peeps_scheduler.data_manager import DataManager
+from peeps_scheduler.export import EXPORT_ERRORS, export_periods
 
 
 def create_period(period_slug: str) -> bool:
@@ -78,6 +81,53 @@ def show_period_details(period_slug: str) -> None:
 		print(f"❌ Failed to show period details: {e}")
 
 
+def import_database() -> bool:
+	"""Import every period folder into the SQLite history database."""
+	try:
+		data_manager = DataManager()
+		with data_manager.open_database() as db:
+			periods = db.import_periods(data_manager)
+		print(f"✅ Imported {len(periods)} period(s) into {data_manager.get_database_path()}")
+		return True
+	except (sqlite3.Error, OSError, ValueError) as e:
+		print(f"❌ Failed to import periods: {e}")
+		return False
+
+
+def show_member_history(email: str) -> None:
+	"""Show a member's priority and attendance in every imported period."""
+	try:
+		data_manager = DataManager()
+		with data_manager.open_database() as db:
+			history = db.member_history(email)
+		
+		if not history:
+			print(f"📁 No imported periods for {email}")
+			return
+		
+		print(f"📈 History for {email}:")
+		for record in history:
+			after = "?" if record["priority_after"] is None else record["priority_after"]
+			responded = "responded" if record["responded"] else "no response"
+			print(f"   📅 {record['period']}: priority {record['priority']} -> {after}, "
+				f"scheduled {record['scheduled']}, attended {record['attended']} ({responded})")
+			
+	except (sqlite3.Error, OSError, ValueError) as e:
+		print(f"❌ Failed to show history: {e}")
+
+
+def export_history(output_dir: str, format: str) -> bool:
+	"""Export every period as columnar files for analytics."""
+	try:
+		data_manager = DataManager()
+		written = export_periods(data_manager, output_dir, format=format)
+		print(f"✅ Exported {len(data_manager.list_periods())} period(s) to {output_dir} ({len(written)} files)")
+		return True
+	except EXPORT_ERRORS as e:
+		print(f"❌ Failed to export periods: {e}")
+		return False
+
+
 def main():
 	"""Main CLI interface."""
 	parser = argparse.ArgumentParser(
@@ -93,6 +143,13 @@ Examples:
   
   # Show details for specific period
   python scripts/data_cli.py show --period 2025-09
+  
+  # Import all periods into the SQLite history database, then query it
+  python scripts/data_cli.py import-db
+  python scripts/data_cli.py history --email someone@example.com
+  
+  # Export all periods as Parquet files partitioned by period (needs pyarrow)
+  python scripts/data_cli.py export --output-dir history
 		"""
 	)
 	
@@ -111,6 +168,16 @@ Examples:
 	show_parser = subparsers.add_parser("show", help="Show period details")
 	show_parser.add_argument("--period", required=True, help="Period slug")
 	
+	# Database commands
+	subparsers.add_parser("import-db", help="Import all periods into the SQLite history database")
+	history_parser = subparsers.add_parser("history", help="Show a member's history from the database")
+	history_parser.add_argument("--email", required=True, help="Member email address")
+	
+	# Export command
+	export_parser = subparsers.add_parser("export", help="Export all periods as columnar files (needs pyarrow)")
+	export_parser.add_argument("--output-dir", required=True, help="Folder to write <table>/period=<slug>/ files into")
+	export_parser.add_argument("--format", choices=constants.EXPORT_FORMATS, default="parquet", help="Parquet or Arrow IPC (default: parquet)")
+	
 	args = parser.parse_args()
 	
 	if args.verbose:
@@ -126,6 +193,17 @@ Examples:
 	elif args.command == "show":
 		show_period_details(args.period)
 		
+	elif args.command == "import-db":
+		success = import_database()
+		sys.exit(0 if success else 1)
+		
+	elif args.command == "history":
+		show_member_history(args.email)
+		
+	elif args.command == "export":
+		success = export_history(args.output_dir, args.format)
+		sys.exit(0 if success else 1)
+		
 	else:
 		parser.print_help()
 		sys.exit(1)
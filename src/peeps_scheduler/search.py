@@ -0,0 +1,649 @@
+"""
+Search engines and ordering helpers for the event permutation search.
+
+itertools.permutations visits orders lexicographically, so a strong sequence can
+turn up late in the search. The ordering helpers build a greedy seed sequence and
+rank events so the most promising orders are explored first, which is what matters
+when a search is cut short.
+
+Engines evaluate every sequence worth keeping for the scheduler's current target_max.
+Before running, the scheduler estimates the cost of an exhaustive sweep and picks an
+engine that fits its time budget.
+"""
+
+import copy
+import itertools
+import logging
+import math
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from peeps_scheduler import constants, dominance, kernel, lanes, problem_arrays, utils
+from peeps_scheduler.models import EventSequence, Role
+
+TARGET_MAXES = range(constants.ABS_MIN_ROLE, constants.ABS_MAX_ROLE + 1)
+
+def evaluate_permutation(scheduler, peeps, event_map, perm):
+	"""Evaluate one event order on fresh copies of the peeps and events for scheduler.target_max."""
+	sequence = EventSequence([copy.deepcopy(event_map[id]) for id in perm], copy.deepcopy(peeps))
+	scheduler.evaluate_sequence(sequence)
+	return sequence
+
+class TieSet:
+	"""Event orders tied for the best rank key seen so far, in the order they were found."""
+
+	def __init__(self):
+		self.best_key = None
+		self.perms = []
+
+	def add(self, key, perm):
+		if self.best_key is None or key < self.best_key:
+			self.best_key, self.perms = key, [perm]
+		elif key == self.best_key:
+			self.perms.append(perm)
+
+	def rebuild(self, scheduler, peeps, events):
+		"""Re-evaluate the tied event orders into full sequences."""
+		event_map = {event.id: event for event in events}
+		return [evaluate_permutation(scheduler, peeps, event_map, perm) for perm in self.perms]
+
+def event_promise_scores(events, peeps):
+	"""
+	Score each event by scarcity and priority demand.
+
+	Returns:
+		dict: {event_id: (scarcity, demand)} where scarcity is the smaller of the available
+		primary leader/follower counts and demand is the total priority of available peeps.
+	"""
+	supply = {event.id: {Role.LEADER: 0, Role.FOLLOWER: 0} for event in events}
+	demand = {event.id: 0 for event in events}
+
+	for peep in peeps:
+		for event_id in peep.availability:
+			if event_id in supply:
+				supply[event_id][peep.role] += 1
+				demand[event_id] += peep.priority
+
+	return {event_id: (min(counts.values()), demand[event_id]) for event_id, counts in supply.items()}
+
+def order_events_by_promise(events, peeps):
+	"""
+	Return events ordered most promising first.
+
+	Scarce events (fewest available peeps in the limiting role) go first so they can fill
+	before their peeps are used up elsewhere. Ties go to the event with the highest priority demand.
+	"""
+	scores = event_promise_scores(events, peeps)
+	return sorted(events, key=lambda event: (scores[event.id][0], -scores[event.id][1], event.id))
+
+def build_greedy_sequence(scheduler, peeps, events):
+	"""
+	Build an event order one event at a time, always taking the event with the best marginal gain.
+
+	Gain is measured as (newly scheduled peeps, their priority, seats filled) after evaluating the
+	candidate event against the current prefix with scheduler.evaluate_event. Events that add nothing
+	are appended in promise order.
+
+	Returns:
+		tuple: event ids in greedy order
+	"""
+	remaining = order_events_by_promise(events, peeps)
+	state = EventSequence([], copy.deepcopy(peeps))
+	order = []
+
+	while remaining:
+		best_event, best_state, best_gain = None, None, None
+		for event in remaining:
+			trial = copy.deepcopy(state)
+			trial_event = copy.deepcopy(event)
+			trial.events.append(trial_event)
+			scheduled_before = {peep.id for peep in trial.peeps if peep.num_events > 0}
+
+			scheduler.evaluate_event(trial, trial_event)
+
+			newly_scheduled = [
+				peep for peep in trial_event.attendees
+				if trial_event in trial.valid_events and peep.id not in scheduled_before
+			]
+			seats = len(trial_event.attendees) if trial_event in trial.valid_events else 0
+			gain = (len(newly_scheduled), sum(peep.original_priority for peep in newly_scheduled), seats)
+
+			if best_gain is None or gain > best_gain:
+				best_event, best_state, best_gain = event, trial, gain
+
+		if best_gain == (0, 0, 0):
+			break
+
+		order.append(best_event.id)
+		remaining.remove(best_event)
+		state = best_state
+
+	order.extend(event.id for event in remaining)
+	logging.debug(f"Greedy seed sequence: {order}")
+	return tuple(order)
+
+def promise_ordered_permutations(scheduler, peeps, events):
+	"""
+	Yield every permutation of event ids, most promising first.
+
+	The greedy seed comes first so a good incumbent exists immediately, followed by all
+	permutations of the promise-ranked events (skipping the seed).
+	"""
+	if not events:
+		return
+
+	seed = build_greedy_sequence(scheduler, peeps, events)
+	yield seed
+
+	ranked_ids = [event.id for event in order_events_by_promise(events, peeps)]
+	for perm in itertools.permutations(ranked_ids):
+		if perm != seed:
+			yield perm
+
+# -- Cost estimation --
+
+class SearchEstimate:
+	"""Estimated cost of an exhaustive search over every permutation and target_max."""
+
+	def __init__(self, num_events, num_permutations, num_targets, seconds_per_evaluation):
+		self.num_events = num_events
+		self.num_permutations = num_permutations
+		self.num_targets = num_targets
+		self.seconds_per_evaluation = seconds_per_evaluation
+
+	@property
+	def num_evaluations(self):
+		return self.num_permutations * self.num_targets
+
+	@property
+	def total_seconds(self):
+		return self.num_evaluations * self.seconds_per_evaluation
+
+	def __str__(self):
+		return (f"{self.num_events} events, {self.num_permutations} permutations x {self.num_targets} targets "
+				f"= {self.num_evaluations} evaluations at {self.seconds_per_evaluation * 1000:.2f}ms "
+				f"~ {self.total_seconds:.1f}s")
+
+def estimate_search_cost(scheduler, peeps, events, samples=constants.SEARCH_CALIBRATION_SAMPLES, use_kernel=False):
+	"""
+	Estimate exhaustive search cost by timing a few real evaluations.
+
+	Calibration runs at the largest target_max, which does the most assignment work,
+	and restores the scheduler's target_max afterwards. With use_kernel, the array
+	evaluation kernel is timed instead of the object model.
+	"""
+	num_permutations = math.factorial(len(events)) if events else 0
+	if not events or not peeps:
+		return SearchEstimate(len(events), num_permutations, len(TARGET_MAXES), 0.0)
+
+	saved_target_max = scheduler.target_max
+	scheduler.target_max = TARGET_MAXES[-1]
+	event_map = {event.id: event for event in events}
+	calibration_perms = list(itertools.islice(itertools.permutations(event_map), samples))
+
+	if use_kernel:
+		evaluator = kernel.EvaluationKernel(peeps, events, scheduler.partnership_requests)
+		evaluator.score(calibration_perms[0], scheduler.target_max, seating=False)  # compile outside the timing
+		evaluate = lambda perm: evaluator.score(perm, scheduler.target_max, seating=False)
+	else:
+		evaluate = lambda perm: evaluate_permutation(scheduler, peeps, event_map, perm)
+
+	start_time = time.perf_counter()
+	for perm in calibration_perms:
+		evaluate(perm)
+	elapsed = time.perf_counter() - start_time
+	scheduler.target_max = saved_target_max
+
+	return SearchEstimate(len(events), num_permutations, len(TARGET_MAXES), elapsed / len(calibration_perms))
+
+def select_engine(estimate, budget, workers=None):
+	"""
+	Choose the cheapest engine expected to finish within budget seconds.
+
+	Exact engines are preferred in order exhaustive, parallel, branch_and_bound,
+	parallel_branch_and_bound; if none is expected to fit, the time-limited heuristic
+	engine is used. A budget of None always selects exhaustive.
+	"""
+	workers = workers or os.cpu_count() or 1
+	if budget is None or estimate.total_seconds <= budget:
+		return "exhaustive"
+	if workers > 1 and estimate.total_seconds / workers <= budget:
+		return "parallel"
+	if estimate.total_seconds / constants.BRANCH_AND_BOUND_EXPECTED_SPEEDUP <= budget:
+		return "branch_and_bound"
+	if workers > 1 and estimate.total_seconds / (constants.BRANCH_AND_BOUND_EXPECTED_SPEEDUP * workers) <= budget:
+		return "parallel_branch_and_bound"
+	return "heuristic"
+
+# -- Engines --
+# Each engine evaluates sequences for scheduler.target_max and returns the valid ones; engines
+# other than exhaustive and heuristic return only those tied for the best rank key, rebuilt from
+# compact event orders. Exact engines return sequences in itertools.permutations order so tied
+# results are stable.
+
+def run_exhaustive(scheduler, peeps, events):
+	"""Evaluate every permutation in a single process."""
+	if scheduler.kernel == 'array':
+		return run_kernel_exhaustive(scheduler, peeps, events)
+	return scheduler.evaluate_all_event_sequences(peeps, events)
+
+def run_kernel_exhaustive(scheduler, peeps, events):
+	"""
+	Score every permutation with the array evaluation kernel and rebuild only the best-ranked
+	orders as sequences, in permutation order. Resumes and checkpoints like the object path.
+	"""
+	start_index = scheduler.checkpoint.resume_index(scheduler.target_max) if scheduler.checkpoint else 0
+	if start_index is None:
+		logging.debug(f"target_max={scheduler.target_max} already completed in checkpoint; skipping")
+		return []
+	if start_index:
+		logging.info(f"Resuming target_max={scheduler.target_max} at permutation {start_index}")
+
+	evaluator = kernel.EvaluationKernel(peeps, events, scheduler.partnership_requests)
+	best_key, best_perms = None, []
+	start_time = time.perf_counter()
+	for index, perm in enumerate(utils.permutation_range([event.id for event in events], start_index), start_index):
+		if not dominance.respects_precedence(perm, scheduler.event_precedence):
+			result = None
+		else:
+			result = evaluator.score(perm, scheduler.target_max, seating=False)
+			if result.valid_events:
+				key = scheduler.rank_key(result)
+				if best_key is None or key < best_key:
+					best_key, best_perms = key, [perm]
+				elif key == best_key:
+					best_perms.append(perm)
+		if scheduler.checkpoint is not None:
+			scheduler.checkpoint.observe(scheduler, index, perm, result)
+
+	event_map = {event.id: event for event in events}
+	sequences = [evaluate_permutation(scheduler, peeps, event_map, perm) for perm in best_perms]
+	logging.debug(
+		f"Kernel evaluation complete ({'compiled' if evaluator.jit else 'interpreted'}): "
+		f"{len(sequences)} best-ranked sequences kept. Elapsed time: {time.perf_counter() - start_time:.2f}s"
+	)
+	return sequences
+
+def run_batched(scheduler, peeps, events):
+	"""
+	Evaluate permutations in batches of lanes with NumPy (see lanes.evaluate_batch) and rebuild
+	only the best-ranked orders as sequences, in permutation order. Without NumPy this falls
+	back to the exhaustive engine.
+	"""
+	if not lanes.numpy_available():
+		logging.warning("NumPy is not installed; the batched engine falls back to exhaustive")
+		return run_exhaustive(scheduler, peeps, events)
+	if scheduler.assignment != 'greedy':
+		raise ValueError("the batched engine supports only greedy assignment")
+
+	problem = lanes.LaneProblem(peeps, events)
+	partnerships = None
+	if scheduler.partnership_requests:
+		partnerships = EventSequence.split_partnership_requests(scheduler.partnership_requests)
+	perms = (
+		perm for perm in itertools.permutations([event.id for event in events])
+		if dominance.respects_precedence(perm, scheduler.event_precedence)
+	)
+
+	best_key, best_perms = None, []
+	num_batches = 0
+	start_time = time.perf_counter()
+	while True:
+		batch = list(itertools.islice(perms, constants.BATCH_LANES))
+		if not batch:
+			break
+		num_batches += 1
+		num_unique, priority_fulfilled, utilization, valid, seats = lanes.evaluate_batch(problem, problem.orders(batch), scheduler.target_max)
+		leading = [
+			(-unique, -priority) if has_valid else None
+			for unique, priority, has_valid in zip(num_unique.tolist(), priority_fulfilled.tolist(), valid.any(axis=1).tolist(), strict=True)
+		]
+		if all(key is None for key in leading):
+			continue
+
+		# Only lanes tied on the leading metrics can reach the batch's best rank key
+		best_leading = min(key for key in leading if key is not None)
+		for b, perm in enumerate(batch):
+			if leading[b] != best_leading:
+				continue
+			metrics = (num_unique[b], priority_fulfilled[b], utilization[b])
+			result = kernel.make_result(perm, valid[b], seats[b].ravel(), problem.peep_ids, metrics, partnerships, seating=False)
+			key = scheduler.rank_key(result)
+			if best_key is None or key < best_key:
+				best_key, best_perms = key, [perm]
+			elif key == best_key:
+				best_perms.append(perm)
+
+	event_map = {event.id: event for event in events}
+	sequences = [evaluate_permutation(scheduler, peeps, event_map, perm) for perm in best_perms]
+	logging.debug(
+		f"Batched evaluation complete: {num_batches} batches of up to {constants.BATCH_LANES} lanes, "
+		f"{len(sequences)} best-ranked sequences kept. Elapsed time: {time.perf_counter() - start_time:.2f}s"
+	)
+	return sequences
+
+def run_heuristic(scheduler, peeps, events):
+	"""Evaluate promising permutations first until this target's share of the time limit runs out."""
+	time_limit = scheduler.time_limit if scheduler.time_limit is not None else scheduler.budget
+	if time_limit is None:
+		return run_exhaustive(scheduler, peeps, events)
+	return scheduler.evaluate_all_event_sequences(peeps, events, time_limit=time_limit / len(TARGET_MAXES))
+
+def free_threading_active():
+	"""Whether this is a free-threaded CPython build running with the GIL disabled."""
+	is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+	return is_gil_enabled is not None and not is_gil_enabled()
+
+def evaluate_subtree(scheduler, arrays, first_event_id):
+	"""
+	Evaluate every permutation that starts with first_event_id, on fresh objects built from arrays.
+
+	Returns:
+		TieSet: the subtree's orders tied for its best rank key
+	"""
+	rest_ids = [event_id for event_id in arrays.event_columns["id"] if event_id != first_event_id]
+
+	ties = TieSet()
+	for rest in itertools.permutations(rest_ids):
+		perm = (first_event_id,) + rest
+		if not dominance.respects_precedence(perm, scheduler.event_precedence):
+			continue
+		# Fresh objects built from the arrays stand in for deep copies of the roster
+		sequence = EventSequence(arrays.make_events(perm), arrays.make_peeps())
+		scheduler.evaluate_sequence(sequence)
+		if sequence.valid_events:
+			ties.add(scheduler.rank_key(sequence), perm)
+	return ties
+
+_worker_state = {}
+
+def _init_parallel_worker(scheduler, block_name):
+	"""Attach once per worker process to the shared problem arrays."""
+	block, arrays = problem_arrays.attach(block_name)
+	_worker_state["scheduler"] = scheduler
+	_worker_state["block"] = block
+	_worker_state["arrays"] = arrays
+
+def _evaluate_subtree(first_event_id):
+	"""Process pool entry point for evaluate_subtree."""
+	return evaluate_subtree(_worker_state["scheduler"], _worker_state["arrays"], first_event_id)
+
+def run_parallel(scheduler, peeps, events):
+	"""
+	Evaluate every permutation, splitting subtrees by first event across workers, and rebuild
+	only the best-ranked orders as sequences, in permutation order.
+
+	Each worker sends back its subtree's tie set of event orders rather than sequences. On a
+	free-threaded build the workers are threads that read the problem arrays directly. Otherwise
+	they are processes: the arrays are placed in shared memory once and workers attach to them
+	instead of each receiving a pickled copy.
+	"""
+	if len(events) < 2:
+		return run_exhaustive(scheduler, peeps, events)
+
+	workers = min(scheduler.workers or os.cpu_count() or 1, len(events))
+	first_event_ids = [event.id for event in events]
+	arrays = problem_arrays.ProblemArrays.from_models(peeps, events)
+	start_time = time.perf_counter()
+
+	# map preserves submission order, so results match itertools.permutations order
+	if free_threading_active():
+		backend = "threads"
+		with ThreadPoolExecutor(max_workers=workers) as executor:
+			subtrees = list(executor.map(lambda first_event_id: evaluate_subtree(scheduler, arrays, first_event_id), first_event_ids))
+	else:
+		backend = "processes"
+		block = problem_arrays.share(arrays)
+		try:
+			with ProcessPoolExecutor(max_workers=workers, initializer=_init_parallel_worker,
+									 initargs=(scheduler, block.name)) as executor:
+				subtrees = list(executor.map(_evaluate_subtree, first_event_ids))
+		finally:
+			block.close()
+			block.unlink()
+	logging.debug(f"Parallel evaluation on {workers} {backend} complete. Elapsed time: {time.perf_counter() - start_time:.2f}s")
+
+	ties = TieSet()
+	for subtree in subtrees:
+		for perm in subtree.perms:
+			ties.add(subtree.best_key, perm)
+	return ties.rebuild(scheduler, peeps, events)
+
+def unique_attendee_upper_bound(scheduler, state, remaining_events):
+	"""
+	Upper bound on num_unique_attendees for any completion of a partially evaluated sequence.
+
+	Attendance is permanent once an event is valid, so the bound is the peeps already scheduled
+	plus unscheduled peeps who could still attend a remaining event, capped by remaining seats.
+	"""
+	remaining_ids = {event.id for event in remaining_events}
+	scheduled = 0
+	reachable = 0
+	for peep in state.peeps:
+		if peep.num_events > 0:
+			scheduled += 1
+		elif peep.event_limit > 0 and remaining_ids.intersection(peep.availability):
+			reachable += 1
+
+	seats = sum(2 * min(event.max_role, scheduler.target_max or event.max_role) for event in remaining_events)
+	return scheduled + min(reachable, seats)
+
+def run_branch_and_bound(scheduler, peeps, events):
+	"""
+	Depth-first search over event prefixes, pruning prefixes that cannot reach the best unique attendee count.
+
+	Pruning is strict (bound < incumbent), so every sequence that could tie for the top is still found.
+	Only the event orders tied for the best rank key are kept, and rebuilt as sequences at the end.
+	"""
+	ties = TieSet()
+	incumbent = {"unique": -1, "pruned": 0}
+	start_time = time.perf_counter()
+
+	def explore(state, remaining):
+		if not remaining:
+			scheduler.finalize_sequence(state)
+			if state.valid_events:
+				ties.add(scheduler.rank_key(state), tuple(event.id for event in state.events))
+				incumbent["unique"] = max(incumbent["unique"], state.num_unique_attendees)
+			return
+
+		if unique_attendee_upper_bound(scheduler, state, remaining) < incumbent["unique"]:
+			incumbent["pruned"] += 1
+			return
+
+		waiting = {event.id for event in remaining}
+		for i, event in enumerate(remaining):
+			if scheduler.event_precedence.get(event.id) in waiting:
+				continue  # dominated events wait for their dominator
+			# The last child can take over the parent's state instead of copying it
+			child = state if i == len(remaining) - 1 else copy.deepcopy(state)
+			child_event = copy.deepcopy(event)
+			child.events.append(child_event)
+			scheduler.evaluate_event(child, child_event)
+			explore(child, remaining[:i] + remaining[i + 1:])
+
+	if events:
+		explore(EventSequence([], copy.deepcopy(peeps)), list(events))
+
+	logging.debug(
+		f"Branch and bound complete: {len(ties.perms)} best-ranked sequences kept, {incumbent['pruned']} prefixes pruned. "
+		f"Elapsed time: {time.perf_counter() - start_time:.2f}s"
+	)
+	return ties.rebuild(scheduler, peeps, events)
+
+# -- Work-stealing branch and bound --
+# Workers pull event prefixes from a shared queue and search them depth first with the same
+# pruning as run_branch_and_bound. While any worker sits idle, a busy worker hands the
+# unexplored siblings of its current node back to the queue, so an expensive subtree is split
+# up instead of leaving the other cores idle. The best unique attendee count found so far is
+# shared, so a sequence found by one worker tightens pruning in all of them.
+
+def _run_stealing_worker(scheduler, block_name, tasks, results, incumbent, outstanding, idle):
+	"""Search prefixes from tasks until none are outstanding, then report the local tie set."""
+	block, arrays = problem_arrays.attach(block_name)
+	event_ids = list(arrays.event_columns["id"])
+	position = {event_id: i for i, event_id in enumerate(event_ids)}
+	local = {"best_key": None, "records": [], "pruned": 0, "donated": 0}
+
+	def record(state):
+		key = scheduler.rank_key(state)
+		perm = [event.id for event in state.events]
+		entry = (tuple(position[event_id] for event_id in perm), perm, key)
+		if local["best_key"] is None or key < local["best_key"]:
+			local["best_key"] = key
+			local["records"] = [entry]
+		elif key == local["best_key"]:
+			local["records"].append(entry)
+
+		if state.num_unique_attendees > incumbent.value:
+			with incumbent.get_lock():
+				incumbent.value = max(incumbent.value, state.num_unique_attendees)
+
+	def explore(state, remaining):
+		if not remaining:
+			scheduler.finalize_sequence(state)
+			if state.valid_events:
+				record(state)
+			return
+
+		if unique_attendee_upper_bound(scheduler, state, remaining) < incumbent.value:
+			local["pruned"] += 1
+			return
+
+		waiting = {event.id for event in remaining}
+		children = [event for event in remaining if scheduler.event_precedence.get(event.id) not in waiting]
+		i = 0
+		while i < len(children):
+			# Donate the siblings still to be explored while someone is idle and the subtree is worth splitting
+			if i < len(children) - 1 and len(remaining) > 2 and idle.value > 0:
+				prefix = tuple(event.id for event in state.events)
+				donated = children[i + 1:]
+				with outstanding.get_lock():
+					outstanding.value += len(donated)
+				for sibling in donated:
+					tasks.put(prefix + (sibling.id,))
+				local["donated"] += len(donated)
+				children = children[:i + 1]
+
+			event = children[i]
+			# The last child can take over the parent's state instead of copying it
+			child = state if i == len(children) - 1 else copy.deepcopy(state)
+			child_event = arrays.make_events([event.id])[0]
+			child.events.append(child_event)
+			scheduler.evaluate_event(child, child_event)
+			explore(child, [other for other in remaining if other.id != event.id])
+			i += 1
+
+	while True:
+		try:
+			prefix = tasks.get(timeout=0.05)
+		except queue.Empty:
+			if outstanding.value == 0:
+				break
+			continue
+
+		with idle.get_lock():
+			idle.value -= 1
+		state = EventSequence([], arrays.make_peeps())
+		for event in arrays.make_events(prefix):
+			state.events.append(event)
+			scheduler.evaluate_event(state, event)
+		explore(state, arrays.make_events([event_id for event_id in event_ids if event_id not in prefix]))
+		with idle.get_lock():
+			idle.value += 1
+		with outstanding.get_lock():
+			outstanding.value -= 1
+
+	arrays.release()
+	block.close()
+	results.put((local["records"], local["pruned"], local["donated"]))
+
+def run_parallel_branch_and_bound(scheduler, peeps, events):
+	"""
+	Branch and bound across worker processes with work stealing and a shared incumbent.
+
+	Returns the tie set for the best key found, in itertools.permutations order.
+	"""
+	workers = scheduler.workers or os.cpu_count() or 1
+	if workers < 2 or len(events) < 3:
+		return run_branch_and_bound(scheduler, peeps, events)
+
+	start_time = time.perf_counter()
+	tasks = multiprocessing.Queue()
+	results = multiprocessing.Queue()
+	incumbent = multiprocessing.Value("q", -1)
+	outstanding = multiprocessing.Value("q", 0)
+	idle = multiprocessing.Value("q", workers)
+
+	event_ids = [event.id for event in events]
+	roots = [(event_id,) for event_id in event_ids if scheduler.event_precedence.get(event_id) not in event_ids]
+	outstanding.value = len(roots)
+	for root in roots:
+		tasks.put(root)
+
+	block = problem_arrays.share(problem_arrays.ProblemArrays.from_models(peeps, events))
+	processes = [
+		multiprocessing.Process(target=_run_stealing_worker, args=(scheduler, block.name, tasks, results, incumbent, outstanding, idle))
+		for _ in range(workers)
+	]
+	try:
+		for process in processes:
+			process.start()
+
+		reports = []
+		while len(reports) < workers:
+			try:
+				reports.append(results.get(timeout=0.5))
+			except queue.Empty:
+				if any(process.exitcode not in (None, 0) for process in processes):
+					raise RuntimeError("a search worker exited unexpectedly")
+		for process in processes:
+			process.join()
+	finally:
+		for process in processes:
+			if process.is_alive():
+				process.terminate()
+		block.close()
+		block.unlink()
+
+	records = [entry for entry_records, _, _ in reports for entry in entry_records]
+	pruned = sum(report[1] for report in reports)
+	donated = sum(report[2] for report in reports)
+	logging.debug(
+		f"Work-stealing branch and bound on {workers} workers complete: {pruned} prefixes pruned, {donated} subtrees donated. "
+		f"Elapsed time: {time.perf_counter() - start_time:.2f}s"
+	)
+	if not records:
+		return []
+
+	best_key = min(key for _, _, key in records)
+	event_map = {event.id: event for event in events}
+	winners = sorted(entry for entry in records if entry[2] == best_key)
+	return [evaluate_permutation(scheduler, peeps, event_map, tuple(perm)) for _, perm, _ in winners]
+
+def run_distributed(scheduler, peeps, events):
+	"""
+	Evaluate scheduler.target_max on the workers connected to scheduler.coordinator (see
+	peeps_scheduler.distributed) and rebuild the winning sequences from their compact records.
+	"""
+	num_permutations = math.factorial(len(events)) if events else 0
+	if not num_permutations:
+		return []
+
+	records = scheduler.coordinator.search_target(scheduler.target_max, num_permutations)
+	event_map = {event.id: event for event in events}
+	return [evaluate_permutation(scheduler, peeps, event_map, tuple(perm)) for _, perm, _ in records]
+
+ENGINES = {
+	"exhaustive": run_exhaustive,
+	"parallel": run_parallel,
+	"branch_and_bound": run_branch_and_bound,
+	"parallel_branch_and_bound": run_parallel_branch_and_bound,
+	"heuristic": run_heuristic,
+	"distributed": run_distributed,
+	"batched": run_batched,
+}
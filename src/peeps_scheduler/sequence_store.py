@@ -0,0 +1,103 @@
+"""
+Memory-bounded store for the sequences found by a search.
+
+Keeping every valid EventSequence, each with deep copies of the roster and events, does
+not scale to large months. The store keeps one compact record per sequence instead: its
+rank key, discovery order, target_max and event order. Past a cap the in-memory records
+are sorted and spilled to a temporary file as a run; the final ranking merges the runs,
+and only the sequences tied for the top are rebuilt by re-evaluating their event orders.
+"""
+
+import contextlib
+import heapq
+import json
+import logging
+import tempfile
+
+from peeps_scheduler import constants, search
+
+
+class SequenceStore:
+	"""Compact records of found sequences, spilled to sorted runs on disk past cap records."""
+
+	def __init__(self, cap=constants.SEQUENCE_STORE_CAP):
+		if cap is not None and cap < 1:
+			raise ValueError(f"sequence store cap must be at least 1: {cap}")
+		self.cap = cap  # records kept in memory before spilling; None never spills
+		self.records = []  # (rank key, discovery index, target_max, event ids)
+		self.runs = []  # spilled temporary files, each sorted by (rank key, discovery index)
+		self.count = 0
+
+	def __len__(self):
+		return self.count
+
+	def add(self, rank_key, target_max, perm):
+		"""Record one sequence by its rank key and the target_max and event order that rebuild it."""
+		self.records.append((tuple(rank_key), self.count, target_max, list(perm)))
+		self.count += 1
+		if self.cap is not None and len(self.records) >= self.cap:
+			self.spill()
+
+	def add_sequence(self, scheduler, sequence, target_max=None):
+		"""Record an evaluated sequence found for target_max (default: the scheduler's current one)."""
+		target_max = scheduler.target_max if target_max is None else target_max
+		self.add(scheduler.rank_key(sequence), target_max, [event.id for event in sequence.events])
+
+	def spill(self):
+		"""Write the in-memory records to disk as one sorted run."""
+		if not self.records:
+			return
+		self.records.sort()
+		with contextlib.ExitStack() as stack:
+			run = stack.enter_context(tempfile.TemporaryFile(mode="w+", encoding="utf-8", prefix="peeps-sequences-"))
+			for record in self.records:
+				run.write(json.dumps(record) + "\n")
+			run.flush()
+			# Written: keep the run open (closing deletes it) until close()
+			stack.pop_all()
+		self.runs.append(run)
+		logging.debug(f"Spilled {len(self.records)} sequence records to disk (run {len(self.runs)})")
+		self.records = []
+
+	def _read_run(self, run):
+		run.seek(0)
+		for line in run:
+			rank_key, index, target_max, perm = json.loads(line)
+			yield tuple(rank_key), index, target_max, perm
+
+	def ranked(self):
+		"""Yield every record best first, merging the spilled runs with the in-memory records."""
+		self.records.sort()
+		return heapq.merge(self.records, *(self._read_run(run) for run in self.runs))
+
+	def top_records(self):
+		"""Records tied for the best rank key, in discovery order."""
+		top = []
+		for record in self.ranked():
+			if top and record[0] != top[0][0]:
+				break
+			top.append(record)
+		return top
+
+	def top_sequences(self, scheduler, peeps, events):
+		"""
+		Rebuild the sequences tied for the top by re-evaluating their event orders.
+
+		Returns:
+			list: EventSequences in discovery order, ready for Scheduler.get_top_sequences
+		"""
+		event_map = {event.id: event for event in events}
+		saved_target_max = scheduler.target_max
+		sequences = []
+		for _, _, target_max, perm in self.top_records():
+			scheduler.target_max = target_max
+			sequences.append(search.evaluate_permutation(scheduler, peeps, event_map, perm))
+		scheduler.target_max = saved_target_max
+		return sequences
+
+	def close(self):
+		"""Delete the spilled runs."""
+		for run in self.runs:
+			run.close()
+		self.runs = []
+		self.records = []
@@ -0,0 +1,127 @@
+"""
+Binary snapshot of a period's output.json for fast reloads.
+
+file_io.load_data_from_json decodes the whole pretty-printed JSON, builds and validates
+every Peep and Event, and checks the roster order. The snapshot stores the loaded roster
+as ProblemArrays (peep and event columns, availability lists and bitmatrix, and the text
+block) behind a small header holding the size, mtime and SHA-256 of the output.json it was
+built from. It is read through mmap without copying the arrays. When output.json still has
+the recorded size and mtime the snapshot is used without reading output.json at all; only
+otherwise is the file hashed, and a snapshot whose digest does not match is ignored and
+rewritten (a matching digest just refreshes the recorded size and mtime).
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+from array import array
+from pathlib import Path
+
+from peeps_scheduler import file_io
+from peeps_scheduler.problem_arrays import ProblemArrays
+
+SNAPSHOT_VERSION = 2
+STAT_OFFSET = 8
+DIGEST_OFFSET = STAT_OFFSET + 16
+HEADER_SIZE = DIGEST_OFFSET + 32  # int64 version, int64 size and mtime_ns of output.json, its SHA-256
+
+def snapshot_path(output_json_path):
+	"""The snapshot kept next to output_json_path (output.json -> output.snapshot)."""
+	return Path(output_json_path).with_suffix(".snapshot")
+
+def file_sha256(path):
+	with open(path, "rb") as f:
+		return hashlib.sha256(f.read()).digest()
+
+def file_stat(path):
+	"""The (size, mtime_ns) of path, which stand in for its digest while they are unchanged."""
+	st = os.stat(path)
+	return st.st_size, st.st_mtime_ns
+
+def write_snapshot(path, digest, peeps, events, stat=(0, 0)):
+	"""Atomically write peeps and events loaded from an output.json with the given digest and stat."""
+	path = Path(path)
+	header = array("q", [SNAPSHOT_VERSION, *stat]).tobytes() + digest
+	data = header + ProblemArrays.from_models(peeps, events).to_bytes()
+	tmp_path = path.with_suffix(".tmp")
+	with open(tmp_path, "wb") as f:
+		f.write(data)
+	os.replace(tmp_path, path)
+
+def read_snapshot(path, digest, stat=None):
+	"""
+	Read peeps and events from a snapshot if it was built from an output.json with this digest.
+
+	Args:
+		digest: SHA-256 of output.json, or a callable returning it; only called when stat is
+			None or does not match the stat recorded in the snapshot
+		stat: (size, mtime_ns) of output.json, or None to always compare digests
+
+	Returns:
+		tuple: (peeps, events), or None if the snapshot is missing, stale or unreadable
+	"""
+	try:
+		with open(path, "rb") as f:
+			loaded, stat_changed = _read_mapped(f, path, digest, stat)
+	except FileNotFoundError:
+		return None
+	if loaded is not None and stat_changed:
+		_refresh_stat(path, stat)
+	return loaded
+
+def _read_mapped(f, path, digest, stat):
+	"""Returns (peeps, events) or None, and whether the recorded stat differs from stat."""
+	if os.fstat(f.fileno()).st_size < HEADER_SIZE:
+		return None, False
+	with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+		view = memoryview(mapped)
+		arrays = None
+		try:
+			version = view[:STAT_OFFSET].cast("q")[0]
+			if version != SNAPSHOT_VERSION:
+				return None, False
+			stat_changed = stat is not None and tuple(view[STAT_OFFSET:DIGEST_OFFSET].cast("q")) != tuple(stat)
+			if stat is None or stat_changed:
+				if callable(digest):
+					digest = digest()
+				if view[DIGEST_OFFSET:HEADER_SIZE] != digest:
+					return None, False
+			arrays = ProblemArrays.from_buffer(view[HEADER_SIZE:])
+			return (arrays.make_peeps(), arrays.make_events()), stat_changed
+		except (ValueError, TypeError, IndexError) as e:
+			logging.warning(f"Ignoring unreadable snapshot {path}: {e}")
+			return None, False
+		finally:
+			if arrays is not None:
+				arrays.release()
+			view.release()
+
+def _refresh_stat(path, stat):
+	"""Record a new stat for an output.json whose contents are unchanged (e.g. it was touched)."""
+	try:
+		with open(path, "r+b") as f:
+			f.seek(STAT_OFFSET)
+			f.write(array("q", stat).tobytes())
+	except OSError as e:
+		logging.warning(f"Could not update snapshot {path}: {e}")
+
+def load_data(output_json_path):
+	"""
+	Load peeps and events like file_io.load_data_from_json, from the snapshot when it matches
+	output.json; otherwise load the JSON and write a fresh snapshot for the next run.
+	"""
+	stat = file_stat(output_json_path)
+	path = snapshot_path(output_json_path)
+	loaded = read_snapshot(path, lambda: file_sha256(output_json_path), stat)
+	if loaded is not None:
+		logging.debug(f"Loaded peeps and events from snapshot {path}")
+		return loaded
+
+	digest = file_sha256(output_json_path)
+	peeps, events = file_io.load_data_from_json(output_json_path)
+	try:
+		write_snapshot(path, digest, peeps, events, stat)
+	except OSError as e:
+		logging.warning(f"Could not write snapshot {path}: {e}")
+	return peeps, events
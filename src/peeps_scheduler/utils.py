@@ -3,8 +3,9 @@ import json
 import logging
 import datetime
 import itertools
+import math
 from peeps_scheduler.constants import DATE_FORMAT, DATESTR_FORMAT
-from peeps_scheduler.file_io import load_csv, save_json, normalize_email
+from peeps_scheduler.file_io import iter_csv, save_json, normalize_email
 from peeps_scheduler.models import EventSequence, Peep, Event, Role, SwitchPreference
 
 def generate_event_permutations(events):
@@ -18,6 +19,75 @@ def generate_event_permutations(events):
 	logging.debug(f"Total permutations: {len(index_sequences)}")
 	return index_sequences
 
+def nth_permutation(items, index):
+	"""Return the permutation at a position of itertools.permutations(items), without generating the ones before it."""
+	pool = list(items)
+	result = []
+	for remaining in range(len(pool), 0, -1):
+		position, index = divmod(index, math.factorial(remaining - 1))
+		result.append(pool.pop(position))
+	return tuple(result)
+
+def permutation_range(items, start=0, stop=None):
+	"""
+	Yield permutations of items at itertools.permutations positions start..stop-1.
+
+	The first permutation is unranked directly and the rest follow by next-permutation steps,
+	so resuming deep into a large search space costs nothing up front.
+	"""
+	items = list(items)
+	if not items:
+		return
+
+	total = math.factorial(len(items))
+	stop = total if stop is None else min(stop, total)
+	if start >= stop:
+		return
+
+	order = list(nth_permutation(range(len(items)), start))
+	for _ in range(start, stop):
+		yield tuple(items[i] for i in order)
+
+		# Advance to the next lexicographic permutation of positions
+		i = len(order) - 2
+		while i >= 0 and order[i] > order[i + 1]:
+			i -= 1
+		if i < 0:
+			return
+		j = len(order) - 1
+		while order[j] < order[i]:
+			j -= 1
+		order[i], order[j] = order[j], order[i]
+		order[i + 1:] = reversed(order[i + 1:])
+
+def availability_bitmasks(events, peeps):
+	"""
+	Availability matrix of events x peeps, one int bitmask per event.
+
+	Returns:
+		list: bit i of masks[e] is set if peeps[i] is available for events[e]
+	"""
+	event_index = {event.id: e for e, event in enumerate(events)}
+	masks = [0] * len(events)
+	for i, peep in enumerate(peeps):
+		for event_id in set(peep.availability):
+			if event_id in event_index:
+				masks[event_index[event_id]] |= 1 << i
+	return masks
+
+def co_availability_matrix(masks):
+	"""
+	Number of peeps available for both events, for every pair of events (A^T A of the availability matrix).
+
+	Returns:
+		list: symmetric matrix where matrix[a][b] counts peeps available for events a and b
+	"""
+	matrix = [[0] * len(masks) for _ in masks]
+	for a, mask_a in enumerate(masks):
+		for b in range(a, len(masks)):
+			matrix[a][b] = matrix[b][a] = (mask_a & masks[b]).bit_count()
+	return matrix
+
 def setup_logging(verbose=False):
 	stream_log_level = logging.DEBUG if verbose else logging.INFO
 	
@@ -39,9 +109,8 @@ def apply_event_results( result_json, members_csv, responses_csv):
 	from peeps_scheduler.models import Peep, Event
 	import os
 
-	peep_rows = load_csv(members_csv)
 	fresh_peeps = []
-	for row in peep_rows:
+	for row in iter_csv(members_csv):
 		peep = Peep(
 			id=row['id'],
 			full_name=row['Name'],
@@ -62,8 +131,7 @@ def apply_event_results( result_json, members_csv, responses_csv):
 	# Process responses to mark who responded
 	responded_emails = set()
 	if responses_csv and os.path.exists(responses_csv):
-		response_rows = load_csv(responses_csv)
-		for row in response_rows:
+		for row in iter_csv(responses_csv):
 			email = normalize_email(row.get('Email Address', ''))
 			if email:  # Only add non-empty emails
 				responded_emails.add(email)
@@ -73,16 +141,15 @@ def apply_event_results( result_json, members_csv, responses_csv):
 
 	# Set responded flag based on email match
 	for peep in fresh_peeps:
-		if peep.email and normalize_email(peep.email) in responded_emails:
-			peep.responded = True
+		peep.responded = normalize_email(peep.email) in responded_emails
+		if peep.responded:
 			logging.debug(f"Marked peep {peep.id} ({peep.email}) as responded")
-		else:
-			peep.responded = False
 
 	with open(result_json, "r") as f:
 		result_data = json.load(f)
 
 	event_data = result_data['valid_events']
+	peeps_by_id = {peep.id: peep for peep in fresh_peeps}
 	events = []
 	for e in event_data:
 		event = Event(
@@ -93,10 +160,9 @@ def apply_event_results( result_json, members_csv, responses_csv):
 			max_role=0
 		)
 		for peep_info in e['attendees']:
-			for peep in fresh_peeps:
-				if peep.id == peep_info['id']:
-					role = Role.from_string(peep_info['role'])
-					event.add_attendee(peep, role)
+			peep = peeps_by_id.get(peep_info['id'])
+			if peep:
+				event.add_attendee(peep, Role.from_string(peep_info['role']))
 		events.append(event)
 
 	sequence = EventSequence(events, fresh_peeps)
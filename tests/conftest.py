@@ -1,6 +1,8 @@
 import pytest
 import datetime
+import random
 from peeps_scheduler.models import Peep, Event, Role, SwitchPreference
+from peeps_scheduler.scheduler import Scheduler
 
 
 @pytest.fixture
@@ -37,3 +39,63 @@ def event_factory():
         defaults.update(kwargs)
         return Event(id=id, duration_minutes=duration_minutes, **defaults)
     return _create
+
+
+@pytest.fixture
+def scheduler_factory():
+    """Factory for creating test schedulers with sensible defaults."""
+    def _create(**kwargs):
+        defaults = {
+            'data_folder': 'test',
+            'max_events': 3
+        }
+        defaults.update(kwargs)
+        return Scheduler(**defaults)
+    return _create
+
+
+@pytest.fixture
+def add_pairs(peep_factory):
+    """Append count leaders and count followers available for event_ids to a roster."""
+    def _add(peeps, event_ids, count, start_id, **kwargs):
+        for i in range(count):
+            peeps.append(peep_factory(id=start_id + i, role=Role.LEADER, availability=event_ids, **kwargs))
+            peeps.append(peep_factory(id=start_id + 100 + i, role=Role.FOLLOWER, availability=event_ids, **kwargs))
+    return _add
+
+
+@pytest.fixture
+def scenario_factory(event_factory, peep_factory):
+    """Factory for random events, roster and partnership requests exercising switches, limits, intervals and downgrades."""
+    def _create(seed, num_events=None):
+        rng = random.Random(seed)
+        num_events = num_events or rng.randint(2, 4)
+        base = datetime.datetime(2025, 3, 1, 18, 0)
+        events = [
+            event_factory(
+                id=i + 1,
+                duration_minutes=rng.choice([60, 90, 120]),
+                date=base + datetime.timedelta(days=rng.randint(0, 8), hours=rng.choice([0, 3])),
+            )
+            for i in range(num_events)
+        ]
+        peeps = [
+            peep_factory(
+                id=i + 1,
+                role=rng.choice([Role.LEADER, Role.FOLLOWER]),
+                switch_pref=rng.choice(list(SwitchPreference)),
+                availability=rng.sample(range(1, num_events + 3), rng.randint(0, num_events + 1)),
+                event_limit=rng.randint(0, 3),
+                min_interval_days=rng.choice([0, 0, 1, 3, 7]),
+                priority=rng.randint(0, 4),
+                index=i,
+                responded=rng.random() < 0.9,
+            )
+            for i in range(rng.randint(6, 24))
+        ]
+        requests = {}
+        for _ in range(rng.randint(0, 6)):
+            requester, partner = rng.sample([peep.id for peep in peeps], 2)
+            requests.setdefault(requester, set()).add(partner)
+        return events, peeps, requests
+    return _create
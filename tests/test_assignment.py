@@ -0,0 +1,149 @@
+"""
+Test min-cost-flow role assignment for single events.
+
+Following testing philosophy:
+- Test the fills the greedy pass misses and the preferences the flow must honor
+- Use real Peep/Event objects from the shared factories
+- One concept per test with descriptive names
+"""
+
+import pytest
+
+from peeps_scheduler import assignment
+from peeps_scheduler.models import EventSequence, Role, SwitchPreference
+
+
+def flexible_leader_scenario(peep_factory):
+    """A SWITCH_IF_PRIMARY_FULL leader first in line, 4 primary-only leaders and 3 followers."""
+    flexible = peep_factory(id=1, role=Role.LEADER, switch_pref=SwitchPreference.SWITCH_IF_PRIMARY_FULL, event_limit=1)
+    leaders = [peep_factory(id=i + 2, role=Role.LEADER, event_limit=1) for i in range(4)]
+    followers = [peep_factory(id=i + 11, role=Role.FOLLOWER, event_limit=1) for i in range(3)]
+    return flexible, leaders, followers
+
+
+class TestMinCostFlow:
+    """Test the small min-cost flow solver."""
+
+    def test_prefers_cheaper_path(self):
+        """Test that flow goes through the cheaper of two parallel paths first."""
+        network = assignment.MinCostFlow(4)
+        cheap = network.add_edge(0, 1, 1, 1)
+        network.add_edge(1, 3, 1, 0)
+        expensive = network.add_edge(0, 2, 1, 5)
+        network.add_edge(2, 3, 1, 0)
+
+        flow, cost = network.solve(0, 3, 1)
+
+        assert (flow, cost) == (1, 1)
+        assert network.flow_on(cheap) == 1
+        assert network.flow_on(expensive) == 0
+
+    def test_stops_at_max_flow_when_capacity_runs_out(self):
+        """Test that solve reports the flow it could actually push."""
+        network = assignment.MinCostFlow(3)
+        network.add_edge(0, 1, 1, 0)
+        network.add_edge(1, 2, 1, 0)
+
+        flow, _ = network.solve(0, 2, 5)
+
+        assert flow == 1
+
+
+class TestFlowRoleFill:
+    """Test per-event role fills chosen by min-cost flow."""
+
+    def test_flexible_peep_switches_to_let_primary_alternate_in(self, event_factory, peep_factory):
+        """Test the dual-role promotion the greedy pass misses."""
+        event = event_factory(id=1, duration_minutes=90)
+        flexible, leaders, followers = flexible_leader_scenario(peep_factory)
+
+        fill = assignment.assign_event_by_flow(event, [flexible] + leaders + followers, effective_max_role=4)
+
+        assert fill == 4
+        assert flexible in event.followers
+        assert set(event.leaders) == set(leaders)
+
+    def test_primary_role_preferred_when_no_switch_needed(self, event_factory, peep_factory):
+        """Test that a flexible peep stays in their primary role when both roles can fill without them switching."""
+        event = event_factory(id=1, duration_minutes=90)
+        flexible = peep_factory(id=1, role=Role.LEADER, switch_pref=SwitchPreference.SWITCH_IF_PRIMARY_FULL)
+        leaders = [peep_factory(id=i + 2, role=Role.LEADER) for i in range(3)]
+        followers = [peep_factory(id=i + 11, role=Role.FOLLOWER) for i in range(4)]
+
+        assignment.assign_event_by_flow(event, [flexible] + leaders + followers, effective_max_role=4)
+
+        assert flexible in event.leaders
+
+    def test_earlier_line_position_wins_the_slot(self, event_factory, peep_factory):
+        """Test that line order decides who attends when a role is oversubscribed."""
+        event = event_factory(id=1, duration_minutes=90)
+        leaders = [peep_factory(id=i + 1, role=Role.LEADER) for i in range(5)]
+        followers = [peep_factory(id=i + 11, role=Role.FOLLOWER) for i in range(4)]
+
+        assignment.assign_event_by_flow(event, leaders + followers, effective_max_role=4)
+
+        assert list(event.leaders) == leaders[:4]
+        assert list(event.alt_leaders) == [leaders[4]]
+
+    def test_switch_if_needed_not_used_when_event_fills_without_it(self, event_factory, peep_factory):
+        """Test that SWITCH_IF_NEEDED peeps keep their primary role if the minimum is already reachable."""
+        event = event_factory(id=1, duration_minutes=90)
+        switcher = peep_factory(id=1, role=Role.LEADER, switch_pref=SwitchPreference.SWITCH_IF_NEEDED)
+        leaders = [peep_factory(id=i + 2, role=Role.LEADER) for i in range(4)]
+        followers = [peep_factory(id=i + 11, role=Role.FOLLOWER) for i in range(4)]
+
+        assignment.assign_event_by_flow(event, [switcher] + leaders + followers, effective_max_role=5)
+
+        assert switcher not in event.followers
+        assert event.num_attendees(Role.FOLLOWER) == 4
+
+    def test_switch_if_needed_used_to_reach_minimum(self, event_factory, peep_factory):
+        """Test that SWITCH_IF_NEEDED peeps switch when the event cannot meet its minimum otherwise."""
+        event = event_factory(id=1, duration_minutes=90)
+        switcher = peep_factory(id=1, role=Role.LEADER, switch_pref=SwitchPreference.SWITCH_IF_NEEDED)
+        leaders = [peep_factory(id=i + 2, role=Role.LEADER) for i in range(4)]
+        followers = [peep_factory(id=i + 11, role=Role.FOLLOWER) for i in range(3)]
+
+        fill = assignment.assign_event_by_flow(event, [switcher] + leaders + followers, effective_max_role=5)
+
+        assert fill == 4
+        assert switcher in event.followers
+
+    def test_unfillable_event_gets_only_alternates(self, event_factory, peep_factory):
+        """Test that an event below the absolute minimum assigns nobody."""
+        event = event_factory(id=1, duration_minutes=90)
+        leaders = [peep_factory(id=i + 1, role=Role.LEADER) for i in range(4)]
+        followers = [peep_factory(id=i + 11, role=Role.FOLLOWER) for i in range(2)]
+
+        fill = assignment.assign_event_by_flow(event, leaders + followers, effective_max_role=5)
+
+        assert fill == 2
+        assert not event.meets_absolute_min()
+
+
+class TestSchedulerFlowAssignment:
+    """Test the scheduler's flow assignment strategy end to end."""
+
+    def test_flow_strategy_fills_event_greedy_misses(self, event_factory, peep_factory, scheduler_factory):
+        """Test that the same inputs give an invalid event under greedy and a valid one under flow."""
+        flexible, leaders, followers = flexible_leader_scenario(peep_factory)
+
+        greedy = scheduler_factory()
+        greedy.target_max = 4
+        greedy_sequence = EventSequence([event_factory(id=1, duration_minutes=90)], [flexible] + leaders + followers)
+        greedy.evaluate_sequence(greedy_sequence)
+
+        flexible, leaders, followers = flexible_leader_scenario(peep_factory)
+        flow = scheduler_factory(assignment='flow')
+        flow.target_max = 4
+        flow_sequence = EventSequence([event_factory(id=1, duration_minutes=90)], [flexible] + leaders + followers)
+        flow.evaluate_sequence(flow_sequence)
+
+        assert greedy_sequence.valid_events == []
+        assert len(flow_sequence.valid_events) == 1
+        assert flow_sequence.num_unique_attendees == 8
+
+    def test_unknown_assignment_strategy_raises(self, scheduler_factory):
+        """Test that a misspelled strategy fails fast."""
+        with pytest.raises(ValueError, match="unknown assignment strategy"):
+            scheduler_factory(assignment='hungarian')
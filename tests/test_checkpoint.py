@@ -0,0 +1,205 @@
+"""
+Test checkpoint and resume of interrupted schedule searches.
+
+Following testing philosophy:
+- Test the real interrupt/resume workflow against an uninterrupted run
+- Use the sanitized golden master inputs in a year-named period folder
+- One concept per test with descriptive names
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from peeps_scheduler import constants, file_io
+from peeps_scheduler.checkpoint import SearchCheckpoint, compute_input_fingerprint
+
+GOLDEN_MASTER_DIR = Path(__file__).parent / "golden_master_2025_09_sanitized"
+
+
+@pytest.fixture
+def period_path(tmp_path):
+    """Period folder holding the golden master CSVs, already converted to output.json."""
+    path = tmp_path / "2025-09"
+    path.mkdir()
+    shutil.copy(GOLDEN_MASTER_DIR / "responses.csv", path / "responses.csv")
+    shutil.copy(GOLDEN_MASTER_DIR / "members.csv", path / "members.csv")
+    shutil.copy(GOLDEN_MASTER_DIR / "output.json", path / "output.json")
+    return path
+
+
+@pytest.fixture
+def checkpoint_scheduler(period_path, scheduler_factory):
+    """Factory for non-interactive exhaustive schedulers that checkpoint after every permutation."""
+    def _create(**kwargs):
+        defaults = {
+            'data_folder': str(period_path),
+            'max_events': 10,
+            'interactive': False,
+            'engine': 'exhaustive',
+            'checkpoint_interval': 0,
+        }
+        defaults.update(kwargs)
+        return scheduler_factory(**defaults)
+    return _create
+
+
+def interrupt_after(scheduler, calls):
+    """Make the scheduler raise KeyboardInterrupt on its nth sequence evaluation."""
+    original = scheduler.evaluate_sequence
+    count = {"calls": 0}
+
+    def evaluate_sequence(sequence, keep_invalid=False):
+        count["calls"] += 1
+        if count["calls"] > calls:
+            raise KeyboardInterrupt
+        return original(sequence, keep_invalid=keep_invalid)
+
+    scheduler.evaluate_sequence = evaluate_sequence
+
+
+class TestCheckpointResume:
+    """Test interrupting and resuming a search."""
+
+    def test_resumed_search_matches_uninterrupted_run(self, period_path, checkpoint_scheduler):
+        """Test that resuming after an interrupt saves the same results as a clean run."""
+        checkpoint_scheduler().run()
+        expected = json.loads((period_path / "results.json").read_text())
+        (period_path / "results.json").unlink()
+
+        interrupted = checkpoint_scheduler()
+        interrupt_after(interrupted, 200)
+        with pytest.raises(KeyboardInterrupt):
+            interrupted.run()
+
+        checkpoint = json.loads((period_path / constants.CHECKPOINT_FILE).read_text())
+        assert checkpoint["target_max"] == constants.ABS_MIN_ROLE + 1
+        assert checkpoint["records"]
+
+        checkpoint_scheduler(resume=True).run()
+
+        assert json.loads((period_path / "results.json").read_text()) == expected
+
+    def test_checkpoint_removed_after_search_completes(self, period_path, checkpoint_scheduler):
+        """Test that a finished search leaves no checkpoint behind."""
+        checkpoint_scheduler().run()
+
+        assert not (period_path / constants.CHECKPOINT_FILE).exists()
+
+    def test_resume_refused_when_partnerships_change(self, period_path, checkpoint_scheduler):
+        """Test that a checkpoint from different inputs cannot be resumed."""
+        interrupted = checkpoint_scheduler()
+        interrupt_after(interrupted, 50)
+        with pytest.raises(KeyboardInterrupt):
+            interrupted.run()
+
+        (period_path / "partnerships.json").write_text(json.dumps({"1": [2]}))
+
+        with pytest.raises(ValueError, match="cannot resume"):
+            checkpoint_scheduler(resume=True).run()
+
+    @pytest.mark.parametrize("setting", [{"preselection": "coverage"}, {"kernel": "array"}, {"dominance": "order"}])
+    def test_resume_refused_when_search_settings_change(self, checkpoint_scheduler, setting):
+        """Test that a checkpoint cannot be resumed with settings that change the searched events or scoring."""
+        interrupted = checkpoint_scheduler()
+        interrupt_after(interrupted, 50)
+        with pytest.raises(KeyboardInterrupt):
+            interrupted.run()
+
+        with pytest.raises(ValueError, match="cannot resume"):
+            checkpoint_scheduler(resume=True, **setting).run()
+
+    def test_resume_requires_exhaustive_engine(self, checkpoint_scheduler):
+        """Test that resuming with a non-checkpointing engine fails fast."""
+        with pytest.raises(ValueError, match="resuming requires the exhaustive engine"):
+            checkpoint_scheduler(resume=True, engine='branch_and_bound').run()
+
+
+class TestInputFingerprint:
+    """Test the input fingerprint used to validate checkpoints."""
+
+    def test_fingerprint_changes_with_file_contents(self, tmp_path):
+        """Test that editing an input changes the fingerprint."""
+        path = tmp_path / "output.json"
+        path.write_text("{}")
+        before = compute_input_fingerprint([path])
+
+        path.write_text('{"peeps": []}')
+
+        assert compute_input_fingerprint([path]) != before
+
+    def test_fingerprint_changes_when_optional_file_appears(self, tmp_path):
+        """Test that creating a previously missing file changes the fingerprint."""
+        path = tmp_path / "cancellations.json"
+        before = compute_input_fingerprint([path])
+
+        path.write_text("{}")
+
+        assert compute_input_fingerprint([path]) != before
+
+    def test_resume_index_skips_completed_targets(self, tmp_path):
+        """Test cursor positions for earlier, current and later targets."""
+        checkpoint = SearchCheckpoint(tmp_path / "cp.json", "abc", [0, 1])
+        checkpoint.target_max = 5
+        checkpoint.next_index = 17
+
+        assert checkpoint.resume_index(4) is None
+        assert checkpoint.resume_index(5) == 17
+        assert checkpoint.resume_index(6) == 0
+
+
+class TestConversionCache:
+    """Test skipping the CSV conversion when the inputs are unchanged."""
+
+    def test_unchanged_inputs_skip_conversion(self, period_path, monkeypatch, checkpoint_scheduler):
+        """Test that a second conversion of the same CSVs reuses output.json."""
+        scheduler = checkpoint_scheduler()
+        assert scheduler.convert_csv_inputs(2025) is True
+        output_before = (period_path / "output.json").read_text()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("convert_to_json should not run")
+
+        monkeypatch.setattr("peeps_scheduler.file_io.convert_to_json", fail)
+
+        assert scheduler.convert_csv_inputs(2025) is False
+        assert (period_path / "output.json").read_text() == output_before
+
+    def test_changed_responses_or_year_reconvert(self, period_path, checkpoint_scheduler):
+        """Test that new response rows or a different year invalidate the cache."""
+        scheduler = checkpoint_scheduler()
+        scheduler.convert_csv_inputs(2025)
+
+        assert scheduler.convert_csv_inputs(2026) is True
+        with open(period_path / "responses.csv", "a") as f:
+            f.write("\n")
+        assert scheduler.convert_csv_inputs(2026) is True
+
+    def test_edited_output_reconverts(self, period_path, checkpoint_scheduler):
+        """Test that a hand-edited or deleted output.json is regenerated."""
+        scheduler = checkpoint_scheduler()
+        scheduler.convert_csv_inputs(2025)
+        expected = json.loads((period_path / "output.json").read_text())
+
+        (period_path / "output.json").write_text("{}")
+        assert scheduler.convert_csv_inputs(2025) is True
+        (period_path / constants.CONVERSION_CACHE_FILE).write_text("not json")
+        assert scheduler.convert_csv_inputs(2025) is True
+        assert json.loads((period_path / "output.json").read_text()) == expected
+
+    def test_incremental_applies_appended_responses(self, period_path, monkeypatch, checkpoint_scheduler):
+        """Test that incremental conversion ingests new rows instead of reconverting everything."""
+        scheduler = checkpoint_scheduler()
+        scheduler.convert_csv_inputs(2025, incremental=True)
+        responses_csv = period_path / "responses.csv"
+        last_row = responses_csv.read_text().splitlines()[-1]
+        with open(responses_csv, "a") as f:
+            f.write(last_row + "\n")
+        monkeypatch.setattr(file_io, "convert_to_json", lambda *args, **kwargs: pytest.fail("full conversion"))
+        assert scheduler.convert_csv_inputs(2025, incremental=True) is True
+        monkeypatch.undo()
+
+        file_io.convert_to_json(str(responses_csv), str(period_path / "members.csv"), str(period_path / "full.json"), year=2025)
+        assert json.loads((period_path / "output.json").read_text()) == json.loads((period_path / "full.json").read_text())
@@ -67,6 +67,17 @@ class TestDataManager:
         with tempfile.TemporaryDirectory() as temp_dir:
             dm = DataManager(submodule_root=temp_dir)
             assert str(dm.submodule_root) == temp_dir
+    
+    def test_database_kept_outside_period_folders(self):
+        """Test that the history database lives in the submodule root and is not listed as a period."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dm = DataManager(submodule_root=temp_dir)
+            dm.ensure_period_exists("2025-09")
+            dm.open_database().close()
+            
+            assert dm.get_database_path() == Path(temp_dir) / "peeps.sqlite3"
+            assert dm.get_database_path().exists()
+            assert dm.list_periods() == ["2025-09"]
 
 
 class TestGlobalDataManager:
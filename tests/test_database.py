@@ -0,0 +1,105 @@
+"""
+Test the SQLite history database.
+
+Following testing philosophy:
+- Test that an imported period loads exactly what its output.json loads
+- Use the sanitized golden master period copied into temporary DataManager folders
+- One concept per test with descriptive names
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from peeps_scheduler import file_io
+from peeps_scheduler.data_manager import DataManager
+
+GOLDEN_MASTER_DIR = Path(__file__).parent / "golden_master_2025_09_sanitized"
+EMAIL = "testperson20@testemail.com"
+
+
+@pytest.fixture
+def data_manager(tmp_path):
+    """DataManager with two copies of the golden master period; the later one also has actual attendance."""
+    dm = DataManager(submodule_root=str(tmp_path))
+    for slug in ("2025-09", "2025-10"):
+        shutil.copytree(GOLDEN_MASTER_DIR, dm.get_period_path(slug))
+    shutil.copy(GOLDEN_MASTER_DIR / "results.json", dm.get_period_path("2025-10") / "actual_attendance.json")
+    return dm
+
+
+def fields(obj):
+    """Every attribute of a peep or event, with enums as their values."""
+    return {name: getattr(value, "value", value) for name, value in vars(obj).items()}
+
+
+class TestPeriodDatabase:
+    """Test importing period folders and loading them back."""
+
+    def test_imported_period_loads_like_output_json(self, data_manager):
+        """Test that load_data equals load_data_from_json field for field."""
+        with data_manager.open_database() as db:
+            assert db.import_periods(data_manager) == ["2025-09", "2025-10"]
+            peeps, events = db.load_data("2025-09")
+
+        expected_peeps, expected_events = file_io.load_data_from_json(data_manager.get_period_path("2025-09") / "output.json")
+        assert data_manager.get_database_path().exists()
+        assert [fields(peep) for peep in peeps] == [fields(peep) for peep in expected_peeps]
+        assert [fields(event) for event in events] == [fields(event) for event in expected_events]
+
+    def test_reimport_replaces_period(self, data_manager):
+        """Test that importing a period again replaces its rows instead of adding to them."""
+        members_csv = data_manager.get_period_path("2025-09") / "members.csv"
+        with data_manager.open_database() as db:
+            db.import_periods(data_manager)
+            members_csv.write_text(members_csv.read_text().replace("P20,testperson20@testemail.com,Leader,29,0,", "P20,testperson20@testemail.com,Leader,29,3,"))
+            db.import_period("2025-09", data_manager.get_period_path("2025-09"))
+            history = db.member_history(EMAIL)
+            assignments = db.connection.execute("SELECT COUNT(*) FROM assignments WHERE period = '2025-09'").fetchone()[0]
+
+        assert [record["priority"] for record in history] == [3, 0]
+        assert assignments == sum(len(e["attendees"]) + len(e["alternates"]) for e in file_io.load_json(GOLDEN_MASTER_DIR / "results.json")["valid_events"])
+
+    def test_failed_import_keeps_previous_period(self, data_manager):
+        """Test that a period whose files cannot be read is rolled back to its earlier import."""
+        with data_manager.open_database() as db:
+            db.import_periods(data_manager)
+            (data_manager.get_period_path("2025-09") / "results.json").write_text(json.dumps({"valid_events": [{"attendees": [{}]}]}))
+
+            with pytest.raises(KeyError):
+                db.import_period("2025-09", data_manager.get_period_path("2025-09"))
+
+            assert [record["scheduled"] for record in db.member_history(EMAIL)] == [2, 2]
+
+    def test_member_history_across_periods(self, data_manager):
+        """Test that a member's priority, responses and assignments are collected per period."""
+        with data_manager.open_database() as db:
+            db.import_periods(data_manager)
+            history = db.member_history(EMAIL.upper())
+            attended = db.attendance_history(EMAIL)
+
+        assert [record["period"] for record in history] == ["2025-09", "2025-10"]
+        assert history[0]["total_attended"] == 9
+        assert history[0]["total_attended_after"] == 11
+        assert history[0]["responded"] is True
+        assert [(record["scheduled"], record["attended"]) for record in history] == [(2, 0), (2, 2)]
+        assert [(record["period"], record["date"], record["alternate"]) for record in attended] == [
+            ("2025-10", "2025-09-12 17:00", False),
+            ("2025-10", "2025-09-13 16:00", True),
+            ("2025-10", "2025-09-26 17:00", False),
+            ("2025-10", "2025-09-27 16:00", True),
+        ]
+
+    def test_history_lookup_uses_email_index(self, data_manager):
+        """Test that member lookups search the email index instead of scanning every period."""
+        with data_manager.open_database() as db:
+            plan = db.connection.execute("EXPLAIN QUERY PLAN SELECT * FROM members WHERE email = ?", (EMAIL,)).fetchall()
+
+        assert any("members_email" in row["detail"] for row in plan)
+
+    def test_unknown_period_raises(self, data_manager):
+        """Test that loading a period that was never imported is refused."""
+        with data_manager.open_database() as db, pytest.raises(ValueError, match="period not in database: 2024-01"):
+            db.load_data("2024-01")
@@ -0,0 +1,204 @@
+"""
+Test the sharded coordinator/worker search.
+
+Following testing philosophy:
+- Run real workers over loopback sockets and compare against the exhaustive engine
+- Use small real scenarios rather than mocks
+- One concept per test with descriptive names
+"""
+
+import json
+import math
+import socket
+import threading
+
+import pytest
+
+from peeps_scheduler import distributed, search
+
+
+def start_thread_worker(coordinator):
+    """Run a worker for the coordinator in a background thread of this process."""
+    thread = threading.Thread(target=distributed.run_worker, args=(coordinator.address, coordinator.token), daemon=True)
+    thread.start()
+    return thread
+
+
+def top_keys(scheduler, sequences):
+    """Keys of the tied top sequences, in ranked order."""
+    return [sequence.__key__() for sequence in scheduler.get_top_sequences(sequences)]
+
+
+class TestDistributedSearch:
+    """Test that sharded searches find the same winners as a single process."""
+
+    @pytest.mark.parametrize("target_max", [4, 5])
+    def test_matches_exhaustive_top_sequences(self, target_max, scheduler_factory, scenario_factory):
+        """Test that merged shard tie sets equal the exhaustive search's top sequences."""
+        events, peeps, _ = scenario_factory(15, num_events=4)
+        scheduler = scheduler_factory(max_events=4)
+        scheduler.target_max = target_max
+        exhaustive = search.run_exhaustive(scheduler, peeps, events)
+
+        coordinator = distributed.Coordinator("127.0.0.1:0", distributed.build_snapshot(scheduler, peeps, events), shard_size=5).start()
+        workers = [start_thread_worker(coordinator) for _ in range(2)]
+        scheduler.coordinator = coordinator
+        try:
+            sharded = search.run_distributed(scheduler, peeps, events)
+        finally:
+            coordinator.close()
+        for worker in workers:
+            worker.join(timeout=5)
+
+        assert top_keys(scheduler, sharded) == top_keys(scheduler, exhaustive)
+
+    def test_unix_socket_address(self, tmp_path, scheduler_factory, scenario_factory):
+        """Test that a filesystem path serves workers over a Unix socket."""
+        if not hasattr(socket, "AF_UNIX"):
+            pytest.skip("unix sockets not supported")
+        events, peeps, _ = scenario_factory(15, num_events=3)
+        scheduler = scheduler_factory(max_events=4)
+        scheduler.target_max = 4
+        exhaustive = search.run_exhaustive(scheduler, peeps, events)
+
+        address = str(tmp_path / "peeps.sock")
+        coordinator = distributed.Coordinator(address, distributed.build_snapshot(scheduler, peeps, events), shard_size=2).start()
+        start_thread_worker(coordinator)
+        scheduler.coordinator = coordinator
+        try:
+            sharded = search.run_distributed(scheduler, peeps, events)
+        finally:
+            coordinator.close()
+
+        assert top_keys(scheduler, sharded) == top_keys(scheduler, exhaustive)
+
+    def test_lost_worker_shard_is_reassigned(self, scheduler_factory, scenario_factory):
+        """Test that a shard held by a worker that disconnects is evaluated by another worker."""
+        events, peeps, _ = scenario_factory(15, num_events=3)
+        scheduler = scheduler_factory(max_events=4)
+        scheduler.target_max = 4
+        exhaustive = search.run_exhaustive(scheduler, peeps, events)
+
+        coordinator = distributed.Coordinator("127.0.0.1:0", distributed.build_snapshot(scheduler, peeps, events), shard_size=2).start()
+        scheduler.coordinator = coordinator
+        result = {}
+        search_thread = threading.Thread(target=lambda: result.update(sequences=search.run_distributed(scheduler, peeps, events)))
+        search_thread.start()
+
+        # A worker that takes a shard and then drops the connection
+        host, port = distributed.parse_address(coordinator.address)[1]
+        with socket.create_connection((host, port)) as sock, sock.makefile("rb") as rfile, sock.makefile("wb") as wfile:
+            distributed.send_message(wfile, {"type": "hello", "token": coordinator.token})
+            assert distributed.receive_message(rfile)["type"] == "snapshot"
+            assert distributed.receive_message(rfile)["type"] == "shard"
+
+        start_thread_worker(coordinator)
+        search_thread.join(timeout=30)
+        coordinator.close()
+
+        assert not search_thread.is_alive()
+        assert top_keys(scheduler, result["sequences"]) == top_keys(scheduler, exhaustive)
+
+    def test_hung_worker_is_dropped_after_its_lease(self, scheduler_factory, scenario_factory):
+        """Test that a worker which takes a shard and never replies cannot stall the search."""
+        events, peeps, _ = scenario_factory(15, num_events=3)
+        scheduler = scheduler_factory(max_events=4)
+        scheduler.target_max = 4
+        exhaustive = search.run_exhaustive(scheduler, peeps, events)
+
+        coordinator = distributed.Coordinator("127.0.0.1:0", distributed.build_snapshot(scheduler, peeps, events), shard_size=2, lease_seconds=0.5, wait_seconds=0).start()
+        scheduler.coordinator = coordinator
+        result = {}
+        search_thread = threading.Thread(target=lambda: result.update(sequences=search.run_distributed(scheduler, peeps, events)))
+
+        # A worker that takes a shard and then stays connected without answering
+        host, port = distributed.parse_address(coordinator.address)[1]
+        with socket.create_connection((host, port)) as sock, sock.makefile("rb") as rfile, sock.makefile("wb") as wfile:
+            distributed.send_message(wfile, {"type": "hello", "token": coordinator.token})
+            assert distributed.receive_message(rfile)["type"] == "snapshot"
+            search_thread.start()
+            assert distributed.receive_message(rfile)["type"] == "shard"
+            search_thread.join(timeout=10)
+            finished_while_connected = not search_thread.is_alive()
+        search_thread.join(timeout=30)
+        coordinator.close()
+
+        assert finished_while_connected
+        assert top_keys(scheduler, result["sequences"]) == top_keys(scheduler, exhaustive)
+
+    def test_no_live_workers_evaluates_in_coordinator(self, scheduler_factory, scenario_factory):
+        """Test that shards nobody is left to evaluate are searched in-process instead of waiting forever."""
+        events, peeps, _ = scenario_factory(15, num_events=3)
+        scheduler = scheduler_factory(max_events=4)
+        scheduler.target_max = 4
+        exhaustive = search.run_exhaustive(scheduler, peeps, events)
+
+        coordinator = distributed.Coordinator("127.0.0.1:0", distributed.build_snapshot(scheduler, peeps, events), shard_size=2, wait_seconds=0).start()
+        scheduler.coordinator = coordinator
+        try:
+            sharded = search.run_distributed(scheduler, peeps, events)
+        finally:
+            coordinator.close()
+
+        assert top_keys(scheduler, sharded) == top_keys(scheduler, exhaustive)
+
+    def test_coordinator_without_workers_raises(self, scheduler_factory, scenario_factory):
+        """Test that the distributed engine refuses to start when no worker could ever connect."""
+        events, peeps, _ = scenario_factory(15, num_events=3)
+
+        with pytest.raises(ValueError, match="--listen or --local-workers"):
+            distributed.start_coordinator(scheduler_factory(max_events=4), peeps, events)
+
+    def test_shard_tie_set_keeps_only_best_records(self, scheduler_factory, scenario_factory):
+        """Test that a shard reports only records tied for its best rank key, in index order."""
+        events, peeps, _ = scenario_factory(15, num_events=4)
+        scheduler = scheduler_factory(max_events=4)
+
+        records = distributed.evaluate_shard(scheduler, peeps, events, 5, 0, math.factorial(len(events)))
+
+        assert records
+        assert len({json.dumps(record[2]) for record in records}) == 1
+        assert [record[0] for record in records] == sorted(record[0] for record in records)
+
+
+class TestSnapshot:
+    """Test the snapshot workers start from."""
+
+    def test_snapshot_round_trip_evaluates_identically(self, scheduler_factory, scenario_factory):
+        """Test that a worker rebuilt from a JSON snapshot scores sequences like the coordinator."""
+        events, peeps, _ = scenario_factory(15, num_events=4)
+        scheduler = scheduler_factory(max_events=4, assignment='flow')
+        scheduler.partnership_requests = {1: {2, 3}}
+        snapshot = json.loads(json.dumps(distributed.build_snapshot(scheduler, peeps, events)))
+
+        worker, worker_peeps, worker_events = distributed.load_snapshot(snapshot)
+
+        assert worker.assignment == 'flow'
+        assert worker.partnership_requests == {1: {2, 3}}
+        assert distributed.evaluate_shard(worker, worker_peeps, worker_events, 5, 0, 24) == \
+            distributed.evaluate_shard(scheduler, peeps, events, 5, 0, 24)
+
+    def test_snapshot_leaves_out_names_and_emails(self, scheduler_factory, scenario_factory):
+        """Test that workers are not sent any personal text fields."""
+        events, peeps, _ = scenario_factory(15, num_events=4)
+
+        snapshot = distributed.build_snapshot(scheduler_factory(max_events=4), peeps, events)
+
+        assert not {"full_name", "display_name", "email"} & {key for peep in snapshot["peeps"] for key in peep}
+
+    def test_wrong_token_is_refused(self, scheduler_factory, scenario_factory):
+        """Test that a worker without the coordinator's token gets no snapshot."""
+        events, peeps, _ = scenario_factory(15, num_events=3)
+        coordinator = distributed.Coordinator("127.0.0.1:0", distributed.build_snapshot(scheduler_factory(max_events=4), peeps, events), token="secret").start()
+        try:
+            with pytest.raises(ConnectionError, match="invalid worker token"):
+                distributed.run_worker(coordinator.address, "guess")
+        finally:
+            coordinator.close()
+
+    def test_parse_address(self):
+        """Test TCP and Unix socket address parsing."""
+        assert distributed.parse_address("10.0.0.5:7000") == (socket.AF_INET, ("10.0.0.5", 7000))
+        assert distributed.parse_address(":7000") == (socket.AF_INET, ("127.0.0.1", 7000))
+        if hasattr(socket, "AF_UNIX"):
+            assert distributed.parse_address("/tmp/peeps.sock") == (socket.AF_UNIX, "/tmp/peeps.sock")
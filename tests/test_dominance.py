@@ -0,0 +1,134 @@
+"""
+Test dominated-event analysis before the search.
+
+Following testing philosophy:
+- Test which events dominate which, and that ordering twins keeps the optimum
+- Use real Peep/Event objects from the shared factories
+- One concept per test with descriptive names
+"""
+
+import datetime
+
+from peeps_scheduler import dominance, search
+from peeps_scheduler.models import Role
+
+
+class TestFindDominatedEvents:
+    """Test dominance detection with bitset subset tests."""
+
+    def test_subset_event_dominated_by_superset(self, event_factory, add_pairs):
+        """Test that an event whose attendees can all attend another event is dominated by it."""
+        events = [event_factory(id=1), event_factory(id=2)]
+        peeps = []
+        add_pairs(peeps, [1, 2], 4, 1)
+        add_pairs(peeps, [1], 2, 11)
+
+        assert dominance.find_dominated_events(events, peeps) == {2: 1}
+
+    def test_identical_twins_dominated_only_once(self, event_factory, add_pairs):
+        """Test that of two events with identical availability only the later one is dominated."""
+        events = [event_factory(id=1), event_factory(id=2)]
+        peeps = []
+        add_pairs(peeps, [1, 2], 4, 1)
+
+        assert dominance.find_dominated_events(events, peeps) == {2: 1}
+
+    def test_different_duration_not_interchangeable(self, event_factory, add_pairs):
+        """Test that events with different durations never dominate each other."""
+        events = [event_factory(id=1, duration_minutes=120), event_factory(id=2, duration_minutes=90)]
+        peeps = []
+        add_pairs(peeps, [1, 2], 4, 1)
+
+        assert dominance.find_dominated_events(events, peeps) == {}
+
+    def test_different_dates_interchangeable_only_without_interval_limits(self, event_factory, add_pairs):
+        """Test that events on different dates dominate only when no one has a minimum interval."""
+        events = [
+            event_factory(id=1, date=datetime.datetime(2025, 1, 15, 18, 0)),
+            event_factory(id=2, date=datetime.datetime(2025, 1, 17, 18, 0)),
+        ]
+        free = []
+        add_pairs(free, [1, 2], 4, 1)
+        spaced = []
+        add_pairs(spaced, [1, 2], 4, 1, min_interval_days=7)
+
+        assert dominance.find_dominated_events(events, free) == {2: 1}
+        assert dominance.find_dominated_events(events, spaced) == {}
+
+    def test_peeps_without_capacity_ignored(self, event_factory, peep_factory, add_pairs):
+        """Test that a peep who can attend nothing does not prevent dominance."""
+        events = [event_factory(id=1), event_factory(id=2)]
+        peeps = []
+        add_pairs(peeps, [1, 2], 4, 1)
+        peeps.append(peep_factory(id=50, role=Role.LEADER, availability=[2], event_limit=0))
+
+        assert dominance.find_dominated_events(events, peeps) == {2: 1}
+
+
+class TestApplyDominance:
+    """Test drop and order modes."""
+
+    def test_drop_mode_removes_dominated_events(self, event_factory, add_pairs):
+        """Test that drop mode removes a dominated event that can never run alongside its dominator."""
+        events = [event_factory(id=1), event_factory(id=2), event_factory(id=3, duration_minutes=90)]
+        peeps = []
+        add_pairs(peeps, [1, 2, 3], 4, 1, event_limit=1)
+
+        kept, precedence = dominance.apply_dominance(events, peeps, 'drop')
+
+        assert [event.id for event in kept] == [1, 3]
+        assert precedence == {}
+
+    def test_drop_mode_orders_twins_that_can_both_fill(self, event_factory, scheduler_factory, add_pairs):
+        """Test that twins with enough peeps for both are kept and ordered, so the optimum is unchanged."""
+        events = [event_factory(id=1, duration_minutes=90), event_factory(id=2, duration_minutes=90)]
+        peeps = []
+        add_pairs(peeps, [1, 2], 8, 1, event_limit=1)
+
+        kept, precedence = dominance.apply_dominance(events, peeps, 'drop')
+        scheduler = scheduler_factory()
+        scheduler.target_max = 4
+        scheduler.event_precedence = precedence
+        best = scheduler.get_top_sequences(search.run_exhaustive(scheduler, peeps, kept))[0]
+
+        assert kept == events
+        assert precedence == {2: 1}
+        assert len(best.valid_events) == 2
+        assert best.num_unique_attendees == 16
+
+    def test_order_mode_keeps_events_and_returns_precedence(self, event_factory, add_pairs):
+        """Test that order mode keeps every event and orders the dominated one after its dominator."""
+        events = [event_factory(id=1), event_factory(id=2)]
+        peeps = []
+        add_pairs(peeps, [1, 2], 4, 1)
+
+        kept, precedence = dominance.apply_dominance(events, peeps, 'order')
+
+        assert kept == events
+        assert precedence == {2: 1}
+        assert dominance.respects_precedence((1, 2), precedence)
+        assert not dominance.respects_precedence((2, 1), precedence)
+
+    def test_order_mode_on_twins_keeps_optimum(self, event_factory, scheduler_factory, add_pairs):
+        """Test that ordering identical twins halves the search without changing the best result."""
+        events = [event_factory(id=1), event_factory(id=2), event_factory(id=3, duration_minutes=90)]
+        peeps = []
+        add_pairs(peeps, [1, 2, 3], 5, 1, event_limit=2)
+        add_pairs(peeps, [3], 2, 21, event_limit=1)
+        _, precedence = dominance.apply_dominance(events, peeps, 'order')
+
+        unconstrained = scheduler_factory()
+        unconstrained.target_max = 5
+        ordered = scheduler_factory()
+        ordered.target_max = 5
+        ordered.event_precedence = precedence
+
+        all_sequences = search.run_exhaustive(unconstrained, peeps, events)
+        ordered_sequences = search.run_exhaustive(ordered, peeps, events)
+        pruned_sequences = search.run_branch_and_bound(ordered, peeps, events)
+
+        best = unconstrained.rank_key(unconstrained.get_top_sequences(all_sequences)[0])
+        assert precedence == {2: 1}
+        assert len(ordered_sequences) == len(all_sequences) // 2
+        assert ordered.rank_key(ordered.get_top_sequences(ordered_sequences)[0]) == best
+        assert ordered.rank_key(ordered.get_top_sequences(pruned_sequences)[0]) == best
@@ -0,0 +1,109 @@
+"""
+Test the columnar export of period history.
+
+Following testing philosophy:
+- Test the exported tables against the period files they come from
+- Use the sanitized golden master period in a temporary DataManager folder
+- Writing files needs pyarrow, so those tests skip without it
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from peeps_scheduler import export, file_io, utils
+from peeps_scheduler.data_manager import DataManager
+
+GOLDEN_MASTER_DIR = Path(__file__).parent / "golden_master_2025_09_sanitized"
+
+
+@pytest.fixture
+def data_manager(tmp_path):
+    """DataManager with the golden master period and an empty period that has no files yet."""
+    dm = DataManager(submodule_root=str(tmp_path / "data"))
+    shutil.copytree(GOLDEN_MASTER_DIR, dm.get_period_path("2025-09"))
+    dm.ensure_period_exists("2025-10")
+    return dm
+
+
+class TestPeriodTables:
+    """Test building a period's tables from its files."""
+
+    def test_tables_follow_period_files(self, data_manager):
+        """Test that members, availability, assignments and priority changes match the source files."""
+        tables = export.period_tables(data_manager.get_period_path("2025-09"))
+        output = file_io.load_json(GOLDEN_MASTER_DIR / "output.json")
+        results = file_io.load_json(GOLDEN_MASTER_DIR / "results.json")
+
+        assert tables["members"]["id"] == [peep["id"] for peep in output["peeps"]]
+        assert len(tables["availability"]["peep_id"]) == sum(len(peep.get("availability", [])) for peep in output["peeps"])
+        assert sum(tables["assignments"]["alternate"]) == sum(len(event["alternates"]) for event in results["valid_events"])
+        assert set(tables["assignments"]["source"]) == {"results"}
+        assert tables["priority_changes"]["priority_after"] == [peep["priority"] for peep in results["peeps"]]
+
+    def test_priority_changes_follow_actual_attendance(self, data_manager):
+        """Test that a period with actual attendance reports priorities as applied from it, not as scheduled."""
+        period_path = data_manager.get_period_path("2025-09")
+        results = file_io.load_json(period_path / "results.json")
+        # Two scheduled events did not run
+        actual = dict(results, valid_events=[event for event in results["valid_events"] if event["id"] not in (0, 2)])
+        (period_path / "actual_attendance.json").write_text(json.dumps(actual))
+
+        changes = export.period_tables(period_path)["priority_changes"]
+        applied = utils.apply_event_results(period_path / "actual_attendance.json", period_path / "members.csv", period_path / "responses.csv")
+
+        assert changes["peep_id"] == [peep.id for peep in applied]
+        assert changes["priority_after"] == [peep.priority for peep in applied]
+        assert changes["total_attended_after"] == [peep.total_attended for peep in applied]
+        assert sum(changes["total_attended_after"]) < sum(peep["total_attended"] for peep in results["peeps"])
+
+    def test_unappliable_actual_attendance_falls_back_to_results(self, data_manager):
+        """Test that actual attendance apply-results rejects leaves the scheduled priorities rather than failing."""
+        period_path = data_manager.get_period_path("2025-09")
+        results = file_io.load_json(period_path / "results.json")
+        # Event 2 has more followers than a 60-minute event allows, so apply_event_results raises
+        (period_path / "actual_attendance.json").write_text(json.dumps(results))
+
+        changes = export.period_tables(period_path)["priority_changes"]
+
+        assert changes["priority_after"] == [peep["priority"] for peep in results["peeps"]]
+
+    def test_every_table_has_its_schema_columns(self, data_manager):
+        """Test that a period without files still yields every column, empty."""
+        tables = export.period_tables(data_manager.get_period_path("2025-10"))
+
+        for name, schema in export.TABLE_SCHEMAS.items():
+            assert tables[name] == {column: [] for column, _ in schema}
+
+    def test_missing_pyarrow_raises(self, data_manager, tmp_path, monkeypatch):
+        """Test that exporting without pyarrow explains what is missing."""
+        monkeypatch.setattr(export, "pyarrow", None)
+
+        with pytest.raises(RuntimeError, match="pyarrow is not installed"):
+            export.export_periods(data_manager, tmp_path / "export")
+
+
+class TestExportFiles:
+    """Test the written Parquet and Arrow files."""
+
+    @pytest.mark.parametrize("format", ["parquet", "arrow"])
+    def test_partitioned_dataset_reads_all_periods(self, data_manager, tmp_path, format):
+        """Test that a Hive-partitioned dataset read of a table returns every period's rows."""
+        pytest.importorskip("pyarrow")
+        import pyarrow.dataset
+
+        written = export.export_periods(data_manager, tmp_path / "export", format=format)
+        dataset = pyarrow.dataset.dataset(tmp_path / "export" / "assignments", format="ipc" if format == "arrow" else format, partitioning="hive")
+        table = dataset.to_table()
+
+        assert len(written) == 2 * len(export.TABLE_SCHEMAS)
+        assert (tmp_path / "export" / "members" / "period=2025-10" / f"data.{format}").exists()
+        assert set(table.column("period").to_pylist()) == {"2025-09"}
+        assert table.num_rows == len(export.period_tables(data_manager.get_period_path("2025-09"))["assignments"]["peep_id"])
+
+    def test_unknown_format_raises(self, data_manager, tmp_path):
+        """Test that only the supported formats are accepted."""
+        with pytest.raises(ValueError, match="unknown export format: csv"):
+            export.export_periods(data_manager, tmp_path / "export", format="csv")
@@ -1,22 +1,32 @@
 import pytest
+import contextlib
 import tempfile
 import os
 import json
 import datetime
 import logging
+from pathlib import Path
+from peeps_scheduler import file_io
 from peeps_scheduler.file_io import (
 	load_data_from_json,
 	convert_to_json,
 	parse_event_date,
+	parse_event_key,
+	EventKey,
 	parse_time_range,
+	iter_csv,
 	load_csv,
 	load_peeps,
+	load_peeps_with_index,
+	build_email_index,
 	extract_events,
 	process_responses,
 	save_event_sequence,
 	save_peeps_csv,
 	load_json,
 	save_json,
+	save_output_json,
+	load_output_json,
 	normalize_email,
 	load_cancellations,
 	load_partnerships
@@ -190,6 +200,55 @@ class TestCSVLoading:
 		assert rows[0]["Event"] == "Friday January 9th - 5:30pm to 7pm"  # Double space → single
 		assert rows[1]["Event"] == "It's available"  # Curly ' → straight ', double space → single
 
+	def test_iter_csv_validates_columns_before_reading_rows(self, tmp_path):
+		"""Test that a missing column is reported when iteration starts, before any row is yielded."""
+		path = tmp_path / "members.csv"
+		path.write_text("Name,Role\nAlice,Lead\n")
+		rows = iter_csv(path, required_columns=["Name", "Email Address"])
+
+		with pytest.raises(ValueError, match="missing required column"):
+			next(rows)
+
+	@pytest.mark.parametrize("offset", [0, len("Name,Role\n")])
+	def test_iter_csv_closes_file_when_abandoned(self, tmp_path, monkeypatch, offset):
+		"""Test that stopping after the first row, or never starting, leaves no file open."""
+		path = tmp_path / "members.csv"
+		path.write_text("Name,Role\nAlice,Lead\nBob,Follow\n")
+		opened = []
+
+		@contextlib.contextmanager
+		def tracking_open(*args, **kwargs):
+			with open(*args, **kwargs) as f:
+				opened.append(f)
+				yield f
+
+		monkeypatch.setattr(file_io, "open", tracking_open, raising=False)
+		started = iter_csv(path, offset=offset)
+		assert next(started) == {"Name": "Alice", "Role": "Lead"}
+		started.close()
+		unstarted = iter_csv(path, offset=offset)
+		unstarted.close()
+
+		assert opened
+		assert all(f.closed for f in opened)
+
+	def test_iter_csv_yields_rows_lazily(self, tmp_path):
+		"""Test that rows are produced one at a time with the same cleanup as load_csv."""
+		path = tmp_path / "responses.csv"
+		path.write_text(" Name , Note \nAlice, It\u2019s  fine \nBob,\n", encoding="utf-8")
+
+		rows = iter_csv(path)
+
+		assert next(rows) == {"Name": "Alice", "Note": "It's fine"}
+		assert list(rows) == [{"Name": "Bob", "Note": ""}]
+
+	def test_iter_csv_empty_file_yields_nothing(self, tmp_path):
+		"""Test that a file without a header has no rows."""
+		path = tmp_path / "empty.csv"
+		path.write_text("")
+
+		assert list(iter_csv(path, required_columns=["Name"])) == []
+
 
 class TestJSONOperations:
 	"""Tests for JSON loading, saving, and serialization."""
@@ -223,6 +282,25 @@ class TestJSONOperations:
 		result = json.loads(out_path.read_text())
 		assert result["role"] == "leader"
 
+	def test_save_json_compact_matches_pretty(self, tmp_path, monkeypatch):
+		"""Test that compact output, with or without orjson, decodes to the same data as pretty output."""
+		data = {
+			"when": datetime.datetime(2025, 7, 21, 15, 0),
+			"day": datetime.date(2025, 7, 21),
+			"prefs": [Role.FOLLOWER, SwitchPreference.SWITCH_IF_NEEDED],
+			"names": {1: "Zoë"},
+			"floats": [1e16, 1e-7, 0.1, 2.5],
+		}
+		save_json(data, tmp_path / "pretty.json")
+		save_json(data, tmp_path / "compact.json", compact=True)
+		monkeypatch.setattr("peeps_scheduler.file_io.orjson", None)
+		save_json(data, tmp_path / "stdlib.json", compact=True)
+
+		pretty = json.loads((tmp_path / "pretty.json").read_text())
+		assert json.loads((tmp_path / "compact.json").read_text(encoding="utf-8")) == pretty
+		assert json.loads((tmp_path / "stdlib.json").read_text(encoding="utf-8")) == pretty
+		assert "\n" not in (tmp_path / "stdlib.json").read_text(encoding="utf-8")
+
 	def test_save_json_fallback_str_for_unknown_type(self, tmp_path):
 		"""Ensure save_json falls back to str(obj) for unknown types like set."""
 		path = tmp_path / "fallback.json"
@@ -384,6 +462,34 @@ class TestTimeDateParsing:
 		assert event_id == f"{current_year}-01-12 17:00"
 		assert duration == 90
 
+	def test_parse_event_key_is_memoized(self):
+		"""Test that a repeated date string returns the same cached key."""
+		date_str = "Friday January 9th - 5:30pm to 7pm"
+		key = parse_event_key(date_str, year=2026)
+
+		assert parse_event_key(date_str, year=2026) is key
+		assert parse_event_key(date_str, year=2027) is not key
+		assert key.start == datetime.datetime(2026, 1, 9, 17, 30)
+		assert key.event_id == "2026-01-09 17:30"
+		assert key.duration == 90
+
+	def test_event_key_equality_ignores_display_name(self):
+		"""Test that keys parsed from differently written strings for the same slot are equal."""
+		a = parse_event_key("Friday January 9th - 5:30pm to 7pm", year=2026)
+		b = parse_event_key("friday january 09 - 5:30pm to 7pm (back room)", year=2026)
+
+		assert a == b
+		assert hash(a) == hash(b)
+		assert a != EventKey(a.start, 120)
+
+	def test_parse_event_date_leap_day_uses_target_year(self):
+		"""Test that February 29 is checked against the event year, not a default one."""
+		event_id, _, _ = parse_event_date("Thursday February 29 - 5pm to 6:30pm", year=2024)
+
+		assert event_id == "2024-02-29 17:00"
+		with pytest.raises(ValueError, match="invalid date format"):
+			parse_event_date("Thursday February 29 - 5pm to 6:30pm", year=2025)
+
 
 class TestEventExtraction:
 	"""Tests for event extraction from responses (old Event rows + new auto-derive)."""
@@ -716,6 +822,53 @@ class TestIntegration:
 		assert bob.responded is True
 
 
+class TestOutputVersions:
+	"""Tests for the version 2 output.json layout and reading both versions."""
+
+	GOLDEN_OUTPUT = Path(__file__).parent / "golden_master_2025_09_sanitized" / "output.json"
+
+	def test_version_2_loads_like_version_1(self, tmp_path):
+		"""Test that a version 2 output.json loads the same peeps and events as version 1, and is smaller."""
+		output = load_json(self.GOLDEN_OUTPUT)
+		save_output_json(output, tmp_path / "v1.json", version=1)
+		save_output_json(output, tmp_path / "v2.json", version=2)
+
+		assert load_json(tmp_path / "v2.json")["version"] == 2
+		assert load_output_json(tmp_path / "v2.json", include_responses=True) == load_output_json(tmp_path / "v1.json", include_responses=True)
+		v1_peeps, v1_events = load_data_from_json(tmp_path / "v1.json")
+		v2_peeps, v2_events = load_data_from_json(tmp_path / "v2.json")
+		assert [vars(p) for p in v2_peeps] == [vars(p) for p in v1_peeps]
+		assert [e.to_dict() for e in v2_events] == [e.to_dict() for e in v1_events]
+		assert (tmp_path / "v2.json").stat().st_size < (tmp_path / "v1.json").stat().st_size
+
+	def test_version_2_reads_responses_only_when_asked(self, tmp_path):
+		"""Test that responses live in the audit file and are loaded only with include_responses."""
+		output = load_json(self.GOLDEN_OUTPUT)
+		save_output_json(output, tmp_path / "output.json", version=2)
+
+		assert "responses" not in load_output_json(tmp_path / "output.json")
+		assert load_json(tmp_path / "responses.json") == output["responses"]
+		assert load_output_json(tmp_path / "output.json", include_responses=True)["responses"] == output["responses"]
+
+	def test_version_1_file_is_read_unchanged(self):
+		"""Test that an existing version 1 output.json is returned as stored."""
+		assert load_output_json(self.GOLDEN_OUTPUT) == load_json(self.GOLDEN_OUTPUT)
+
+	def test_unknown_event_in_availability_raises(self, tmp_path):
+		"""Test that availability for an event not in the events list cannot be encoded."""
+		output = {"responses": [], "events": [], "peeps": [{"id": 1, "availability": [0]}]}
+
+		with pytest.raises(ValueError, match="unknown event 0"):
+			save_output_json(output, tmp_path / "output.json", version=2)
+
+	def test_unsupported_version_raises(self, tmp_path):
+		"""Test that an output.json from a newer schema is refused."""
+		save_json({"version": 3, "events": [], "peeps": []}, tmp_path / "output.json")
+
+		with pytest.raises(ValueError, match="unsupported output.json version: 3"):
+			load_output_json(tmp_path / "output.json")
+
+
 class TestEmailNormalization:
 	"""Tests for email normalization (Gmail dot handling)."""
 
@@ -762,6 +915,27 @@ class TestEmailNormalization:
 		updated_peeps, responses = process_responses(responses_rows, peeps, {})
 		assert updated_peeps[0].responded is True
 
+	def test_email_index_normalizes_and_reports_duplicates(self, peep_factory):
+		"""The index keys are normalized emails; blanks are skipped and shared emails reported."""
+		peeps = [
+			peep_factory(id=1, email="John.Smith@gmail.com"),
+			peep_factory(id=2, email="", active=False),
+			peep_factory(id=3, email="johnsmith@gmail.com"),
+			peep_factory(id=4, email="ann@test.com"),
+		]
+
+		index, duplicates = build_email_index(peeps)
+
+		assert {email: peep.id for email, peep in index.items()} == {"johnsmith@gmail.com": 1, "ann@test.com": 4}
+		assert duplicates == {"johnsmith@gmail.com"}
+
+	def test_load_peeps_with_index_matches_responses(self, peeps_csv_path):
+		"""The index returned with the peeps is the one process_responses matches against."""
+		peeps, index = load_peeps_with_index(peeps_csv_path)
+
+		assert index["alice@test.com"] is peeps[0]
+		assert "" not in index
+
 
 class TestCancellations:
 	"""Tests for loading cancellations.json (events + availability)."""
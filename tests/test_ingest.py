@@ -0,0 +1,135 @@
+"""
+Test incremental ingest of responses.csv.
+
+Following testing philosophy:
+- Every incremental update must write exactly what a full conversion writes
+- Use small real CSV files in a temporary period folder
+- One concept per test with descriptive names
+"""
+
+import csv
+import json
+
+import pytest
+
+from peeps_scheduler import file_io, ingest
+
+PRIMARY_ONLY = "I only want to be scheduled in my primary role"
+RESPONSE_FIELDS = ["Timestamp", "Email Address", "Name", "Primary Role", "Secondary Role", "Max Sessions", "Availability", "Min Interval Days"]
+
+
+def response(timestamp, n, role, availability, max_sessions=2):
+    """One responses.csv row for member n."""
+    return {
+        "Timestamp": timestamp, "Email Address": f"p{n}@test.com", "Name": f"Person {n}",
+        "Primary Role": role, "Secondary Role": PRIMARY_ONLY, "Max Sessions": str(max_sessions),
+        "Availability": availability, "Min Interval Days": "0",
+    }
+
+
+def write_responses(path, rows, mode="w"):
+    with open(path, mode, newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=RESPONSE_FIELDS)
+        if mode == "w":
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+@pytest.fixture
+def period(tmp_path):
+    """Period folder with four active members and two responses, converted with ingest state."""
+    with open(tmp_path / "members.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(file_io.PEEPS_CSV_FIELDS)
+        for n in range(1, 5):
+            writer.writerow([n, f"Person {n}", f"P{n}", f"p{n}@test.com", "Leader", n - 1, 5 - n, 0, "TRUE", ""])
+    write_responses(tmp_path / "responses.csv", [
+        response("9/1/2025 10:00:00", 1, "Leader", "Friday October 10 - 5pm to 6:30pm, Saturday October 11 - 4pm to 6pm"),
+        response("9/1/2025 11:00:00", 2, "Follower", "Saturday October 11 - 4pm to 6pm"),
+    ])
+    state = ingest.convert(*paths(tmp_path), year=2025)
+    return tmp_path, state
+
+
+def paths(folder):
+    return str(folder / "responses.csv"), str(folder / "members.csv"), str(folder / "output.json")
+
+
+def assert_matches_full_conversion(folder):
+    responses_csv, members_csv, output_json = paths(folder)
+    file_io.convert_to_json(responses_csv, members_csv, str(folder / "full.json"), year=2025)
+    with open(output_json) as f, open(folder / "full.json") as g:
+        assert json.load(f) == json.load(g)
+
+
+class TestIncrementalIngest:
+    """Test applying appended and edited rows to output.json."""
+
+    def test_appended_rows_parse_only_new_bytes(self, period, monkeypatch):
+        """Test that appended responses are applied without re-reading the earlier rows."""
+        folder, state = period
+        write_responses(folder / "responses.csv", [response("9/2/2025 09:00:00", 3, "Follower", "Friday October 10 - 5pm to 6:30pm")], "a")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("all rows should not be re-read")
+
+        monkeypatch.setattr(file_io, "load_responses", fail)
+        new_state = ingest.update(*paths(folder), state, year=2025)
+        monkeypatch.undo()
+
+        assert new_state["last_timestamp"] == "9/2/2025 09:00:00"
+        assert len(new_state["rows"]) == 3
+        assert_matches_full_conversion(folder)
+
+    def test_new_earlier_date_renumbers_events(self, period):
+        """Test that a new date sorting before existing events shifts ids in events and availability."""
+        folder, state = period
+        write_responses(folder / "responses.csv", [response("9/2/2025 09:00:00", 3, "Follower", "Friday October 3 - 5pm to 6:30pm")], "a")
+
+        ingest.update(*paths(folder), state, year=2025)
+
+        with open(folder / "output.json") as f:
+            output = json.load(f)
+        assert [event["date"] for event in output["events"]] == ["2025-10-03 17:00", "2025-10-10 17:00", "2025-10-11 16:00"]
+        assert output["peeps"][0]["availability"] == [1, 2]
+        assert_matches_full_conversion(folder)
+
+    def test_edited_row_updates_only_that_peep(self, period):
+        """Test that a response edited in place is replayed for its peep and matches a full conversion."""
+        folder, state = period
+        write_responses(folder / "responses.csv", [
+            response("9/1/2025 10:00:00", 1, "Follower", "Saturday October 11 - 4pm to 6pm", max_sessions=1),
+            response("9/1/2025 11:00:00", 2, "Follower", "Saturday October 11 - 4pm to 6pm"),
+            response("9/3/2025 08:00:00", 4, "Leader", "Friday October 10 - 5pm to 6:30pm"),
+        ])
+
+        new_state = ingest.update(*paths(folder), state, year=2025)
+
+        assert new_state is not None
+        assert_matches_full_conversion(folder)
+
+    def test_removed_row_needs_full_conversion(self, period):
+        """Test that rows deleted from responses.csv cannot be ingested incrementally."""
+        folder, state = period
+        write_responses(folder / "responses.csv", [response("9/1/2025 11:00:00", 2, "Follower", "Saturday October 11 - 4pm to 6pm")])
+
+        assert ingest.update(*paths(folder), state, year=2025) is None
+
+    def test_different_year_needs_full_conversion(self, period):
+        """Test that state recorded for another year is not reused."""
+        folder, state = period
+
+        assert ingest.update(*paths(folder), state, year=2026) is None
+
+    def test_version_2_output_matches_full_conversion(self, period):
+        """Test that updating a version 2 output.json gives the same data as a full version 1 conversion."""
+        folder, _ = period
+        state = ingest.convert(*paths(folder), year=2025, version=2)
+        write_responses(folder / "responses.csv", [response("9/2/2025 09:00:00", 3, "Follower", "Friday October 3 - 5pm to 6:30pm")], "a")
+
+        assert ingest.update(*paths(folder), state, year=2025, version=2) is not None
+
+        responses_csv, members_csv, output_json = paths(folder)
+        file_io.convert_to_json(responses_csv, members_csv, str(folder / "full.json"), year=2025)
+        assert "availability_bits" in file_io.load_json(output_json)["peeps"][0]
+        assert file_io.load_output_json(output_json, include_responses=True) == file_io.load_json(folder / "full.json")
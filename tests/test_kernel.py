@@ -0,0 +1,89 @@
+"""
+Test the array evaluation kernel against the object model.
+
+Following testing philosophy:
+- Differential tests: the kernel must score every order exactly like Scheduler.evaluate_sequence
+- Use real Peep/Event objects from the shared factories
+- One concept per test with descriptive names
+"""
+
+import itertools
+
+import pytest
+
+from peeps_scheduler import kernel, search
+from peeps_scheduler.models import Role
+
+
+def assert_kernel_matches_objects(scenario_factory, scheduler_factory, jit):
+    """Score every order of several random scenarios both ways and compare."""
+    for seed in range(12):
+        events, peeps, requests = scenario_factory(seed)
+        scheduler = scheduler_factory()
+        scheduler.partnership_requests = requests
+        evaluator = kernel.EvaluationKernel(peeps, events, requests, jit=jit)
+        event_map = {event.id: event for event in events}
+
+        for target_max in (None, 4, 6):
+            scheduler.target_max = target_max
+            for perm in itertools.permutations(event_map):
+                expected = search.evaluate_permutation(scheduler, peeps, event_map, perm)
+                result = evaluator.score(perm, target_max)
+
+                assert scheduler.rank_key(result) == scheduler.rank_key(expected)
+                assert result.__key__() == expected.__key__()
+                assert result.valid_events == [event.id for event in expected.valid_events]
+
+
+class TestEvaluationKernel:
+    """Test that the kernel is exactly equivalent to the object evaluation path."""
+
+    def test_interpreted_kernel_matches_object_model(self, scenario_factory, scheduler_factory):
+        """Test the plain Python kernel on random scenarios."""
+        assert_kernel_matches_objects(scenario_factory, scheduler_factory, jit=False)
+
+    def test_compiled_kernel_matches_object_model(self, scenario_factory, scheduler_factory):
+        """Test the Numba-compiled kernel on the same scenarios."""
+        pytest.importorskip("numba")
+        assert_kernel_matches_objects(scenario_factory, scheduler_factory, jit=True)
+
+    def test_balancing_and_downgrade(self, event_factory, peep_factory):
+        """Test an unbalanced 120-minute event that is balanced down to 90 minutes."""
+        events = [event_factory(id=1, duration_minutes=120)]
+        peeps = [peep_factory(id=i + 1, role=Role.LEADER, index=i) for i in range(6)]
+        peeps += [peep_factory(id=i + 11, role=Role.FOLLOWER, index=i + 6) for i in range(4)]
+
+        result = kernel.EvaluationKernel(peeps, events, jit=False).score((1,))
+
+        assert result.valid_events == [1]
+        assert result.__key__() == ((1, (1, 2, 3, 4), (11, 12, 13, 14)),)
+        assert result.num_unique_attendees == 8
+
+    def test_compiled_kernel_requires_numba(self, event_factory, peep_factory, monkeypatch):
+        """Test that asking for the compiled kernel without numba is refused."""
+        monkeypatch.setattr(kernel, "numba", None)
+
+        with pytest.raises(ValueError, match="requires numba"):
+            kernel.EvaluationKernel([], [event_factory()], jit=True)
+
+
+class TestKernelSearch:
+    """Test the exhaustive engine scoring with the kernel."""
+
+    def test_kernel_exhaustive_finds_same_top_sequences(self, scenario_factory, scheduler_factory):
+        """Test that kernel scoring returns the same tied best sequences as the object path."""
+        events, peeps, _ = scenario_factory(5)
+        objects = scheduler_factory()
+        arrays = scheduler_factory(kernel='array')
+
+        for target_max in search.TARGET_MAXES:
+            objects.target_max = arrays.target_max = target_max
+            expected = objects.get_top_sequences(search.run_exhaustive(objects, peeps, events))
+            found = arrays.get_top_sequences(search.run_exhaustive(arrays, peeps, events))
+
+            assert [sequence.__key__() for sequence in found] == [sequence.__key__() for sequence in expected]
+
+    def test_array_kernel_requires_greedy_assignment(self, scheduler_factory):
+        """Test that the kernel cannot be combined with flow assignment."""
+        with pytest.raises(ValueError, match="only greedy assignment"):
+            scheduler_factory(kernel='array', assignment='flow')
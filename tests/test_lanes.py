@@ -0,0 +1,69 @@
+"""
+Test batched multi-lane evaluation of event orders.
+
+Following testing philosophy:
+- Differential tests: every lane must score exactly like Scheduler.evaluate_sequence
+- Use real Peep/Event objects from the shared factories
+- One concept per test with descriptive names
+"""
+
+import itertools
+
+import pytest
+
+from peeps_scheduler import kernel, lanes, search
+
+
+class TestEvaluateBatch:
+    """Test lanes against the object evaluation path."""
+
+    def test_every_lane_matches_object_model(self, scenario_factory, scheduler_factory):
+        """Test metrics and seating of all permutations evaluated as one batch."""
+        pytest.importorskip("numpy")
+        for seed in range(12):
+            events, peeps, _ = scenario_factory(seed)
+            scheduler = scheduler_factory()
+            problem = lanes.LaneProblem(peeps, events)
+            event_map = {event.id: event for event in events}
+            perms = list(itertools.permutations(event_map))
+
+            for target_max in (None, 4, 6):
+                scheduler.target_max = target_max
+                num_unique, priority_fulfilled, utilization, valid, seats = lanes.evaluate_batch(problem, problem.orders(perms), target_max)
+                for b, perm in enumerate(perms):
+                    expected = search.evaluate_permutation(scheduler, peeps, event_map, perm)
+                    metrics = (num_unique[b], priority_fulfilled[b], utilization[b])
+                    result = kernel.make_result(perm, valid[b], seats[b].ravel(), problem.peep_ids, metrics)
+
+                    assert scheduler.rank_key(result) == scheduler.rank_key(expected)
+                    assert result.__key__() == expected.__key__()
+
+
+class TestBatchedEngine:
+    """Test the batched search engine."""
+
+    def test_batched_finds_same_top_sequences(self, scenario_factory, monkeypatch, scheduler_factory):
+        """Test that batches smaller than the permutation count keep the exhaustive tie set."""
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(search.constants, "BATCH_LANES", 5)
+        events, peeps, requests = scenario_factory(5)
+        scheduler = scheduler_factory()
+        scheduler.partnership_requests = requests
+
+        for target_max in search.TARGET_MAXES:
+            scheduler.target_max = target_max
+            expected = scheduler.get_top_sequences(search.run_exhaustive(scheduler, peeps, events))
+            found = scheduler.get_top_sequences(search.run_batched(scheduler, peeps, events))
+
+            assert [sequence.__key__() for sequence in found] == [sequence.__key__() for sequence in expected]
+
+    def test_falls_back_to_exhaustive_without_numpy(self, scenario_factory, monkeypatch, scheduler_factory):
+        """Test that the engine still searches when NumPy is missing."""
+        monkeypatch.setattr(lanes, "numpy", None)
+        events, peeps, _ = scenario_factory(5)
+        scheduler = scheduler_factory()
+        scheduler.target_max = 5
+
+        found = search.run_batched(scheduler, peeps, events)
+
+        assert len(found) == len(search.run_exhaustive(scheduler, peeps, events))
@@ -0,0 +1,161 @@
+"""
+Test coverage-based event pre-selection.
+
+Following testing philosophy:
+- Test which events are kept when there are more candidates than max_events
+- Use real Peep/Event objects from the shared factories
+- One concept per test with descriptive names
+"""
+
+import random
+
+import pytest
+
+from peeps_scheduler import preselection
+from peeps_scheduler.models import Role, SwitchPreference
+
+
+class TestBalancedFill:
+    """Test the reachable per-role fill given switch allowances."""
+
+    @pytest.mark.parametrize("leaders, followers, leaders_can_follow, followers_can_lead, expected", [
+        (4, 4, 0, 0, 4),
+        (6, 2, 0, 0, 2),
+        (6, 2, 2, 0, 4),
+        (6, 2, 1, 0, 3),
+        (2, 6, 0, 5, 4),
+    ])
+    def test_fill_uses_switchers_to_balance(self, leaders, followers, leaders_can_follow, followers_can_lead, expected):
+        """Test that switch-willing peeps move from the long role to the short one."""
+        assert preselection.balanced_fill(leaders, followers, leaders_can_follow, followers_can_lead) == expected
+
+    def test_fill_capped_by_max_role(self):
+        """Test that the fill never exceeds the per-role cap."""
+        assert preselection.balanced_fill(10, 10, max_role=7) == 7
+
+
+class TestRoleCountIndex:
+    """Test the per-event role count index built in one pass over peeps."""
+
+    def test_counts_primary_roles_and_switchers_per_event(self, event_factory, peep_factory):
+        """Test counts by primary role and switch willingness for each event."""
+        events = [event_factory(id=i) for i in (1, 2)]
+        peeps = [
+            peep_factory(id=1, role=Role.LEADER, availability=[1, 2]),
+            peep_factory(id=2, role=Role.LEADER, availability=[1], switch_pref=SwitchPreference.SWITCH_IF_PRIMARY_FULL),
+            peep_factory(id=3, role=Role.FOLLOWER, availability=[2, 7], switch_pref=SwitchPreference.SWITCH_IF_NEEDED),
+            peep_factory(id=4, role=Role.FOLLOWER, availability=[1, 2], event_limit=0),
+        ]
+
+        index = preselection.build_role_count_index(events, peeps)
+
+        assert vars(index[1]) == {
+            'leaders': 2, 'followers': 0, 'leaders_can_follow': 0, 'followers_can_lead': 0,
+            'leaders_follow_if_full': 1, 'followers_lead_if_full': 0,
+        }
+        assert vars(index[2]) == {
+            'leaders': 1, 'followers': 1, 'leaders_can_follow': 0, 'followers_can_lead': 1,
+            'leaders_follow_if_full': 0, 'followers_lead_if_full': 0,
+        }
+        assert index[2].best_fill() == 1
+
+    @pytest.mark.parametrize("switch_pref, expected", [
+        (SwitchPreference.SWITCH_IF_NEEDED, 3),
+        (SwitchPreference.SWITCH_IF_PRIMARY_FULL, 2),
+    ])
+    def test_primary_full_switchers_need_their_role_filled_first(self, event_factory, peep_factory, switch_pref, expected):
+        """Test that SWITCH_IF_PRIMARY_FULL leaders only follow beyond the leaders that fill their own role."""
+        events = [event_factory(id=1)]
+        peeps = [peep_factory(id=i + 1, role=Role.LEADER, switch_pref=switch_pref) for i in range(6)]
+
+        index = preselection.build_role_count_index(events, peeps)
+
+        assert index[1].best_fill() == expected
+
+
+class TestCoverageSelection:
+    """Test lazy-greedy coverage selection of events."""
+
+    def test_keeps_events_reaching_different_peeps(self, event_factory, add_pairs):
+        """Test that an event sharing everyone with another is dropped in favor of one reaching new peeps."""
+        events = [event_factory(id=i) for i in (1, 2, 3)]
+        peeps = []
+        add_pairs(peeps, [1, 2], 5, 1, event_limit=1)
+        add_pairs(peeps, [3], 4, 11, event_limit=1)
+
+        kept = preselection.select_events_by_coverage(events, peeps, 2)
+
+        assert [event.id for event in kept] == [1, 3]
+
+    def test_event_limit_caps_coverage(self, event_factory, add_pairs):
+        """Test that peeps who used their only seat cannot fill a second event."""
+        events = [event_factory(id=i) for i in (1, 2)]
+        peeps = []
+        add_pairs(peeps, [1, 2], 5, 1, event_limit=1)
+        weights = preselection.coverage_weights(peeps)
+        seats_used = {peep.id: 1 for peep in peeps}
+
+        assert preselection.best_seating(events[1], peeps, seats_used, weights) == []
+
+    def test_priority_breaks_coverage_ties(self, event_factory, add_pairs):
+        """Test that with equal headcounts the event reaching higher-priority peeps is kept."""
+        events = [event_factory(id=i) for i in (1, 2)]
+        peeps = []
+        add_pairs(peeps, [1], 4, 1, priority=0)
+        add_pairs(peeps, [2], 4, 11, priority=3)
+
+        kept = preselection.select_events_by_coverage(events, peeps, 1)
+
+        assert [event.id for event in kept] == [2]
+
+    def test_unbalanced_event_not_preferred(self, event_factory, peep_factory, add_pairs):
+        """Test that an event with many leaders but too few followers loses to a balanced one."""
+        events = [event_factory(id=i) for i in (1, 2)]
+        peeps = [peep_factory(id=i + 1, role=Role.LEADER, availability=[1]) for i in range(10)]
+        peeps += [peep_factory(id=i + 21, role=Role.FOLLOWER, availability=[1]) for i in range(2)]
+        add_pairs(peeps, [2], 4, 41)
+
+        kept = preselection.select_events_by_coverage(events, peeps, 1)
+
+        assert [event.id for event in kept] == [2]
+
+    def test_lazy_greedy_matches_plain_greedy(self, event_factory, peep_factory):
+        """Test that lazy evaluation keeps the same events as re-evaluating every gain each round."""
+        rng = random.Random(3)
+        events = [event_factory(id=i) for i in range(1, 9)]
+        peeps = [
+            peep_factory(
+                id=i + 1,
+                role=rng.choice([Role.LEADER, Role.FOLLOWER]),
+                availability=rng.sample(range(1, 9), rng.randint(1, 5)),
+                event_limit=rng.randint(1, 3),
+                priority=rng.randint(0, 3),
+                switch_pref=rng.choice(list(SwitchPreference)),
+            )
+            for i in range(60)
+        ]
+
+        weights = preselection.coverage_weights(peeps)
+        seats_used = {peep.id: 0 for peep in peeps}
+        remaining = list(events)
+        plain = []
+        for _ in range(4):
+            gains = [
+                preselection.event_gain(event, [p for p in peeps if event.id in p.availability], seats_used, weights)
+                for event in remaining
+            ]
+            best = remaining[gains.index(max(gains))]
+            for peep, _ in preselection.best_seating(best, [p for p in peeps if best.id in p.availability], seats_used, weights):
+                seats_used[peep.id] += 1
+            plain.append(best)
+            remaining.remove(best)
+
+        kept = preselection.select_events_by_coverage(events, peeps, 4)
+
+        assert {event.id for event in kept} == {event.id for event in plain}
+
+    def test_returns_input_when_already_small_enough(self, event_factory):
+        """Test that no selection happens when there are at most max_events events."""
+        events = [event_factory(id=i) for i in (1, 2)]
+
+        assert preselection.select_events_by_coverage(events, [], 2) is events
@@ -0,0 +1,106 @@
+"""
+Test the flat array representation of static search inputs.
+
+Following testing philosophy:
+- Test that peeps and events rebuilt from the arrays evaluate exactly like the originals
+- Use real Peep/Event objects from the shared factories
+- One concept per test with descriptive names
+"""
+
+import datetime
+
+import pytest
+
+from peeps_scheduler import problem_arrays, search
+from peeps_scheduler.models import EventSequence, Role, SwitchPreference
+from peeps_scheduler.scheduler import Scheduler
+
+
+def build_roster(event_factory, peep_factory):
+    """Two events and a roster with varied codes, text fields and an availability id outside the events."""
+    events = [
+        event_factory(id=3, duration_minutes=90, date=datetime.datetime(2025, 2, 7, 17, 30)),
+        event_factory(id=1, duration_minutes=120, date=datetime.datetime(2025, 2, 1, 18, 0)),
+    ]
+    peeps = [
+        peep_factory(id=7, role=Role.LEADER, availability=[3, 1, 9], priority=2, index=1, event_limit=2,
+                     switch_pref=SwitchPreference.SWITCH_IF_NEEDED, min_interval_days=3, full_name="Zoë Ñ"),
+        peep_factory(id=8, role=Role.FOLLOWER, availability=[], active=False, responded=False, date_joined=None),
+        peep_factory(id=9, role=Role.FOLLOWER, availability=[1], total_attended=5),
+    ]
+    return events, peeps
+
+
+class TestProblemArrays:
+    """Test packing and rebuilding peeps and events."""
+
+    def test_rebuilt_models_match_originals(self, event_factory, peep_factory):
+        """Test that every field of the rebuilt peeps and events equals the original."""
+        events, peeps = build_roster(event_factory, peep_factory)
+
+        arrays = problem_arrays.ProblemArrays.from_models(peeps, events)
+
+        assert [vars(peep) for peep in arrays.make_peeps()] == [vars(peep) for peep in peeps]
+        assert [vars(event) for event in arrays.make_events()] == [vars(event) for event in events]
+
+    def test_buffer_round_trip(self, event_factory, peep_factory):
+        """Test that arrays read back from their byte layout rebuild the same models."""
+        events, peeps = build_roster(event_factory, peep_factory)
+
+        arrays = problem_arrays.ProblemArrays.from_buffer(problem_arrays.ProblemArrays.from_models(peeps, events).to_bytes())
+
+        assert [vars(peep) for peep in arrays.make_peeps()] == [vars(peep) for peep in peeps]
+        assert [event.id for event in arrays.make_events([1, 3])] == [1, 3]
+
+    def test_availability_matrix_marks_event_columns(self, event_factory, peep_factory):
+        """Test the peep x event matrix, ignoring ids that are not in the event table."""
+        events, peeps = build_roster(event_factory, peep_factory)
+
+        arrays = problem_arrays.ProblemArrays.from_models(peeps, events)
+
+        assert [[arrays.available(i, e) for e in range(2)] for i in range(3)] == [
+            [True, True],
+            [False, False],
+            [False, True],
+        ]
+
+    def test_shared_memory_attach_reads_without_copy(self, event_factory, peep_factory):
+        """Test that an attached block exposes the arrays as views of shared memory."""
+        events, peeps = build_roster(event_factory, peep_factory)
+        block = problem_arrays.share(problem_arrays.ProblemArrays.from_models(peeps, events))
+        try:
+            attached_block, arrays = problem_arrays.attach(block.name)
+
+            assert isinstance(arrays.availability_matrix, memoryview)
+            assert [peep.id for peep in arrays.make_peeps()] == [7, 8, 9]
+
+            arrays.release()
+            attached_block.close()
+        finally:
+            block.close()
+            block.unlink()
+
+    def test_unsupported_version_raises(self, event_factory, peep_factory):
+        """Test that a buffer from another format version is refused."""
+        events, peeps = build_roster(event_factory, peep_factory)
+        data = bytearray(problem_arrays.ProblemArrays.from_models(peeps, events).to_bytes())
+        data[0] = 99
+
+        with pytest.raises(ValueError, match="unsupported problem array format version"):
+            problem_arrays.ProblemArrays.from_buffer(data)
+
+    def test_rebuilt_roster_evaluates_identically(self, event_factory, peep_factory):
+        """Test that a sequence on rebuilt models scores exactly like one on deep copies."""
+        events = [event_factory(id=i, duration_minutes=90) for i in (1, 2)]
+        peeps = [peep_factory(id=i + 1, role=Role.LEADER, availability=[1, 2], priority=i % 3) for i in range(6)]
+        peeps += [peep_factory(id=i + 11, role=Role.FOLLOWER, availability=[1, 2], event_limit=1) for i in range(6)]
+        scheduler = Scheduler(data_folder='test', max_events=2)
+        scheduler.target_max = 5
+        arrays = problem_arrays.ProblemArrays.from_models(peeps, events)
+
+        expected = search.evaluate_permutation(scheduler, peeps, {event.id: event for event in events}, (2, 1))
+        rebuilt = EventSequence(arrays.make_events((2, 1)), arrays.make_peeps())
+        scheduler.evaluate_sequence(rebuilt)
+
+        assert rebuilt.__key__() == expected.__key__()
+        assert scheduler.rank_key(rebuilt) == scheduler.rank_key(expected)
@@ -115,6 +115,32 @@ class TestSchedulerEventSanitization:
         # Event should be removed (only 3 leaders available for event 1, need 4)
         assert len(valid_events) == 0
 
+    def test_sanitize_events_counts_followers_willing_to_lead(self, event_factory, peep_factory):
+        """Test that an event short on leaders is kept when enough followers may switch to lead."""
+        scheduler = create_scheduler()
+
+        event = event_factory(id=1)
+        leaders = [peep_factory(id=i+1, role=Role.LEADER, availability=[1]) for i in range(3)]
+        followers = [peep_factory(id=i+11, role=Role.FOLLOWER, availability=[1]) for i in range(4)]
+        flexible = peep_factory(id=21, role=Role.FOLLOWER, availability=[1], switch_pref=SwitchPreference.SWITCH_IF_NEEDED)
+
+        valid_events = scheduler.sanitize_events([event], leaders + followers + [flexible])
+
+        assert valid_events == [event]
+
+    def test_sanitize_events_ignores_peeps_without_event_capacity(self, event_factory, peep_factory):
+        """Test that peeps with an event limit of zero do not count toward the minimum."""
+        scheduler = create_scheduler()
+
+        event = event_factory(id=1)
+        leaders = [peep_factory(id=i+1, role=Role.LEADER, availability=[1]) for i in range(3)]
+        leaders.append(peep_factory(id=4, role=Role.LEADER, availability=[1], event_limit=0))
+        followers = [peep_factory(id=i+11, role=Role.FOLLOWER, availability=[1]) for i in range(4)]
+
+        valid_events = scheduler.sanitize_events([event], leaders + followers)
+
+        assert valid_events == []
+
 
 class TestSchedulerEventTrimming:
     """Test Scheduler event overlap removal logic."""
@@ -173,6 +199,24 @@ class TestSchedulerEventTrimming:
         # Both events have same overlap, but priority matters for tiebreaking
         # The exact result depends on weight calculation, but should be deterministic
 
+    def test_remove_high_overlap_events_updates_overlap_after_each_removal(self, event_factory, peep_factory):
+        """Test that overlap with already removed events no longer counts toward later removals."""
+        scheduler = create_scheduler(max_events=2)
+        events = [event_factory(id=i) for i in (1, 2, 3, 4)]
+
+        # Events 1 and 3 tie on overlap and weight, so event 1 goes first; without it, event 3 overlaps most
+        peeps = [
+            peep_factory(id=1, availability=[1, 2, 3]),
+            peep_factory(id=2, availability=[1, 2, 4]),
+            peep_factory(id=3, availability=[1, 3, 4]),
+            peep_factory(id=4, availability=[3, 4]),
+            peep_factory(id=5, availability=[2, 3]),
+        ]
+
+        trimmed_events = scheduler.remove_high_overlap_events(events, peeps, 2)
+
+        assert [e.id for e in trimmed_events] == [2, 4]
+
 
 class TestSchedulerSequenceEvaluation:
     """Test Scheduler sequence evaluation core logic."""
@@ -0,0 +1,268 @@
+"""
+Test search ordering helpers used to explore promising event orders first.
+
+Following testing philosophy:
+- Test the ordering decisions that change which sequences are found early
+- Use small real scenarios rather than mocks
+- One concept per test with descriptive names
+"""
+
+import itertools
+
+import pytest
+
+from peeps_scheduler import search
+from peeps_scheduler.models import Role
+
+
+def build_scenario(event_factory, peep_factory):
+    """Three 90-minute events: event 1 is scarce (exactly 4 per role), events 2 and 3 are popular."""
+    events = [event_factory(id=i, duration_minutes=90) for i in (1, 2, 3)]
+    peeps = []
+    for i in range(4):
+        peeps.append(peep_factory(id=i + 1, role=Role.LEADER, availability=[1, 2, 3], event_limit=1, priority=1))
+        peeps.append(peep_factory(id=i + 11, role=Role.FOLLOWER, availability=[1, 2, 3], event_limit=1, priority=1))
+    for i in range(4):
+        peeps.append(peep_factory(id=i + 21, role=Role.LEADER, availability=[2, 3], event_limit=1, priority=0))
+        peeps.append(peep_factory(id=i + 31, role=Role.FOLLOWER, availability=[2, 3], event_limit=1, priority=0))
+    return events, peeps
+
+
+def top_keys(scheduler, sequences):
+    """Keys of the tied top sequences, in ranked order."""
+    return [sequence.__key__() for sequence in scheduler.get_top_sequences(sequences)]
+
+
+def best_ranked(scheduler, sequences):
+    """Every sequence tied for the best rank key, in the order found."""
+    best_key = min(scheduler.rank_key(sequence) for sequence in sequences)
+    return [sequence for sequence in sequences if scheduler.rank_key(sequence) == best_key]
+
+
+class TestPromiseOrdering:
+    """Test ranking events by scarcity and priority demand."""
+
+    def test_scarce_event_ranked_first(self, event_factory, peep_factory):
+        """Test that the event with the fewest available peeps in its limiting role comes first."""
+        events, peeps = build_scenario(event_factory, peep_factory)
+
+        ranked = search.order_events_by_promise(events, peeps)
+
+        assert ranked[0].id == 1
+
+    def test_priority_demand_breaks_scarcity_ties(self, event_factory, peep_factory):
+        """Test that equally scarce events are ordered by total priority of available peeps."""
+        events = [event_factory(id=1), event_factory(id=2)]
+        peeps = [
+            peep_factory(id=1, role=Role.LEADER, availability=[1, 2], priority=0),
+            peep_factory(id=2, role=Role.FOLLOWER, availability=[1], priority=0),
+            peep_factory(id=3, role=Role.FOLLOWER, availability=[2], priority=5),
+        ]
+
+        ranked = search.order_events_by_promise(events, peeps)
+
+        assert [event.id for event in ranked] == [2, 1]
+
+
+class TestGreedySeed:
+    """Test greedy construction of the seed sequence."""
+
+    def test_greedy_sequence_schedules_scarce_event_before_it_is_starved(self, event_factory, peep_factory, scheduler_factory):
+        """Test that greedy picks the order that gets everyone in (scarce event first)."""
+        events, peeps = build_scenario(event_factory, peep_factory)
+        scheduler = scheduler_factory()
+        scheduler.target_max = 4
+
+        seed = search.build_greedy_sequence(scheduler, peeps, events)
+
+        assert sorted(seed) == [1, 2, 3]
+        # Event 1 must run before its peeps are consumed by 2 or 3
+        assert seed.index(1) < max(seed.index(2), seed.index(3))
+
+    def test_greedy_sequence_does_not_mutate_inputs(self, event_factory, peep_factory, scheduler_factory):
+        """Test that building the seed works on copies of peeps and events."""
+        events, peeps = build_scenario(event_factory, peep_factory)
+        scheduler = scheduler_factory()
+        scheduler.target_max = 4
+
+        search.build_greedy_sequence(scheduler, peeps, events)
+
+        assert all(peep.num_events == 0 for peep in peeps)
+        assert all(event.num_attendees() == 0 for event in events)
+
+
+class TestPromiseOrderedPermutations:
+    """Test the permutation stream used by time-limited searches."""
+
+    def test_yields_greedy_seed_first(self, event_factory, peep_factory, scheduler_factory):
+        """Test that the greedy seed is the first permutation explored."""
+        events, peeps = build_scenario(event_factory, peep_factory)
+        scheduler = scheduler_factory()
+        scheduler.target_max = 4
+
+        perms = list(search.promise_ordered_permutations(scheduler, peeps, events))
+
+        assert perms[0] == search.build_greedy_sequence(scheduler, peeps, events)
+
+    def test_yields_every_permutation_exactly_once(self, event_factory, peep_factory, scheduler_factory):
+        """Test that promise ordering only reorders the search space."""
+        events, peeps = build_scenario(event_factory, peep_factory)
+        scheduler = scheduler_factory()
+        scheduler.target_max = 4
+
+        perms = list(search.promise_ordered_permutations(scheduler, peeps, events))
+
+        assert len(perms) == len(set(perms))
+        assert set(perms) == set(itertools.permutations([1, 2, 3]))
+
+    def test_time_limited_search_scores_seed_even_with_zero_budget(self, event_factory, peep_factory, scheduler_factory):
+        """Test that a cut-short search still returns the greedy seed's sequence."""
+        events, peeps = build_scenario(event_factory, peep_factory)
+        scheduler = scheduler_factory()
+        scheduler.target_max = 4
+
+        sequences = scheduler.evaluate_all_event_sequences(peeps, events, time_limit=0)
+
+        assert len(sequences) == 1
+        assert sequences[0].num_unique_attendees == len(peeps)
+
+
+class TestSearchCostEstimate:
+    """Test the pre-search cost estimate and automatic engine selection."""
+
+    def test_estimate_counts_permutations_and_targets(self, event_factory, peep_factory, scheduler_factory):
+        """Test that the estimate multiplies permutations by the target_max sweep."""
+        events, peeps = build_scenario(event_factory, peep_factory)
+        scheduler = scheduler_factory()
+
+        estimate = search.estimate_search_cost(scheduler, peeps, events)
+
+        assert estimate.num_permutations == 6
+        assert estimate.num_targets == len(search.TARGET_MAXES)
+        assert estimate.total_seconds == pytest.approx(estimate.num_evaluations * estimate.seconds_per_evaluation)
+
+    def test_estimate_restores_target_max(self, event_factory, peep_factory, scheduler_factory):
+        """Test that calibration does not leak its target_max into the scheduler."""
+        events, peeps = build_scenario(event_factory, peep_factory)
+        scheduler = scheduler_factory()
+        scheduler.target_max = 5
+
+        search.estimate_search_cost(scheduler, peeps, events)
+
+        assert scheduler.target_max == 5
+
+    @pytest.mark.parametrize("total_seconds, workers, expected", [
+        (50, 1, "exhaustive"),
+        (150, 2, "parallel"),
+        (500, 1, "branch_and_bound"),
+        (3000, 4, "parallel_branch_and_bound"),
+        (5000, 1, "heuristic"),
+    ])
+    def test_select_engine_picks_cheapest_engine_within_budget(self, total_seconds, workers, expected):
+        """Test engine selection thresholds for a 100 second budget."""
+        estimate = search.SearchEstimate(num_events=6, num_permutations=720, num_targets=4,
+                                         seconds_per_evaluation=total_seconds / (720 * 4))
+
+        assert search.select_engine(estimate, budget=100, workers=workers) == expected
+
+    def test_select_engine_without_budget_is_exhaustive(self):
+        """Test that no budget keeps the exhaustive search."""
+        estimate = search.SearchEstimate(num_events=10, num_permutations=3628800, num_targets=4,
+                                         seconds_per_evaluation=0.01)
+
+        assert search.select_engine(estimate, budget=None) == "exhaustive"
+
+    def test_time_limit_forces_heuristic_engine(self, event_factory, peep_factory, scheduler_factory):
+        """Test that an explicit time limit selects the heuristic engine under auto."""
+        events, peeps = build_scenario(event_factory, peep_factory)
+        scheduler = scheduler_factory(time_limit=1.0)
+
+        assert scheduler.select_engine(peeps, events) == "heuristic"
+
+    def test_unknown_engine_raises(self, event_factory, peep_factory, scheduler_factory):
+        """Test that a misspelled engine name fails fast."""
+        events, peeps = build_scenario(event_factory, peep_factory)
+        scheduler = scheduler_factory(engine="quantum")
+
+        with pytest.raises(ValueError, match="unknown search engine"):
+            scheduler.select_engine(peeps, events)
+
+
+class TestExactEngines:
+    """Test that exact engines find the same top sequences as the exhaustive search."""
+
+    @pytest.mark.parametrize("target_max", list(search.TARGET_MAXES))
+    def test_branch_and_bound_matches_exhaustive(self, target_max, scheduler_factory, scenario_factory):
+        """Test that pruning never drops a sequence that ties for the top."""
+        events, peeps, _ = scenario_factory(15, num_events=4)
+        scheduler = scheduler_factory()
+        scheduler.target_max = target_max
+
+        exhaustive = search.run_exhaustive(scheduler, peeps, events)
+        pruned = search.run_branch_and_bound(scheduler, peeps, events)
+
+        assert [s.__key__() for s in pruned] == [s.__key__() for s in best_ranked(scheduler, exhaustive)]
+
+    def test_branch_and_bound_prunes_hopeless_prefixes(self, event_factory, peep_factory, scheduler_factory):
+        """Test that prefixes which starve the other events are cut off."""
+        events = [event_factory(id=i, duration_minutes=90) for i in (1, 2, 3)]
+        peeps = []
+        for i in range(4):
+            # Group A can attend anything, group B only event 2
+            peeps.append(peep_factory(id=i + 1, role=Role.LEADER, availability=[1, 2, 3], event_limit=1, priority=1))
+            peeps.append(peep_factory(id=i + 11, role=Role.FOLLOWER, availability=[1, 2, 3], event_limit=1, priority=1))
+            peeps.append(peep_factory(id=i + 21, role=Role.LEADER, availability=[2], event_limit=1))
+            peeps.append(peep_factory(id=i + 31, role=Role.FOLLOWER, availability=[2], event_limit=1))
+        scheduler = scheduler_factory()
+        scheduler.target_max = 4
+        exhaustive = search.run_exhaustive(scheduler, peeps, events)
+        finalize_sequence = scheduler.finalize_sequence
+        finished = []
+        scheduler.finalize_sequence = lambda sequence: finished.append(sequence) or finalize_sequence(sequence)
+
+        pruned = search.run_branch_and_bound(scheduler, peeps, events)
+
+        # Rebuilding the tied winners finalizes them once more
+        assert len(finished) - len(pruned) < len(list(itertools.permutations(events)))
+        assert top_keys(scheduler, pruned) == top_keys(scheduler, exhaustive)
+
+    def test_parallel_matches_exhaustive_order(self, scheduler_factory, scenario_factory):
+        """Test that the parallel engine returns the exhaustive tie set in the same order."""
+        events, peeps, _ = scenario_factory(15, num_events=4)
+        scheduler = scheduler_factory(workers=2)
+        scheduler.target_max = 5
+
+        exhaustive = search.run_exhaustive(scheduler, peeps, events)
+        parallel = search.run_parallel(scheduler, peeps, events)
+
+        expected = best_ranked(scheduler, exhaustive)
+        assert [repr(s) for s in parallel] == [repr(s) for s in expected]
+        assert [s.__key__() for s in parallel] == [s.__key__() for s in expected]
+
+    def test_parallel_uses_threads_on_free_threaded_build(self, monkeypatch, scheduler_factory, scenario_factory):
+        """Test that the thread pool path returns the exhaustive tie set in the same order."""
+        events, peeps, _ = scenario_factory(15, num_events=4)
+        scheduler = scheduler_factory(workers=2)
+        scheduler.target_max = 5
+        monkeypatch.setattr(search, "free_threading_active", lambda: True)
+        monkeypatch.setattr(search, "ProcessPoolExecutor", None)
+
+        exhaustive = search.run_exhaustive(scheduler, peeps, events)
+        threaded = search.run_parallel(scheduler, peeps, events)
+
+        expected = best_ranked(scheduler, exhaustive)
+        assert [repr(s) for s in threaded] == [repr(s) for s in expected]
+        assert [s.__key__() for s in threaded] == [s.__key__() for s in expected]
+
+    @pytest.mark.parametrize("seed", [8, 36])
+    def test_work_stealing_branch_and_bound_matches_exhaustive(self, seed, scheduler_factory, scenario_factory):
+        """Test that the work-stealing engine finds the exhaustive tie set, in permutation order."""
+        events, peeps, _ = scenario_factory(seed, num_events=5)
+        scheduler = scheduler_factory(workers=3)
+        scheduler.target_max = 5
+
+        exhaustive = search.run_exhaustive(scheduler, peeps, events)
+        stolen = search.run_parallel_branch_and_bound(scheduler, peeps, events)
+
+        expected = scheduler.get_top_sequences(exhaustive)
+        assert [s.__key__() for s in scheduler.get_top_sequences(stolen)] == [s.__key__() for s in expected]
@@ -0,0 +1,96 @@
+"""
+Test the memory-bounded sequence store.
+
+Following testing philosophy:
+- Test that spilling to disk never changes which sequences win, or their order
+- Use real Peep/Event objects from the shared factories
+- One concept per test with descriptive names
+"""
+
+import tempfile
+
+import pytest
+
+from peeps_scheduler import search
+from peeps_scheduler.sequence_store import SequenceStore
+
+
+class TestSequenceStore:
+    """Test compact records, spilled runs and the merged ranking."""
+
+    def test_spills_sorted_runs_past_cap(self):
+        """Test that records beyond the cap go to disk and the merged ranking is fully sorted."""
+        store = SequenceStore(cap=3)
+        keys = [(-5, 0), (-7, 1), (-6, 0), (-7, 0), (-5, 2), (-7, 1), (-6, 3)]
+        for i, key in enumerate(keys):
+            store.add(key, 4, [i])
+
+        ranked = list(store.ranked())
+        store.close()
+
+        assert len(store) == 7
+        assert [record[0] for record in ranked] == sorted(keys)
+        assert [record[1] for record in ranked] == sorted(range(7), key=lambda i: (keys[i], i))
+
+    def test_top_records_tied_across_runs_in_discovery_order(self):
+        """Test that the tie set collects the best records from every run, oldest first."""
+        store = SequenceStore(cap=2)
+        for i, key in enumerate([(-3,), (-4,), (-2,), (-4,), (-4,)]):
+            store.add(key, 5, [i])
+
+        top = store.top_records()
+        runs = len(store.runs)
+        store.close()
+
+        assert runs == 2
+        assert [record[3] for record in top] == [[1], [3], [4]]
+
+    def test_failed_spill_closes_its_run(self, monkeypatch):
+        """Test that a run whose records cannot be written is closed instead of leaked."""
+        opened = []
+        temporary_file = tempfile.TemporaryFile
+
+        def tracking_temporary_file(*args, **kwargs):
+            opened.append(temporary_file(*args, **kwargs))
+            return opened[-1]
+
+        monkeypatch.setattr(tempfile, "TemporaryFile", tracking_temporary_file)
+        store = SequenceStore(cap=1)
+
+        with pytest.raises(TypeError):
+            store.add((-1,), 4, [object()])
+            store.spill()
+
+        assert store.runs == []
+        assert len(opened) == 1 and opened[0].closed
+
+    def test_invalid_cap_raises(self):
+        """Test that a cap below one record is refused."""
+        with pytest.raises(ValueError, match="at least 1"):
+            SequenceStore(cap=0)
+
+
+class TestStoreSearch:
+    """Test searching into the store instead of keeping every sequence."""
+
+    def test_store_rebuilds_same_top_sequences(self, scenario_factory, scheduler_factory):
+        """Test that a tiny cap still yields exactly the tied best sequences of the full list."""
+        events, peeps, _ = scenario_factory(5)
+        scheduler = scheduler_factory()
+        all_sequences = []
+        store = SequenceStore(cap=4)
+
+        for target_max in search.TARGET_MAXES:
+            scheduler.target_max = target_max
+            all_sequences.extend(search.run_exhaustive(scheduler, peeps, events))
+            scheduler.sequence_store = store
+            assert search.run_exhaustive(scheduler, peeps, events) == []
+            scheduler.sequence_store = None
+
+        expected = scheduler.get_top_sequences(all_sequences)
+        found = scheduler.get_top_sequences(store.top_sequences(scheduler, peeps, events))
+        store.close()
+
+        assert len(store) == len(all_sequences)
+        assert [sequence.__key__() for sequence in found] == [sequence.__key__() for sequence in expected]
+        assert [[event.id for event in s.events] for s in found] == [[event.id for event in s.events] for s in expected]
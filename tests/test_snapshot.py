@@ -0,0 +1,105 @@
+"""
+Test the binary snapshot of output.json.
+
+Following testing philosophy:
+- Test that a snapshot reload gives exactly what load_data_from_json gives
+- Use the sanitized golden master output.json in a temporary folder
+- One concept per test with descriptive names
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from peeps_scheduler import file_io, snapshot
+
+GOLDEN_MASTER_DIR = Path(__file__).parent / "golden_master_2025_09_sanitized"
+
+
+def copy_output(tmp_path):
+    path = tmp_path / "output.json"
+    shutil.copy(GOLDEN_MASTER_DIR / "output.json", path)
+    return str(path)
+
+
+def fields(obj):
+    """Every attribute of a peep or event, with enums as their values."""
+    return {name: getattr(value, "value", value) for name, value in vars(obj).items()}
+
+
+class TestSnapshot:
+    """Test writing, reusing and invalidating the snapshot."""
+
+    def test_snapshot_reload_matches_json(self, tmp_path, monkeypatch):
+        """Test that the second load comes from the snapshot and equals the JSON load field for field."""
+        output_json = copy_output(tmp_path)
+        expected_peeps, expected_events = file_io.load_data_from_json(output_json)
+        snapshot.load_data(output_json)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("output.json should not be decoded")
+
+        monkeypatch.setattr(file_io, "load_data_from_json", fail)
+        peeps, events = snapshot.load_data(output_json)
+
+        assert (tmp_path / "output.snapshot").exists()
+        assert [fields(peep) for peep in peeps] == [fields(peep) for peep in expected_peeps]
+        assert [fields(event) for event in events] == [fields(event) for event in expected_events]
+
+    def test_unchanged_output_is_not_hashed(self, tmp_path, monkeypatch):
+        """Test that a load with output.json's size and mtime unchanged skips hashing it."""
+        output_json = copy_output(tmp_path)
+        expected_peeps, _ = snapshot.load_data(output_json)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("output.json should not be hashed")
+
+        monkeypatch.setattr(snapshot, "file_sha256", fail)
+        peeps, _ = snapshot.load_data(output_json)
+
+        assert [fields(peep) for peep in peeps] == [fields(peep) for peep in expected_peeps]
+
+    def test_touched_output_reuses_snapshot_and_records_new_mtime(self, tmp_path, monkeypatch):
+        """Test that a new mtime with the same contents keeps the snapshot and is hashed only once."""
+        output_json = copy_output(tmp_path)
+        snapshot.load_data(output_json)
+        st = os.stat(output_json)
+        os.utime(output_json, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        hashed = []
+        file_sha256 = snapshot.file_sha256
+        monkeypatch.setattr(snapshot, "file_sha256", lambda path: hashed.append(path) or file_sha256(path))
+        monkeypatch.setattr(file_io, "load_data_from_json", lambda path: pytest.fail("output.json should not be decoded"))
+
+        snapshot.load_data(output_json)
+        snapshot.load_data(output_json)
+
+        assert hashed == [output_json]
+
+    def test_changed_output_invalidates_snapshot(self, tmp_path):
+        """Test that editing output.json makes the next load use the new contents."""
+        output_json = copy_output(tmp_path)
+        snapshot.load_data(output_json)
+        with open(output_json) as f:
+            data = json.load(f)
+        data["peeps"][0]["priority"] += 100
+        with open(output_json, "w") as f:
+            json.dump(data, f)
+
+        peeps, _ = snapshot.load_data(output_json)
+
+        assert peeps[0].priority == data["peeps"][0]["priority"]
+
+    def test_unreadable_snapshot_falls_back_to_json(self, tmp_path):
+        """Test that a truncated snapshot is ignored and rewritten."""
+        output_json = copy_output(tmp_path)
+        snapshot.load_data(output_json)
+        path = tmp_path / "output.snapshot"
+        path.write_bytes(path.read_bytes()[:60])
+
+        peeps, _ = snapshot.load_data(output_json)
+
+        assert len(peeps) == len(file_io.load_data_from_json(output_json)[0])
+        assert snapshot.read_snapshot(path, snapshot.file_sha256(output_json)) is not None
@@ -236,6 +236,19 @@ Bob Wilson,BOB@EXAMPLE.COM,Leader,None,1,March 1"""
         assert john.responded == True
         assert bob.responded == True
 
+    def test_shared_email_marks_every_matching_peep(self, temp_files, members_csv_content):
+        """Test that members sharing an email are all marked as responded rather than rejected."""
+        with open(temp_files['members'], 'w') as f:
+            f.write(members_csv_content.replace('alice@example.com', 'john@example.com'))
+
+        result_peeps = utils.apply_event_results(
+            temp_files['attendance'],
+            temp_files['members'],
+            temp_files['responses']
+        )
+
+        assert sorted(p.id for p in result_peeps if p.responded) == [1, 3, 4]
+
 
 class TestAttendanceIncrementing:
     """Test that total_attended is incremented correctly."""
@@ -353,4 +366,24 @@ class TestPeepIndexOrdering:
         assert bob.index == 0    # Highest priority
         assert alice.index == 1
         assert jane.index == 2   # Attended 1 event
-        assert john.index == 3   # Attended 2 events, most recent attendee
\ No newline at end of file
+        assert john.index == 3   # Attended 2 events, most recent attendee
+
+class TestCoAvailability:
+    """Test the event co-availability matrix used for overlap trimming."""
+
+    def test_matrix_counts_shared_peeps(self, event_factory, peep_factory):
+        """Test diagonal counts availability and off-diagonal counts shared availability."""
+        events = [event_factory(id=i) for i in (1, 2, 3)]
+        peeps = [
+            peep_factory(id=1, availability=[1, 2]),
+            peep_factory(id=2, availability=[1, 2, 3]),
+            peep_factory(id=3, availability=[3, 99]),
+        ]
+
+        matrix = utils.co_availability_matrix(utils.availability_bitmasks(events, peeps))
+
+        assert matrix == [
+            [2, 2, 1],
+            [2, 2, 1],
+            [1, 1, 2],
+        ]